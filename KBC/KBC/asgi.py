@@ -3,6 +3,14 @@ ASGI config for KBC project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Run with an ASGI server, e.g.:
+
+    uvicorn KBC.asgi:application --workers 4
+
+HTTP goes to Django. WebSocket connections go to the live Fastest
+Finger First rooms (quiz/live.py), which need `pip install websockets`
+for uvicorn to accept them.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
@@ -13,4 +21,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'KBC.settings')
 
-application = get_asgi_application()
+# Use the native async game views (quiz/async_views.py) under ASGI
+os.environ.setdefault('QUIZ_ASYNC_VIEWS', '1')
+
+django_application = get_asgi_application()
+
+from quiz import live   # noqa: E402  (needs the app registry loaded above)
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        return await live.application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -43,7 +43,15 @@ INSTALLED_APPS = [
     'quiz'
 ]
 
+# Game-only app set for serverless functions (api/index.py): no admin,
+# which is served by the full app instead. Keeps cold starts short.
+QUIZ_SLIM_APPS = os.environ.get('QUIZ_SLIM_APPS', '0') == '1'
+
+if QUIZ_SLIM_APPS:
+    INSTALLED_APPS.remove('django.contrib.admin')
+
 MIDDLEWARE = [
+    'quiz.metrics.MetricsMiddleware',   # First, so it times everything below
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,7 +66,7 @@ ROOT_URLCONF = 'KBC.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'quiz.metrics.InstrumentedTemplates',   # DjangoTemplates, timed
         'DIRS': [BASE_DIR / 'Templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -72,6 +80,52 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'KBC.wsgi.application'
+ASGI_APPLICATION = 'KBC.asgi.application'
+
+# Serve play/answer/lifeline/leaderboard from native async views.
+# KBC/asgi.py turns this on; leave it off under WSGI.
+QUIZ_ASYNC_VIEWS = os.environ.get('QUIZ_ASYNC_VIEWS', '0') == '1'
+
+# Where active game state lives between turns: 'db' writes every turn to
+# GameSession; 'cache' keeps it in the cache and writes back at
+# checkpoints (see quiz/game_store.py).
+QUIZ_GAME_STATE_STORE = os.environ.get('QUIZ_GAME_STATE_STORE', 'db')
+
+# Abandoned games (see quiz/reaper.py): an active game whose question has
+# gone unanswered for QUIZ_IDLE_GAME_SECONDS is closed as a timeout, by
+# `manage.py reap_games` or, when QUIZ_REAPER_INTERVAL_SECONDS > 0, by a
+# thread in each server process.
+QUIZ_IDLE_GAME_SECONDS       = int(os.environ.get('QUIZ_IDLE_GAME_SECONDS', '900'))
+QUIZ_REAPER_INTERVAL_SECONDS = int(os.environ.get('QUIZ_REAPER_INTERVAL_SECONDS', '0'))
+
+# Live Fastest Finger First rooms over WebSockets (see quiz/live.py),
+# served by KBC/asgi.py: how long a question stays open, the pause
+# between rounds, and how many players a room needs to start.
+QUIZ_FFF_ANSWER_SECONDS = float(os.environ.get('QUIZ_FFF_ANSWER_SECONDS', '10'))
+QUIZ_FFF_BREAK_SECONDS  = float(os.environ.get('QUIZ_FFF_BREAK_SECONDS', '5'))
+QUIZ_FFF_MIN_PLAYERS    = int(os.environ.get('QUIZ_FFF_MIN_PLAYERS', '2'))
+
+# Tournament standings (see quiz/tournaments.py) are written once when a
+# tournament closes; each page is then cached for this long.
+QUIZ_STANDINGS_CACHE_SECONDS = int(os.environ.get('QUIZ_STANDINGS_CACHE_SECONDS', '3600'))
+
+# Shared, memory-mapped question bank for multi-worker servers (see
+# quiz/question_snapshot.py): a file path, built by build.sh
+# (`manage.py build_question_snapshot`) and rebuilt by a background
+# thread QUIZ_QUESTION_SNAPSHOT_REBUILD_DELAY seconds after question changes.
+# Unset: each process keeps its own index, loaded from the database.
+QUIZ_QUESTION_SNAPSHOT = os.environ.get('QUIZ_QUESTION_SNAPSHOT') or None
+QUIZ_QUESTION_SNAPSHOT_REBUILD_DELAY = float(os.environ.get('QUIZ_QUESTION_SNAPSHOT_REBUILD_DELAY', '1'))
+
+# Per-view request metrics at /metrics (see quiz/metrics.py). The
+# endpoint is open to staff users, or to anyone sending
+# "Authorization: Bearer <QUIZ_METRICS_TOKEN>" when that is set.
+# QUIZ_SLOW_REQUEST_MS logs slower requests with their SQL, for a
+# QUIZ_SLOW_REQUEST_SAMPLE fraction of requests.
+QUIZ_METRICS             = os.environ.get('QUIZ_METRICS', '1') == '1'
+QUIZ_METRICS_TOKEN       = os.environ.get('QUIZ_METRICS_TOKEN')
+QUIZ_SLOW_REQUEST_MS     = int(os.environ['QUIZ_SLOW_REQUEST_MS']) if os.environ.get('QUIZ_SLOW_REQUEST_MS') else None
+QUIZ_SLOW_REQUEST_SAMPLE = float(os.environ.get('QUIZ_SLOW_REQUEST_SAMPLE', '1.0'))
 
 
 # Database
@@ -91,6 +145,57 @@ else:
         }
     }
 
+# Opt-in SQLite profile for concurrent writers (see quiz/sqlite_tuning.py):
+# WAL, synchronous=NORMAL, busy_timeout, mmap and a larger page cache on
+# every connection, and BEGIN IMMEDIATE so a transaction waits for the
+# write lock up front instead of failing with "database is locked".
+QUIZ_SQLITE_TUNING          = os.environ.get('QUIZ_SQLITE_TUNING', '0') == '1'
+QUIZ_SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('QUIZ_SQLITE_BUSY_TIMEOUT_MS', '20000'))
+
+if QUIZ_SQLITE_TUNING and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'transaction_mode': 'IMMEDIATE',
+        'timeout':          QUIZ_SQLITE_BUSY_TIMEOUT_MS / 1000,
+    })
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Per-process memory by default. Set REDIS_URL to share one cache between
+# workers (required for QUIZ_GAME_STATE_STORE = 'cache' with >1 worker).
+
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND':  'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+
+# Sessions
+# https://docs.djangoproject.com/en/6.0/topics/http/sessions/#configuring-the-session-engine
+# Game pages don't write the session (game state lives on GameSession),
+# so the session is only written at login and logout. QUIZ_SESSION_ENGINE
+# picks where it is read from on every request:
+#   cached_db      - cache first, database on a miss (default with REDIS_URL)
+#   db             - database every time (default otherwise: a per-process
+#                    cache would keep a logged-out session alive in the
+#                    other workers)
+#   signed_cookies - no server-side storage; the login lives in the cookie
+#                    and can't be revoked server-side until it expires
+#   cache          - cache only (needs a shared REDIS_URL cache to survive restarts)
+
+SESSION_ENGINES = {
+    'cached_db':      'django.contrib.sessions.backends.cached_db',
+    'db':             'django.contrib.sessions.backends.db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'cache':          'django.contrib.sessions.backends.cache',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get('QUIZ_SESSION_ENGINE', 'cached_db' if REDIS_URL else 'db')]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
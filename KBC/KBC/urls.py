@@ -16,10 +16,14 @@ Including another URLconf
 """
 # quizmaster/urls.py
 
-from django.contrib import admin
-from django.urls    import path, include
+from django.apps import apps
+from django.urls import path, include
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('',include('quiz.urls')),   # All app routes
 ]
+
+# Not installed in the slim serverless app set (QUIZ_SLIM_APPS)
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
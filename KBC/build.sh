@@ -2,7 +2,11 @@
 
 pip install -r requirements.txt
 python manage.py collectstatic --noinput
+# Ship bytecode so cold starts don't compile the project on import
+python -m compileall -q .
 python manage.py migrate
+# Shared question snapshot for the workers (no-op unless QUIZ_QUESTION_SNAPSHOT is set)
+python manage.py build_question_snapshot
 
 # Create superuser if not exists
 echo "from django.contrib.auth import get_user_model;
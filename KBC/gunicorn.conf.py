@@ -0,0 +1,9 @@
+# gunicorn.conf.py
+
+"""Gunicorn settings, picked up when gunicorn is started from this directory."""
+
+
+def worker_exit(server, worker):
+    """Write buffered answer events before the worker goes away."""
+    from quiz import events
+    events.flush()
@@ -3,7 +3,11 @@
 from django.contrib import admin
 from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import Question, GameSession
+from .models import (
+    Question, GameSession, UserStats, AnswerEvent, FastestFingerRound, FastestFingerAnswer,
+    Tournament, TournamentStanding,
+)
+from . import tournaments
 
 
 # ----------------------------
@@ -88,6 +92,126 @@ class GameSessionAdmin(admin.ModelAdmin):
         return False
 
 
+# ----------------------------
+# UserStats Admin
+# ----------------------------
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the materialized leaderboard.
+    Rows are maintained by the game; rebuild with rebuild_leaderboard.
+    """
+    list_display  = (
+        'user', 'best_score', 'best_at', 'games_played',
+        'wins', 'losses', 'quits', 'total_winnings', 'last_played'
+    )
+    search_fields = ('user__username',)
+    ordering      = ('-best_score', 'best_at')
+    list_per_page = 20
+
+    readonly_fields = (
+        'user', 'best_score', 'best_at', 'games_played',
+        'wins', 'losses', 'quits', 'total_winnings', 'last_played'
+    )
+
+    def has_add_permission(self, request):
+        """Stats rows are written by the game, not by hand."""
+        return False
+
+
+# ----------------------------
+# AnswerEvent Admin
+# ----------------------------
+@admin.register(AnswerEvent)
+class AnswerEventAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the answer event log.
+    """
+    list_display  = (
+        'created_at', 'session', 'level', 'kind',
+        'chosen', 'correct', 'elapsed_ms', 'lifelines_used'
+    )
+    list_filter   = ('kind', 'correct', 'level')
+    search_fields = ('session__user__username',)
+    list_select_related = ('session__user',)
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        """Events are appended by the game only."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+# ----------------------------
+# Fastest Finger First Admin
+# ----------------------------
+class FastestFingerAnswerInline(admin.TabularInline):
+    model           = FastestFingerAnswer
+    fields          = ('user', 'chosen', 'correct', 'elapsed_ms')
+    readonly_fields = fields
+    can_delete      = False
+    extra           = 0
+
+
+@admin.register(FastestFingerRound)
+class FastestFingerRoundAdmin(admin.ModelAdmin):
+    """
+    Read-only history of live rounds, with every answer.
+    """
+    list_display  = ('started_at', 'room', 'players', 'winner', 'winner_ms')
+    list_filter   = ('room',)
+    search_fields = ('winner__username',)
+    list_select_related = ('winner',)
+    inlines       = [FastestFingerAnswerInline]
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        """Rounds are written by the live rooms only."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+# ----------------------------
+# Tournament Admin
+# ----------------------------
+@admin.register(Tournament)
+class TournamentAdmin(admin.ModelAdmin):
+    """
+    Schedule tournaments. The shared deck is drawn when one is created;
+    standings are written by close_tournaments.
+    """
+    list_display    = ('name', 'starts_at', 'ends_at', 'closed_at', 'participants')
+    search_fields   = ('name',)
+    readonly_fields = ('deck', 'closed_at', 'participants')
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        tournaments.ensure_deck(obj)
+
+
+@admin.register(TournamentStanding)
+class TournamentStandingAdmin(admin.ModelAdmin):
+    """
+    Read-only final standings, in position order.
+    """
+    list_display  = ('tournament', 'rank', 'user', 'score', 'level', 'status', 'duration_ms')
+    list_filter   = ('tournament',)
+    search_fields = ('user__username',)
+    list_select_related = ('tournament', 'user')
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        """Standings are written when a tournament closes."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 # ----------------------------
 # Extend Default User Admin
 # ----------------------------
@@ -97,21 +221,32 @@ admin.site.unregister(User)
 class CustomUserAdmin(BaseUserAdmin):
     """
     Extended User admin showing extra info like
-    total sessions and best score.
+    total games and best score, read from UserStats
+    in the same query as the user list.
     """
     list_display = (
         'username', 'email', 'date_joined',
         'is_staff', 'total_sessions', 'best_score'
     )
+    list_select_related = ('stats',)
+
+    def user_stats(self, obj):
+        try:
+            return obj.stats
+        except UserStats.DoesNotExist:
+            return None
 
     def total_sessions(self, obj):
-        return obj.sessions.count()
+        stats = self.user_stats(obj)
+        return stats.games_played if stats else 0
     total_sessions.short_description = 'Total Games'
+    total_sessions.admin_order_field = 'stats__games_played'
 
     def best_score(self, obj):
-        best = obj.sessions.order_by('-score').first()
-        return f"₹{best.score:,}" if best else "—"
+        stats = self.user_stats(obj)
+        return f"₹{stats.best_score:,}" if stats and stats.games_played else "—"
     best_score.short_description = 'Best Score'
+    best_score.admin_order_field = 'stats__best_score'
 
 
 # ----------------------------
@@ -0,0 +1,145 @@
+# quiz/api.py
+
+"""
+JSON game API.
+
+Mirrors the HTML game views, but each call resolves the action and
+returns the resulting game state in the same response — so a turn is a
+single request with no redirect and no template render. Used by
+staticfiles/js/quiz.js; the HTML views remain the no-JS fallback.
+"""
+
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+
+from django.http                  import JsonResponse
+from django.urls                  import reverse
+from django.views.decorators.http import require_GET, require_POST
+
+from .     import game
+from .game import get_active_session
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+def api_login_required(view):
+    """Like login_required, but answers 401 JSON instead of redirecting."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if not (await request.auser()).is_authenticated:
+                return error('Authentication required.', status=401)
+            return await view(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return error('Authentication required.', status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def error(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def no_active_game():
+    return error('No active game.', status=404)
+
+
+def finished(session, result, **extra):
+    """Response for a turn that ended the game."""
+    payload = {
+        'result':     result,
+        'state':      game.game_state(session),
+        'result_url': reverse('result'),
+    }
+    payload.update(extra)
+    return JsonResponse(payload)
+
+
+# ============================================================
+# GAME ENDPOINTS
+# ============================================================
+
+@require_POST
+@api_login_required
+def start_view(request):
+    """Start a new game and return its first turn."""
+    session = game.start_game(request.user)
+    if not session:
+        return error('No questions found. Please contact admin.', status=503)
+    return JsonResponse({'result': 'started', 'state': game.game_state(session)})
+
+
+@require_GET
+@api_login_required
+def state_view(request):
+    """Current turn of the active game."""
+    session = get_active_session(request.user)
+    if not session:
+        return no_active_game()
+    return JsonResponse({'state': game.game_state(session)})
+
+
+@require_POST
+@api_login_required
+def answer_view(request):
+    """
+    Resolve an answer. A correct answer returns the next question,
+    prize and lifeline state; anything else returns the final state.
+    """
+    session = get_active_session(request.user)
+    if not session:
+        return no_active_game()
+
+    question = game.get_current_question(session)
+    outcome  = game.submit_answer(session, request.POST.get('answer', ''))
+
+    if outcome == game.INVALID:
+        return error('Invalid answer.')
+    if outcome == game.MISSING:
+        return error(f'No question found for level {session.current_level + 1}.', status=503)
+    if outcome == game.STALE:
+        return error('This turn was already answered.', status=409)
+    if outcome == game.CORRECT:
+        return JsonResponse({'result': outcome, 'state': game.game_state(session)})
+
+    # Game over — reveal the answer to the question just played
+    return finished(session, outcome, correct_option=question.correct_option if question else None)
+
+
+@require_POST
+@api_login_required
+def lifeline_view(request, lifeline_type):
+    """Use a lifeline and return its effect with the updated state."""
+    session = get_active_session(request.user)
+    if not session:
+        return no_active_game()
+    if lifeline_type not in game.LIFELINE_FIELDS:
+        return error('Unknown lifeline.', status=404)
+
+    effect = game.use_lifeline(session, lifeline_type)
+    if effect is None:
+        return error('Lifeline already used, or time is up.', status=409)
+
+    payload = {'result': 'used', 'lifeline': lifeline_type, 'state': game.game_state(session)}
+    if 'poll' in effect:
+        payload['poll'] = effect['poll']
+    return JsonResponse(payload)
+
+
+@require_POST
+@api_login_required
+def quit_view(request):
+    """Walk away with the safe haven amount."""
+    session = get_active_session(request.user)
+    if not session:
+        return no_active_game()
+    if not game.quit_game(session):
+        return error('This game has already ended.', status=409)
+    return finished(session, 'quit')
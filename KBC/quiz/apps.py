@@ -1,5 +1,15 @@
+import atexit
+
 from django.apps import AppConfig
 
 
 class QuizConfig(AppConfig):
     name = 'quiz'
+
+    def ready(self):
+        # Register signal handlers (question pool invalidation)
+        from . import signals  # noqa: F401
+
+        # Write any buffered answer events when the process exits
+        from . import events
+        atexit.register(events.flush)
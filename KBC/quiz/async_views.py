@@ -0,0 +1,192 @@
+# quiz/async_views.py
+
+"""
+Native async versions of the hot game views, for ASGI deployments.
+
+Under ASGI, Django runs every sync view in a worker thread. These views
+instead read and write through the async ORM (afirst, aupdate) and only
+hop to a thread for the transaction that ends a game. They reuse the
+I/O-free rules in quiz/game.py, so behaviour matches quiz/views.py.
+
+Enabled by QUIZ_ASYNC_VIEWS in settings (see quiz/urls.py).
+"""
+
+from asgiref.sync import sync_to_async
+
+from django.contrib                 import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts               import render, redirect
+
+from django.views.decorators.http   import require_POST
+
+from .models import GameSession, PRIZE_LADDER, SAFE_HAVENS
+from .       import game, game_store, events, leaderboard, question_pool, api
+from .views  import lifeline_partial
+
+
+# ============================================================
+# HELPER FUNCTIONS
+# ============================================================
+
+async def aget_active_session(user):
+    """Async twin of game.get_active_session()."""
+    session = await (
+        GameSession.objects.filter(user=user, status='active').order_by('-id').afirst()
+    )
+    return await game_store.aload(session)
+
+
+async def aget_current_question(session):
+    if not session.current_question_id:
+        return None
+    return await question_pool.aget_question(session.current_question_id)
+
+
+async def aget_deck_question(session, level, alternate=False):
+    """Async twin of game.get_deck_question()."""
+    primary, alt = question_pool.deck_entry(session.deck, level)
+    pk = alt if alternate else primary
+    question = await question_pool.aget_question(pk) if pk else None
+    if question is None:
+        question = await sync_to_async(game.fallback_question)(session, level, alternate)
+    return question
+
+
+async def ause_lifeline(session, lifeline_type):
+    """Async twin of game.use_lifeline()."""
+    if not game.lifeline_available(session, lifeline_type) or game.timed_out(session):
+        return None
+
+    question = await aget_current_question(session)
+    if not question:
+        return None
+
+    replacement = None
+    if lifeline_type == 'skip':
+        replacement = await aget_deck_question(session, session.current_level, alternate=True)
+
+    event = game.lifeline_event(session, question, lifeline_type)
+    effect, changes = game.apply_lifeline(session, lifeline_type, question, replacement)
+    used = await game.asave_transition(
+        session, changes, **{game.LIFELINE_FIELDS[lifeline_type]: True}
+    )
+    if not used:
+        return None
+    events.record(**event)
+    return effect
+
+
+async def auser(request):
+    """
+    Resolve the user once, asynchronously, and pin it on the request so
+    templates and context processors never hit the DB synchronously.
+    """
+    request.user = await request.auser()
+    return request.user
+
+
+# ============================================================
+# GAME VIEWS
+# ============================================================
+
+@login_required
+async def play_view(request):
+    session = await aget_active_session(await auser(request))
+    if not session:
+        messages.warning(request, "No active game. Start a new one!")
+        return redirect('dashboard')
+
+    question = await aget_current_question(session)
+    if not question:
+        messages.error(request, "Question not found. Please restart.")
+        return redirect('dashboard')
+
+    eliminated = session.eliminated_options.split(',') if session.eliminated_options else []
+
+    context = {
+        'session':        session,
+        'question':       question,
+        'eliminated':     eliminated,
+        'prize_ladder':   PRIZE_LADDER,
+        'safe_havens':    SAFE_HAVENS,
+        'current_prize':  PRIZE_LADDER.get(session.current_level, 0),
+        'option_labels':  {'A': 'A', 'B': 'B', 'C': 'C', 'D': 'D'},
+        'audience_poll':  game.audience_poll(session),
+        'seconds_left':   game.seconds_left(session),
+    }
+    return render(request, 'quiz/play.html', context)
+
+
+@login_required
+async def answer_view(request):
+    """Async twin of views.answer_view()."""
+    if request.method != 'POST':
+        return redirect('play')
+
+    session = await aget_active_session(await auser(request))
+    if not session:
+        return redirect('dashboard')
+
+    chosen   = request.POST.get('answer', '')
+    question = await aget_current_question(session)
+    outcome  = game.judge_answer(session, question, chosen)
+    event    = game.answer_event(session, question, chosen, outcome)
+
+    if outcome in game.GAME_OVER:
+        # Ending a game is one transaction across several tables
+        if not await sync_to_async(game.finish)(session, outcome):
+            return redirect('play')
+        events.record(**event)
+        return redirect('result')
+
+    if outcome == game.INVALID:
+        messages.error(request, "Invalid answer. Please try again.")
+        return redirect('play')
+
+    next_level = session.current_level + 1
+    next_q     = await aget_deck_question(session, next_level)
+    if not next_q:
+        messages.error(request, f"No question found for level {next_level}. Contact admin.")
+        return redirect('play')
+
+    if await game.asave_transition(session, game.advance(session, next_q)):
+        events.record(**event)
+    return redirect('play')
+
+
+@login_required
+async def lifeline_view(request, lifeline_type):
+    """Async twin of views.lifeline_view()."""
+    session = await aget_active_session(await auser(request))
+    if not session or request.method != 'POST':
+        return redirect('play')
+
+    await ause_lifeline(session, lifeline_type)
+    return redirect('play')
+
+
+@require_POST
+@api.api_login_required
+async def lifeline_partial_view(request, lifeline_type):
+    """Async twin of views.lifeline_partial_view()."""
+    session = await aget_active_session(await auser(request))
+    if not session:
+        return api.no_active_game()
+    if lifeline_type not in game.LIFELINE_FIELDS:
+        return api.error('Unknown lifeline.', status=404)
+
+    effect = await ause_lifeline(session, lifeline_type)
+    if effect is None:
+        return api.error('Lifeline already used, or time is up.', status=409)
+    return lifeline_partial(request, session, await aget_current_question(session), lifeline_type, effect)
+
+
+# ============================================================
+# LEADERBOARD VIEW
+# ============================================================
+
+async def leaderboard_view(request):
+    """Async twin of views.leaderboard_view()."""
+    await auser(request)
+    top_sessions = [entry async for entry in leaderboard.top_players(10)]
+    return render(request, 'quiz/leaderboard.html', {'top_sessions': top_sessions})
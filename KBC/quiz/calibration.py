@@ -0,0 +1,186 @@
+# quiz/calibration.py
+
+"""
+Question difficulty calibration from the AnswerEvent log.
+
+Fits a two-parameter logistic (2PL) item response model per question:
+
+    P(correct | ability θ) = 1 / (1 + exp(-a · (θ - b)))
+
+where b is the calibrated difficulty and a the discrimination.
+
+Memory is bounded by questions × ability bins plus one float per
+player, never by the number of answers:
+
+1. Each player's ability is the standardized log-odds of their
+   (smoothed) accuracy, aggregated by the database in one GROUP BY.
+2. Answers are streamed in keyset-paginated chunks and folded into
+   per-question, per-ability-bin answer/correct counts with bincount.
+3. All questions are fitted at once by a vectorized Newton solver on
+   the binned counts, with a small ridge penalty for sparse questions.
+
+Requires NumPy (optional dependency; see calibrate_questions).
+"""
+
+from django.db.models import Count, Q
+
+from .models import AnswerEvent, Question
+
+try:
+    import numpy as np
+except ImportError:   # pragma: no cover - optional dependency
+    np = None
+
+
+# Level bands used for Question.difficulty (matches seed_questions)
+DIFFICULTY_BANDS = ((5, 'easy'), (10, 'medium'), (15, 'hard'))
+
+
+def difficulty_for_level(level):
+    for top, difficulty in DIFFICULTY_BANDS:
+        if level <= top:
+            return difficulty
+    return DIFFICULTY_BANDS[-1][1]
+
+
+def answers():
+    """Logged answers (not lifeline uses) with a known question."""
+    return AnswerEvent.objects.filter(kind='answer', question__isnull=False)
+
+
+# ============================================================
+# ABILITIES
+# ============================================================
+
+def player_abilities(chunk_size=100000):
+    """
+    Returns (sorted user ids, ability per user): the log-odds of each
+    player's accuracy with add-one smoothing, standardized to mean 0
+    and unit variance.
+    """
+    rows = (
+        answers()
+        .order_by()
+        .values_list('session__user_id')
+        .annotate(n=Count('id'), k=Count('id', filter=Q(correct=True)))
+        .order_by('session__user_id')
+    )
+    data = np.array(list(rows.iterator(chunk_size=chunk_size)), dtype=np.int64).reshape(-1, 3)
+    user_ids, n, k = data[:, 0], data[:, 1], data[:, 2]
+
+    theta = np.log((k + 1) / (n - k + 1))
+    spread = theta.std()
+    theta = (theta - theta.mean()) / (spread if spread > 0 else 1.0)
+    return user_ids, theta
+
+
+# ============================================================
+# STREAMING ACCUMULATION
+# ============================================================
+
+def accumulate(question_ids, user_ids, theta, bins=20, chunk_size=100000):
+    """
+    Stream every answer once and count, per question and ability bin,
+    how many were answered and how many were correct.
+    Returns (answered[q, bin], correct[q, bin], mean θ per bin).
+    """
+    edges   = np.quantile(theta, np.linspace(0, 1, bins + 1)[1:-1])
+    user_bin = np.searchsorted(edges, theta, side='right')
+
+    size        = len(question_ids) * bins
+    answered    = np.zeros(size, dtype=np.int64)
+    correct     = np.zeros(size, dtype=np.int64)
+    bin_theta   = np.zeros(bins)
+    bin_answers = np.zeros(bins)
+
+    last = 0
+    while True:
+        chunk = list(
+            answers().filter(id__gt=last).order_by('id')
+            .values_list('id', 'question_id', 'session__user_id', 'correct')[:chunk_size]
+        )
+        if not chunk:
+            break
+        data = np.array(chunk, dtype=np.int64)
+        last = int(data[-1, 0])
+
+        q_pos = np.searchsorted(question_ids, data[:, 1])
+        u_pos = np.searchsorted(user_ids, data[:, 2])
+        known = (q_pos < len(question_ids)) & (question_ids[np.minimum(q_pos, len(question_ids) - 1)] == data[:, 1])
+        q_pos, u_pos, hits = q_pos[known], u_pos[known], data[known, 3]
+
+        b    = user_bin[u_pos]
+        flat = q_pos * bins + b
+        answered += np.bincount(flat, minlength=size)
+        correct  += np.bincount(flat, weights=hits, minlength=size).astype(np.int64)
+        bin_theta   += np.bincount(b, weights=theta[u_pos], minlength=bins)
+        bin_answers += np.bincount(b, minlength=bins)
+
+    centers = np.divide(bin_theta, bin_answers, out=np.zeros(bins), where=bin_answers > 0)
+    return answered.reshape(-1, bins), correct.reshape(-1, bins), centers
+
+
+# ============================================================
+# FIT
+# ============================================================
+
+def fit_2pl(answered, correct, centers, iterations=30, ridge=0.05):
+    """
+    Maximum-likelihood 2PL fit for every question at once.
+    Works on the logistic form α + β·θ (β = a, α = -a·b), solving each
+    question's 2×2 Newton step in closed form. Ridge pulls α to 0 and β
+    to 1 so questions with little data stay near an average item.
+    Returns (discrimination a, difficulty b) arrays.
+    """
+    n, k, t = answered.astype(float), correct.astype(float), centers[None, :]
+
+    rate  = (k.sum(1) + 0.5) / (n.sum(1) + 1.0)
+    alpha = np.log(rate / (1 - rate))
+    beta  = np.ones_like(alpha)
+
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-(alpha[:, None] + beta[:, None] * t)))
+        r = k - n * p
+        w = n * p * (1 - p)
+
+        g0  = r.sum(1) - ridge * alpha
+        g1  = (r * t).sum(1) - ridge * (beta - 1)
+        h00 = w.sum(1) + ridge
+        h01 = (w * t).sum(1)
+        h11 = (w * t * t).sum(1) + ridge
+        det = h00 * h11 - h01 * h01
+
+        alpha += (h11 * g0 - h01 * g1) / det
+        beta   = np.clip(beta + (h00 * g1 - h01 * g0) / det, 0.05, 5.0)
+
+    return beta, -alpha / beta
+
+
+def calibrate(bins=20, chunk_size=100000):
+    """
+    Run the whole fit. Returns (question ids, answers per question,
+    discrimination, difficulty), or None when there is no history.
+    """
+    user_ids, theta = player_abilities(chunk_size)
+    if not len(user_ids):
+        return None
+
+    question_ids = np.array(sorted(Question.objects.values_list('id', flat=True)), dtype=np.int64)
+    answered, correct, centers = accumulate(question_ids, user_ids, theta, bins, chunk_size)
+    a, b = fit_2pl(answered, correct, centers)
+    return question_ids, answered.sum(1), a, b
+
+
+# ============================================================
+# LEVEL SUGGESTIONS
+# ============================================================
+
+def suggest_levels(calibrated):
+    """
+    Given [(question id, current level, difficulty b)], reassign the
+    same multiset of levels in order of difficulty, so every level keeps
+    its number of questions. Returns {question id: suggested level}.
+    """
+    levels = sorted(level for _, level, _ in calibrated)
+    ranked = sorted(calibrated, key=lambda row: row[2])
+    return {pk: level for (pk, _, _), level in zip(ranked, levels)}
@@ -0,0 +1,170 @@
+# quiz/datagen.py
+
+"""
+Synthetic data at benchmark scale.
+
+Builds questions, users and finished/active GameSession rows in batched
+transactions (one multi-row INSERT per batch). Finished games follow the
+real game rules: a player at level L answers correctly with a chance
+that falls as the questions get harder, sometimes walks away, and is
+otherwise out with the safe-haven amount. So scores land on
+PRIZE_LADDER / SAFE_HAVENS values in a realistic shape. Used by
+`manage.py generate_data`.
+"""
+
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models  import User
+from django.db                   import connection, transaction
+from django.utils                import timezone
+
+from .models import Question, GameSession, PRIZE_LADDER
+from .game   import get_safe_score, OPTIONS
+from .       import question_io
+
+
+# Chance of answering level L correctly, from 0.97 at level 1 to 0.55 at 15
+CORRECT_RATE = {level: 0.97 - 0.03 * (level - 1) for level in range(1, 16)}
+QUIT_RATE    = 0.03   # Chance of walking away at any level
+
+
+# ============================================================
+# OUTCOME DISTRIBUTION
+# ============================================================
+
+def outcome_distribution(correct_rate=CORRECT_RATE, quit_rate=QUIT_RATE):
+    """
+    Every way a game can end as ((status, level reached, score), probability).
+    Worked out once, so drawing millions of games is a weighted choice.
+    """
+    outcomes, reach = [], 1.0
+    for level in range(1, 16):
+        quit  = reach * quit_rate
+        right = reach * (1 - quit_rate) * correct_rate[level]
+        lost  = reach - quit - right
+        safe  = get_safe_score(level)
+        outcomes.append((('quit', level, safe), quit))
+        outcomes.append((('lost', level, safe), lost))
+        reach = right
+    outcomes.append((('won', 15, PRIZE_LADDER[15]), reach))
+    return outcomes
+
+
+# ============================================================
+# BUILDERS
+# ============================================================
+
+def generate_questions(per_level, prefix, batch_size, on_batch=None):
+    """Upsert `per_level` synthetic questions on each level (idempotent)."""
+    def rows():
+        for level in range(1, 16):
+            for i in range(per_level):
+                correct = OPTIONS[i % 4]
+                yield question_io.to_question({
+                    'text':           f'[{prefix}] Level {level} question #{i}: which option is {correct}?',
+                    'option_a':       f'Option A{i}',
+                    'option_b':       f'Option B{i}',
+                    'option_c':       f'Option C{i}',
+                    'option_d':       f'Option D{i}',
+                    'correct_option': correct,
+                    'level':          level,
+                })
+    report = (lambda progress: on_batch(progress.rows)) if on_batch else None
+    return question_io.upsert(rows(), chunk_size=batch_size, on_chunk=report).rows
+
+
+def generate_users(count, prefix, batch_size, on_batch=None):
+    """
+    Create `count` users named <prefix>user<n> (existing names are
+    skipped) with unusable passwords. Returns all their IDs.
+    """
+    password = make_password(None)   # Hashing a real one per user would dominate
+    now      = timezone.now()
+    for start in range(0, count, batch_size):
+        batch = [
+            User(username=f'{prefix}user{i}', password=password, date_joined=now)
+            for i in range(start, min(start + batch_size, count))
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(batch, ignore_conflicts=True)
+        if on_batch:
+            on_batch(start + len(batch))
+    return list(
+        User.objects.filter(username__startswith=f'{prefix}user')
+        .order_by('id').values_list('id', flat=True)
+    )
+
+
+# GameSession columns written by insert_sessions(), in row order
+SESSION_COLUMNS = (
+    'user_id', 'started_at', 'ended_at', 'status', 'current_level', 'score',
+    'current_question_id', 'lifeline_5050', 'lifeline_skip', 'lifeline_poll',
+    'eliminated_options', 'audience_poll', 'deck',
+)
+
+
+def insert_sessions(rows):
+    """
+    One executemany() INSERT for a batch of plain tuples. bulk_create
+    spends most of its time preparing each value through the field
+    layer; these rows are already in database form.
+    """
+    table   = connection.ops.quote_name(GameSession._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(c) for c in SESSION_COLUMNS)
+    marks   = ', '.join(['%s'] * len(SESSION_COLUMNS))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(f'INSERT INTO {table} ({columns}) VALUES ({marks})', rows)
+
+
+def generate_sessions(finished, active, user_ids, days, batch_size, rng=random, on_batch=None):
+    """
+    Insert `finished` ended games spread over the last `days` days,
+    plus `active` in-progress games for distinct users who have none.
+    Returns (finished, active) counts actually written.
+    """
+    question_ids = {
+        level: list(Question.objects.filter(level=level).values_list('id', flat=True))
+        for level in range(1, 16)
+    }
+    outcomes, weights = zip(*outcome_distribution())
+    adapt  = connection.ops.adapt_datetimefield_value
+    now    = timezone.now()
+    window = days * 86400
+
+    def game(user_id, status, level, score, ended):
+        started = ended - timedelta(seconds=rng.randint(30, 60 * 15))
+        pool    = question_ids[level]
+        return (
+            user_id, adapt(started), adapt(ended) if status != 'active' else None,
+            status, level, score, rng.choice(pool) if pool else None,
+            rng.random() < 0.5, rng.random() < 0.6, rng.random() < 0.5,
+            '', '', '',
+        )
+
+    written = 0
+    for start in range(0, finished, batch_size):
+        size  = min(batch_size, finished - start)
+        users = rng.choices(user_ids, k=size)
+        ends  = rng.choices(outcomes, weights, k=size)
+        insert_sessions([
+            game(user, status, level, score, now - timedelta(seconds=rng.random() * window))
+            for user, (status, level, score) in zip(users, ends)
+        ])
+        written += size
+        if on_batch:
+            on_batch(written)
+
+    # One active game per user (enforced by a unique constraint)
+    busy  = set(GameSession.objects.filter(status='active').values_list('user_id', flat=True))
+    free  = [pk for pk in user_ids if pk not in busy]
+    picks = rng.sample(free, min(active, len(free)))
+    for start in range(0, len(picks), batch_size):
+        rows = []
+        for user in picks[start:start + batch_size]:
+            level = rng.randint(1, 15)
+            rows.append(game(user, 'active', level, PRIZE_LADDER.get(level - 1, 0), now))
+        insert_sessions(rows)
+
+    return written, len(picks)
@@ -0,0 +1,153 @@
+# quiz/events.py
+
+"""
+Buffered writer for the AnswerEvent log.
+
+record() only queues an event in process memory. The queue is written
+with one bulk_create once it holds QUIZ_EVENT_BATCH_SIZE events or its
+oldest event is QUIZ_EVENT_FLUSH_SECONDS old. That check runs when a
+request finishes, after the response has been sent (see signals.py),
+and every QUIZ_EVENT_FLUSH_SECONDS on a thread in each server process,
+so a worker that has gone quiet still writes its events in time.
+Whatever is left is written when the worker shuts down: atexit
+(apps.py) and gunicorn's worker_exit hook (gunicorn.conf.py).
+
+A batch the database can't take right now (OperationalError: locked,
+connection lost) goes back in the queue. One it rejects (IntegrityError,
+e.g. its session was deleted) is written an event at a time instead,
+dropping the events that fail, so bad rows never block good ones.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db   import DatabaseError, IntegrityError, OperationalError, connection, transaction
+
+from .models import AnswerEvent
+
+
+BATCH_SIZE    = getattr(settings, 'QUIZ_EVENT_BATCH_SIZE', 100)
+FLUSH_SECONDS = getattr(settings, 'QUIZ_EVENT_FLUSH_SECONDS', 5)
+MAX_PENDING   = BATCH_SIZE * 10   # Kept back across failed writes, newest first
+
+logger = logging.getLogger(__name__)
+
+_lock    = threading.Lock()
+_pending = []
+_oldest  = None   # time.monotonic() of the oldest pending event
+
+
+def record(**fields):
+    """Queue one AnswerEvent (fields as for the model)."""
+    global _oldest
+    with _lock:
+        if not _pending:
+            _oldest = time.monotonic()
+        _pending.append(AnswerEvent(**fields))
+
+
+def pending():
+    return len(_pending)
+
+
+def _take():
+    global _oldest
+    with _lock:
+        batch = _pending[:]
+        _pending.clear()
+        _oldest = None
+    return batch
+
+
+def flush():
+    """Write every pending event now. Returns how many were written."""
+    batch = _take()
+    if not batch:
+        return 0
+    try:
+        with transaction.atomic():
+            AnswerEvent.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+    except IntegrityError:
+        return _write_each(batch)
+    except OperationalError:
+        logger.exception('Could not write %d answer events; retrying on the next flush', len(batch))
+        _requeue(batch)
+        return 0
+    except DatabaseError:
+        logger.exception('Could not write %d answer events; dropped', len(batch))
+        return 0
+    return len(batch)
+
+
+def _write_each(batch):
+    """Write a rejected batch one event at a time, dropping the ones that fail."""
+    written = 0
+    for i, event in enumerate(batch):
+        try:
+            with transaction.atomic():
+                event.save(force_insert=True)
+        except IntegrityError as exc:
+            logger.warning('Dropped answer event (session %s, question %s): %s',
+                           event.session_id, event.question_id, exc)
+        except OperationalError:
+            logger.exception('Could not write %d answer events; retrying on the next flush', len(batch) - i)
+            _requeue(batch[i:])
+            break
+        else:
+            written += 1
+    return written
+
+
+def _requeue(batch):
+    global _oldest
+    with _lock:
+        _pending[:0] = batch
+        del _pending[:-MAX_PENDING]
+        _oldest = time.monotonic()
+
+
+def flush_if_due():
+    """Flush when the buffer is full or its oldest event has waited long enough."""
+    with _lock:
+        due = len(_pending) >= BATCH_SIZE or (
+            _pending and time.monotonic() - _oldest >= FLUSH_SECONDS
+        )
+    if due:
+        flush()
+
+
+def discard():
+    """Drop pending events without writing them (tests)."""
+    _take()
+
+
+# ============================================================
+# BACKGROUND THREAD
+# ============================================================
+
+_thread      = None
+_thread_lock = threading.Lock()
+
+
+def start(interval=FLUSH_SECONDS):
+    """Start this process's flush thread, once (no-op when interval is 0)."""
+    global _thread
+    if interval <= 0 or _thread is not None:
+        return
+    with _thread_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, args=(interval,), name='quiz-events', daemon=True)
+            _thread.start()
+
+
+def _run(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            flush_if_due()
+        except Exception:
+            logger.exception('Flushing answer events failed')
+        finally:
+            connection.close()
@@ -0,0 +1,529 @@
+# quiz/game.py
+
+"""
+Game rules and state transitions.
+
+Shared by the HTML views (quiz/views.py), which turn outcomes into
+redirects and flash messages, and the JSON API (quiz/api.py), which
+returns the outcome together with the next game state. The rules
+(judge_answer, advance, apply_lifeline) do no I/O so the async views
+(quiz/async_views.py) can reuse them with the async ORM.
+"""
+
+import random
+
+from asgiref.sync import sync_to_async
+
+from django.conf  import settings
+from django.db    import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import GameSession, PRIZE_LADDER, SAFE_HAVENS
+from .       import question_pool, leaderboard, game_store, events, seen_questions
+
+
+OPTIONS = ['A', 'B', 'C', 'D']
+
+# Lifeline URL names → GameSession availability flags
+LIFELINE_FIELDS = {
+    'fifty_fifty':   'lifeline_5050',
+    'skip':          'lifeline_skip',
+    'audience_poll': 'lifeline_poll',
+}
+
+# submit_answer() outcomes
+CORRECT = 'correct'   # advanced to the next level
+WON     = 'won'       # answered level 15 correctly
+LOST    = 'lost'      # wrong answer
+TIMEOUT = 'timeout'   # timer ran out (also a loss)
+INVALID = 'invalid'   # not one of A–D, or no current question
+MISSING = 'missing'   # no question available for the next level
+STALE   = 'stale'     # the session moved on under us (e.g. double submit)
+
+# Outcomes that end the game
+GAME_OVER = (WON, LOST, TIMEOUT)
+
+# Answer timer, enforced on the server as well as in quiz.js
+QUESTION_SECONDS = 30   # TIMER_DURATION in quiz.js
+ANSWER_GRACE     = getattr(settings, 'QUIZ_ANSWER_GRACE_SECONDS', 5)   # Allowance for network latency
+
+
+# ============================================================
+# HELPER FUNCTIONS
+# ============================================================
+
+def get_safe_score(level):
+    """
+    Return the safe haven score the player keeps
+    even if they lose — based on levels crossed.
+    """
+    safe = 0
+    for safe_level, amount in SAFE_HAVENS.items():
+        if level > safe_level:
+            safe = amount
+    return safe
+
+
+def get_active_session(user):
+    """Return the user's currently active game session, or None."""
+    # Newest first by id, which the (user, status) index already orders
+    session = GameSession.objects.filter(user=user, status='active').order_by('-id').first()
+    return game_store.load(session)
+
+
+def get_last_finished_session(user):
+    """Return the user's most recently finished game session, or None."""
+    return GameSession.objects.filter(
+        user=user
+    ).exclude(status='active').order_by('-ended_at').first()
+
+
+def get_question_for_level(level, exclude_ids=None, seen=()):
+    """
+    Fetch a random question matching the given level.
+    Optionally exclude question IDs, and prefer ones outside the
+    player's sorted `seen` IDs for the level (see seen_questions.py).
+    Served from the in-process pool index (see question_pool.py).
+    """
+    return question_pool.pick_question(level, exclude_ids, seen)
+
+
+def get_current_question(session):
+    """Return the session's current question via the pool's row cache."""
+    if not session.current_question_id:
+        return None
+    return question_pool.get_question(session.current_question_id)
+
+
+def get_deck_question(session, level, alternate=False):
+    """
+    Return the pre-drawn question for a level from the session's deck
+    (a single PK fetch at most), falling back to a fresh random pick
+    for sessions without a deck.
+    """
+    primary, alt = question_pool.deck_entry(session.deck, level)
+    pk = alt if alternate else primary
+    question = question_pool.get_question(pk) if pk else None
+    if question is None:
+        question = fallback_question(session, level, alternate)
+    return question
+
+
+def fallback_question(session, level, alternate=False):
+    """A fresh pick when the deck has nothing usable, avoiding seen questions."""
+    exclude = [session.current_question_id] if alternate else None
+    seen    = seen_questions.load(session.user_id).get(level)
+    return get_question_for_level(level, exclude_ids=exclude, seen=seen)
+
+
+def served_in_place(session, level, question, alternate=False):
+    """
+    Changes that write a fallback pick into the session's deck, so the
+    deck records what the player was actually served ({} if it already does).
+    """
+    primary, alt = question_pool.deck_entry(session.deck, level)
+    if question is None or question.pk == (alt if alternate else primary):
+        return {}
+    deck = question_pool.with_deck_entry(session.deck, level, question.pk, alternate)
+    return {'deck': deck} if deck != session.deck else {}
+
+
+def guarded(session, **expect):
+    """
+    Queryset matching the session only while it is still in the state
+    we read: active, on the same level and question (plus `expect`).
+    An UPDATE through it is a compare-and-set in one statement.
+    """
+    return GameSession.objects.filter(
+        pk                  = session.pk,
+        status              = 'active',
+        current_level       = session.current_level,
+        current_question_id = session.current_question_id,
+        **expect
+    )
+
+
+def save_transition(session, changes, **expect):
+    """
+    Write only the changed fields, and only if the session hasn't moved
+    on since it was read. Returns True and updates the instance on
+    success; False if another request got there first.
+    Goes through the write-behind cache when it is enabled.
+    """
+    if game_store.enabled():
+        return game_store.transition(session, changes, **expect)
+    if not guarded(session, **expect).update(**changes):
+        return False
+    for field, value in changes.items():
+        setattr(session, field, value)
+    return True
+
+
+async def asave_transition(session, changes, **expect):
+    """Async twin of save_transition()."""
+    if game_store.enabled():
+        return await sync_to_async(game_store.transition)(session, changes, **expect)
+    if not await guarded(session, **expect).aupdate(**changes):
+        return False
+    for field, value in changes.items():
+        setattr(session, field, value)
+    return True
+
+
+def end_game(session, status, score=None):
+    """
+    Finish a session and fold it into the materialized leaderboard
+    in one transaction. Score is left as-is when not given.
+    Returns False if the session had already moved on.
+    """
+    changes = {'status': status, 'ended_at': timezone.now()}
+    if score is not None:
+        changes['score'] = score
+
+    with transaction.atomic():
+        if not save_transition(session, changes):
+            return False
+        leaderboard.record_result(session)
+        seen_questions.record_served(session)
+    return True
+
+
+def elapsed_ms(session):
+    """Milliseconds since the current question was served, or None."""
+    if not session.question_started_at:
+        return None
+    return max(int((timezone.now() - session.question_started_at).total_seconds() * 1000), 0)
+
+
+def timed_out(session):
+    """True once the current question's timer (plus grace) has run out."""
+    elapsed = elapsed_ms(session)
+    return elapsed is not None and elapsed > (QUESTION_SECONDS + ANSWER_GRACE) * 1000
+
+
+def seconds_left(session):
+    """Whole seconds left on the current question's timer (grace not included)."""
+    elapsed = elapsed_ms(session)
+    if elapsed is None:
+        return QUESTION_SECONDS
+    return max(QUESTION_SECONDS - elapsed // 1000, 0)
+
+
+def lifelines_used(session):
+    return ','.join(name for name, field in LIFELINE_FIELDS.items() if not getattr(session, field))
+
+
+def answer_event(session, question, chosen, outcome):
+    """AnswerEvent fields for an answer, taken before the session moves on."""
+    return {
+        'session_id':     session.pk,
+        'question_id':    question.pk if question else None,
+        'level':          session.current_level,
+        'kind':           'answer',
+        'chosen':         (chosen or '').upper()[:7],
+        'correct':        outcome in (CORRECT, WON),
+        'elapsed_ms':     elapsed_ms(session),
+        'lifelines_used': lifelines_used(session),
+    }
+
+
+def lifeline_event(session, question, lifeline_type):
+    """AnswerEvent fields for a lifeline use, taken before it is spent."""
+    return {
+        'session_id':     session.pk,
+        'question_id':    question.pk,
+        'level':          session.current_level,
+        'kind':           lifeline_type,
+        'elapsed_ms':     elapsed_ms(session),
+        'lifelines_used': lifelines_used(session),
+    }
+
+
+def fifty_fifty_eliminations(question):
+    """Pick 2 wrong options for the 50-50 lifeline to remove."""
+    wrong_options = [opt for opt in OPTIONS if opt != question.correct_option]
+    return random.sample(wrong_options, 2)
+
+
+def make_audience_poll(question):
+    """Simulated poll percentages, weighted towards the correct answer."""
+    correct = question.correct_option
+    # Give correct answer a higher probability
+    correct_pct = random.randint(45, 75)
+    remaining   = 100 - correct_pct
+    others      = [o for o in OPTIONS if o != correct]
+
+    # Split remaining % among wrong options
+    split1 = random.randint(0, remaining)
+    split2 = random.randint(0, remaining - split1)
+    split3 = remaining - split1 - split2
+
+    splits = [split1, split2, split3]
+    random.shuffle(splits)
+
+    poll = {}
+    for i, opt in enumerate(others):
+        poll[opt] = splits[i]
+    poll[correct] = correct_pct
+    return {opt: poll[opt] for opt in OPTIONS}
+
+
+def encode_poll(poll):
+    return ','.join(f'{opt}:{pct}' for opt, pct in poll.items())
+
+
+def audience_poll(session):
+    """The poll taken on the current question, or None."""
+    if not session.audience_poll:
+        return None
+    return {opt: int(pct) for opt, pct in (pair.split(':') for pair in session.audience_poll.split(','))}
+
+
+# ============================================================
+# STATE TRANSITIONS
+# ============================================================
+
+def start_game(user, deck=None, tournament=None):
+    """
+    Start a new game session, ending any existing active one first.
+    A tournament game plays the tournament's shared `deck`.
+    Returns the new session, or None if there are no questions.
+    """
+    # Close any lingering active session
+    old = get_active_session(user)
+    if old:
+        end_game(old, 'quit')
+
+    # Draw the whole game's questions up front (15 levels + skip alternates),
+    # from questions this player hasn't been served before
+    if deck is None:
+        deck = question_pool.draw_deck(seen=seen_questions.load(user.pk))
+    first_id, _ = question_pool.deck_entry(deck, 1)
+    if not first_id:
+        return None
+
+    # One active session per user is enforced by a DB constraint; if a
+    # concurrent start won the race, carry on with its session.
+    try:
+        with transaction.atomic():
+            return GameSession.objects.create(
+                user                = user,
+                current_level       = 1,
+                current_question_id = first_id,
+                question_started_at = timezone.now(),
+                score               = 0,
+                deck                = deck,
+                tournament          = tournament,
+            )
+    except IntegrityError:
+        return get_active_session(user)
+
+
+def judge_answer(session, question, chosen):
+    """
+    Decide the outcome of an answer without touching the database.
+    - Correct  → CORRECT, or WON at level 15
+    - Wrong    → LOST (TIMEOUT when the timer ran out)
+    """
+    chosen = (chosen or '').upper()
+
+    # Handle timer timeout — treat as wrong answer. Answers that arrive
+    # after the timer has run out count too, whatever the client says.
+    if chosen == 'TIMEOUT' or timed_out(session):
+        return TIMEOUT
+    if not question or chosen not in OPTIONS:
+        return INVALID
+    if chosen != question.correct_option:
+        return LOST
+    if session.current_level == 15:
+        return WON
+    return CORRECT
+
+
+def finish(session, outcome):
+    """
+    End the game for a GAME_OVER outcome, applying the right payout.
+    Returns False if the session had already moved on.
+    """
+    if outcome == WON:
+        return end_game(session, 'won', PRIZE_LADDER.get(session.current_level, 0))
+    return end_game(session, 'lost', get_safe_score(session.current_level))
+
+
+def advance(session, next_question):
+    """Changes that move the session to the next level."""
+    return {
+        'score':               PRIZE_LADDER.get(session.current_level, 0),
+        'current_level':       session.current_level + 1,
+        'current_question':    next_question,
+        'question_started_at': timezone.now(),
+        'eliminated_options':  '',   # Reset 50-50 for new question
+        'audience_poll':       '',
+        **served_in_place(session, session.current_level + 1, next_question),
+    }
+
+
+def submit_answer(session, chosen):
+    """
+    Resolve the player's answer and move the session on.
+    - Correct  → advance to next level or win
+    - Wrong    → game over, apply safe haven score
+    Returns one of the outcome constants above.
+    """
+    question = get_current_question(session)
+    outcome  = judge_answer(session, question, chosen)
+
+    if outcome in GAME_OVER:
+        event = answer_event(session, question, chosen, outcome)
+        if not finish(session, outcome):
+            return STALE
+        events.record(**event)
+        return outcome
+    if outcome != CORRECT:
+        return outcome
+
+    # Advance to next level
+    next_q = get_deck_question(session, session.current_level + 1)
+    if not next_q:
+        return MISSING
+
+    event = answer_event(session, question, chosen, outcome)
+    if not save_transition(session, advance(session, next_q)):
+        return STALE
+    events.record(**event)
+    return CORRECT
+
+
+def quit_game(session, attempts=3):
+    """
+    Player walks away with their current safe haven amount.
+    Re-reads and retries if an answer lands at the same moment.
+    """
+    for _ in range(attempts):
+        if end_game(session, 'quit', get_safe_score(session.current_level)):
+            return True
+        session.refresh_from_db()
+        game_store.load(session)
+        if session.status != 'active':
+            return False
+    return False
+
+
+def lifeline_available(session, lifeline_type):
+    """True if the lifeline exists and hasn't been used this game."""
+    field = LIFELINE_FIELDS.get(lifeline_type)
+    return bool(field) and getattr(session, field)
+
+
+def apply_lifeline(session, lifeline_type, question, replacement=None):
+    """
+    Work out a lifeline's effect:
+    - fifty_fifty  : eliminate 2 wrong options
+    - skip         : swap in `replacement` (fetched by the caller)
+    - audience_poll: simulated poll percentages
+    Returns (effect dict, changes to save via save_transition).
+    """
+    changes = {LIFELINE_FIELDS[lifeline_type]: False}
+
+    # ── 50-50 ──
+    if lifeline_type == 'fifty_fifty':
+        eliminated = fifty_fifty_eliminations(question)
+        changes['eliminated_options'] = ','.join(eliminated)
+        return {'eliminated': eliminated}, changes
+
+    # ── SKIP ──
+    if lifeline_type == 'skip':
+        if replacement:
+            changes['skipped_level']       = session.current_level
+            changes['current_question']    = replacement
+            changes['question_started_at'] = timezone.now()
+            changes['eliminated_options']  = ''
+            changes['audience_poll']       = ''
+            changes.update(served_in_place(session, session.current_level, replacement, alternate=True))
+        return {'question': replacement or question, 'replaced': replacement is not None}, changes
+
+    # ── AUDIENCE POLL ──
+    # Kept on the game, so the play page can show it until the question changes
+    poll = make_audience_poll(question)
+    changes['audience_poll'] = encode_poll(poll)
+    return {'poll': poll}, changes
+
+
+def use_lifeline(session, lifeline_type):
+    """
+    Use one lifeline if it is still available and the question's time
+    hasn't run out. Returns a dict describing the effect, or None if
+    nothing was used.
+    """
+    if not lifeline_available(session, lifeline_type) or timed_out(session):
+        return None
+
+    question = get_current_question(session)
+    if not question:
+        return None
+
+    replacement = None
+    if lifeline_type == 'skip':
+        replacement = get_deck_question(session, session.current_level, alternate=True)
+
+    event = lifeline_event(session, question, lifeline_type)
+    effect, changes = apply_lifeline(session, lifeline_type, question, replacement)
+
+    # Only spend the lifeline if it is still unused in the database
+    if not save_transition(session, changes, **{LIFELINE_FIELDS[lifeline_type]: True}):
+        return None
+    events.record(**event)
+    return effect
+
+
+# ============================================================
+# SERIALIZATION
+# ============================================================
+
+def question_payload(question):
+    """Public view of a question — never includes the answer."""
+    return {
+        'text':    question.text,
+        'options': {
+            'A': question.option_a,
+            'B': question.option_b,
+            'C': question.option_c,
+            'D': question.option_d,
+        },
+    }
+
+
+def lifeline_delta(lifeline_type, effect):
+    """
+    Only what a lifeline changed on the play screen: the eliminated
+    options, the poll, or the replacement question (which also clears
+    both). The partial lifeline endpoints send this instead of a page.
+    """
+    delta = {'result': 'used', 'lifeline': lifeline_type}
+    if lifeline_type != 'skip':
+        delta.update(effect)
+    elif effect['replaced']:
+        delta.update(question=question_payload(effect['question']), eliminated=[], poll=None)
+    return delta
+
+
+def game_state(session):
+    """Everything the play screen needs to render the current turn."""
+    state = {
+        'status':     session.status,
+        'level':      session.current_level,
+        'score':      session.score,
+        'prize':      PRIZE_LADDER.get(session.current_level, 0),
+        'safe_score': get_safe_score(session.current_level),
+        'lifelines':  {name: getattr(session, field) for name, field in LIFELINE_FIELDS.items()},
+        'eliminated': session.eliminated_options.split(',') if session.eliminated_options else [],
+        'poll':       audience_poll(session),
+        'question':   None,
+        # The client's countdown starts here, not at QUESTION_SECONDS
+        'seconds_left': seconds_left(session),
+    }
+    if session.status == 'active':
+        question = get_current_question(session)
+        if question:
+            state['question'] = question_payload(question)
+    return state
@@ -0,0 +1,289 @@
+# quiz/game_store.py
+
+"""
+Write-behind store for active game state.
+
+With QUIZ_GAME_STATE_STORE = 'cache', the fields that change every turn
+(level, question, score, lifelines, eliminated options) live in the
+Django cache while a game is in progress, and are written back to the
+GameSession row only at checkpoints:
+
+- the game ends (status changes),
+- the player passes a safe haven,
+- QUIZ_GAME_STATE_FLUSH_SECONDS have passed since the last write-back,
+- `manage.py flush_game_states` runs (e.g. before a deploy).
+
+The third is checked on each transition, and also every
+QUIZ_GAME_STATE_FLUSH_SECONDS by a thread in each server process that
+writes back every changed game (flush_all), so a game the player walked
+away from reaches its row too. While a server is running, the row is at
+most about one interval behind the cache.
+
+The row therefore always holds the last checkpoint. If a cache entry is
+lost (restart, eviction), the next transition rebuilds it from the row
+and the game resumes from there. With more than one worker process the
+cache must be shared (see CACHES / REDIS_URL in settings).
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf       import settings
+from django.core.cache import cache
+from django.db         import connection, transaction
+
+from .models import GameSession, SAFE_HAVENS
+
+
+FLUSH_SECONDS = getattr(settings, 'QUIZ_GAME_STATE_FLUSH_SECONDS', 30)
+STATE_TIMEOUT = 24 * 60 * 60   # Idle games fall back to their last checkpoint
+LOCK_TIMEOUT  = 5
+LOCK_ATTEMPTS = 50
+
+logger = logging.getLogger(__name__)
+
+# GameSession fields kept in the cache while a game is active
+STATE_FIELDS = (
+    'current_level', 'current_question_id', 'question_started_at', 'score',
+    'eliminated_options', 'audience_poll', 'lifeline_5050', 'lifeline_skip', 'lifeline_poll',
+    'skipped_level', 'deck',
+)
+
+
+def enabled():
+    return getattr(settings, 'QUIZ_GAME_STATE_STORE', 'db') == 'cache'
+
+
+def _key(pk):
+    return f'quiz:game:{pk}'
+
+
+# ============================================================
+# READS
+# ============================================================
+
+def _apply(session, state):
+    for field in STATE_FIELDS:
+        if field in state:
+            setattr(session, field, state[field])
+    return session
+
+
+def _snapshot(values):
+    state = {field: values[field] for field in STATE_FIELDS}
+    state.update(flushed_at=time.time(), dirty=False)
+    return state
+
+
+def load(session):
+    """
+    Overlay the cached state on a session read from the DB. On a miss the
+    row is the last checkpoint, so it seeds the cache as-is (add() never
+    overwrites a newer entry written in the meantime).
+    """
+    if session is None or not enabled():
+        return session
+    key   = _key(session.pk)
+    state = cache.get(key)
+    if state is None:
+        cache.add(key, _snapshot(vars(session)), STATE_TIMEOUT)
+        return session
+    return _apply(session, state)
+
+
+async def aload(session):
+    """Async twin of load()."""
+    if session is None or not enabled():
+        return session
+    key   = _key(session.pk)
+    state = await cache.aget(key)
+    if state is None:
+        await cache.aadd(key, _snapshot(vars(session)), STATE_TIMEOUT)
+        return session
+    return _apply(session, state)
+
+
+def _checkpoint_state(pk):
+    """Rebuild the state from the row (the last checkpoint)."""
+    row = GameSession.objects.filter(pk=pk, status='active').values(*STATE_FIELDS).first()
+    return _snapshot(row) if row else None
+
+
+# ============================================================
+# WRITES
+# ============================================================
+
+@contextmanager
+def _locked(pk):
+    """Per-session lock built on cache.add(), which is atomic in every backend."""
+    lock = _key(pk) + ':lock'
+    for _ in range(LOCK_ATTEMPTS):
+        if cache.add(lock, 1, LOCK_TIMEOUT):
+            try:
+                yield True
+            finally:
+                cache.delete(lock)
+            return
+        time.sleep(0.01)
+    yield False
+
+
+def _is_checkpoint(state, changes, row_changes):
+    if row_changes:   # status / ended_at: the game is ending
+        return True
+    if changes.get('current_level', 0) - 1 in SAFE_HAVENS:
+        return True
+    return time.time() - state['flushed_at'] >= FLUSH_SECONDS
+
+
+def _write_back(pk, state, **row_changes):
+    # States cached before a field was added don't carry it: leave the row's
+    fields = {field: state[field] for field in STATE_FIELDS if field in state}
+    return GameSession.objects.filter(pk=pk, status='active').update(**fields, **row_changes)
+
+
+def transition(session, changes, **expect):
+    """
+    Cache-backed twin of game.save_transition(): apply `changes` only if
+    the stored state still matches what the caller read (same level and
+    question, plus `expect`), writing through to the row at checkpoints.
+    Returns True and updates the instance on success.
+    """
+    state_changes, row_changes = {}, {}
+    for field, value in changes.items():
+        if field == 'current_question':
+            state_changes['current_question_id'] = value.pk if value else None
+        elif field in STATE_FIELDS:
+            state_changes[field] = value
+        else:
+            row_changes[field] = value
+
+    key = _key(session.pk)
+    with _locked(session.pk) as acquired:
+        if not acquired:
+            return False
+
+        state = cache.get(key) or _checkpoint_state(session.pk)
+        read  = dict(
+            current_level       = session.current_level,
+            current_question_id = session.current_question_id,
+            **expect
+        )
+        if not state or any(state[field] != value for field, value in read.items()):
+            return False
+
+        state.update(state_changes)
+        if _is_checkpoint(state, state_changes, row_changes):
+            if not _write_back(session.pk, state, **row_changes):
+                return False
+            if row_changes:
+                # Finished games live in the row only
+                transaction.on_commit(lambda: cache.delete(key))
+            state.update(flushed_at=time.time(), dirty=False)
+        else:
+            state['dirty'] = True
+
+        if not row_changes:
+            cache.set(key, state, STATE_TIMEOUT)
+
+    for field, value in changes.items():
+        setattr(session, field, value)
+    return True
+
+
+def flush_all(batch_size=500):
+    """Write every dirty cached game back to its row. Returns how many."""
+    flushed, last = 0, 0
+    while True:
+        batch = list(
+            GameSession.objects.filter(status='active', pk__gt=last)
+            .order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            return flushed
+        last   = batch[-1]
+        cached = cache.get_many([_key(pk) for pk in batch])
+        for pk in batch:
+            if not cached.get(_key(pk), {}).get('dirty'):
+                continue
+            with _locked(pk) as acquired:
+                state = cache.get(_key(pk)) if acquired else None
+                if state and state['dirty'] and _write_back(pk, state):
+                    state.update(flushed_at=time.time(), dirty=False)
+                    cache.set(_key(pk), state, STATE_TIMEOUT)
+                    flushed += 1
+
+
+# ============================================================
+# REAPER SUPPORT
+# ============================================================
+
+def settle(pks, cutoff):
+    """
+    Of these games, idle by their row, return the ones that are idle by
+    their cached state too. Newer cached state is written back first,
+    so the reaper pays out on the level actually reached.
+    """
+    if not enabled():
+        return list(pks)
+    cached = cache.get_many([_key(pk) for pk in pks])
+    idle   = []
+    for pk in pks:
+        state = cached.get(_key(pk))
+        if state and state['dirty']:
+            with _locked(pk) as acquired:
+                state = cache.get(_key(pk)) if acquired else None
+                if not state or _fresh(state, cutoff):
+                    continue
+                if state['dirty'] and _write_back(pk, state):
+                    state.update(flushed_at=time.time(), dirty=False)
+                    cache.set(_key(pk), state, STATE_TIMEOUT)
+        elif state and _fresh(state, cutoff):
+            continue
+        idle.append(pk)
+    return idle
+
+
+def _fresh(state, cutoff):
+    started = state['question_started_at']
+    return started is not None and started >= cutoff
+
+
+def forget(pks):
+    """Drop cached state for games that have ended outside transition()."""
+    if enabled() and pks:
+        cache.delete_many([_key(pk) for pk in pks])
+
+
+# ============================================================
+# BACKGROUND THREAD
+# ============================================================
+
+_thread      = None
+_thread_lock = threading.Lock()
+
+
+def start(interval=FLUSH_SECONDS):
+    """Start this process's write-back thread, once (no-op unless the store is on)."""
+    global _thread
+    if not enabled() or interval <= 0 or _thread is not None:
+        return
+    with _thread_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, args=(interval,), name='quiz-game-store', daemon=True)
+            _thread.start()
+
+
+def _run(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            flushed = flush_all()
+            if flushed:
+                logger.info('Wrote back %d cached games', flushed)
+        except Exception:
+            logger.exception('Writing back cached games failed')
+        finally:
+            connection.close()
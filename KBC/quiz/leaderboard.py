@@ -0,0 +1,124 @@
+# quiz/leaderboard.py
+
+"""
+Materialized leaderboard.
+
+Each user's personal best lives in UserStats and is updated in the same
+transaction that ends a game, so the public leaderboard is a top-N read
+on an index instead of a GROUP BY over every finished session.
+"""
+
+from django.db        import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+
+from .models import GameSession, UserStats
+from .       import ranks
+
+
+# Finished status → UserStats counter
+OUTCOME_COUNTERS = {'won': 'wins', 'lost': 'losses', 'quit': 'quits'}
+
+
+def record_result(session):
+    """
+    Fold a finished session into the user's stats row: bump the
+    lifetime counters and, if beaten, the personal best.
+    Must run inside the transaction that ends the session.
+    Keeps the rank histogram in step with personal-best changes.
+    Returns (old_best, new_best); old_best is None for a first game.
+    """
+    counter = OUTCOME_COUNTERS[session.status]
+    stats   = UserStats.objects.select_for_update().filter(user_id=session.user_id).first()
+
+    if stats is None:
+        UserStats.objects.create(
+            user_id        = session.user_id,
+            best_score     = session.score,
+            best_at        = session.ended_at,
+            games_played   = 1,
+            total_winnings = session.score,
+            last_played    = session.ended_at,
+            **{counter: 1}
+        )
+        ranks.record_best_change(None, session.score)
+        return None, session.score
+
+    changes = {
+        'games_played':   F('games_played') + 1,
+        'total_winnings': F('total_winnings') + session.score,
+        'last_played':    session.ended_at,
+        counter:          F(counter) + 1,
+    }
+    old_best = stats.best_score
+    if session.score > old_best:
+        changes.update(best_score=session.score, best_at=session.ended_at)
+    UserStats.objects.filter(pk=stats.pk).update(**changes)
+
+    if session.score > old_best:
+        ranks.record_best_change(old_best, session.score)
+        return old_best, session.score
+    return old_best, old_best
+
+
+def top_players(limit=10):
+    """Top users by personal best, earliest achiever first on ties."""
+    return (
+        UserStats.objects
+        .order_by('-best_score', 'best_at')
+        .values('user__username', 'best_score')[:limit]
+    )
+
+
+def rebuild(batch_size=1000):
+    """
+    Recompute every UserStats row from finished GameSession history,
+    then the rank histogram. Returns the number of users written.
+    """
+    finished = GameSession.objects.exclude(status='active')
+    first_best = (
+        finished
+        .filter(user=OuterRef('user'))
+        .order_by('-score', 'ended_at')
+        .values('ended_at')[:1]
+    )
+    rows = (
+        finished
+        .order_by()
+        .values('user')
+        .annotate(
+            best     = Max('score'),
+            best_at  = Subquery(first_best),
+            games    = Count('id'),
+            winnings = Sum('score'),
+            last     = Max('ended_at'),
+            **{
+                counter: Count('id', filter=Q(status=status))
+                for status, counter in OUTCOME_COUNTERS.items()
+            }
+        )
+    )
+
+    count = 0
+    with transaction.atomic():
+        UserStats.objects.all().delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(UserStats(
+                user_id        = row['user'],
+                best_score     = row['best'],
+                best_at        = row['best_at'],
+                games_played   = row['games'],
+                wins           = row['wins'],
+                losses         = row['losses'],
+                quits          = row['quits'],
+                total_winnings = row['winnings'],
+                last_played    = row['last'],
+            ))
+            if len(batch) >= batch_size:
+                UserStats.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        UserStats.objects.bulk_create(batch)
+        count += len(batch)
+    ranks.rebuild()
+    return count
@@ -0,0 +1,355 @@
+# quiz/live.py
+
+"""
+Fastest Finger First: live multiplayer rooms over WebSockets.
+
+KBC/asgi.py sends WebSocket connections on /ws/fff/<room>/ here; HTTP
+still goes to Django. Everyone in a room gets the same question at the
+same moment, and the fastest correct answer wins the hot seat: a fresh
+single-player game, and a link to it.
+
+Each room runs its rounds in one asyncio task. A question is serialized
+once and the same text frame is queued for every player. Each player
+has a sender task draining its own queue, so a slow client never holds
+up the others; one that falls QUEUE_SIZE frames behind is disconnected.
+
+Answers are stamped with time.monotonic_ns() as they arrive, relative
+to when the question was queued, so the ranking never depends on
+client clocks. A round and all its answers are written in one
+transaction, with a single bulk_create, when it closes.
+
+Rooms live in the process that accepted the connections: serve live
+mode from one ASGI worker, or route each room to a fixed worker.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from http.cookies import SimpleCookie
+from importlib    import import_module
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+
+from django.conf              import settings
+from django.contrib.auth      import aget_user
+from django.db                import DatabaseError, transaction
+from django.http              import HttpRequest
+from django.http.request      import split_domain_port, validate_host
+from django.urls              import reverse
+from django.utils             import timezone
+
+from .models import FastestFingerRound, FastestFingerAnswer
+from .       import game, question_pool
+
+
+PATH_RE        = re.compile(r'^/ws/fff/(?P<room>[\w-]{1,40})/$')
+ANSWER_SECONDS = getattr(settings, 'QUIZ_FFF_ANSWER_SECONDS', 10)
+BREAK_SECONDS  = getattr(settings, 'QUIZ_FFF_BREAK_SECONDS', 5)
+MIN_PLAYERS    = getattr(settings, 'QUIZ_FFF_MIN_PLAYERS', 2)
+QUEUE_SIZE     = 16            # Frames a player may fall behind before being dropped
+LEVELS         = range(1, 6)   # Fastest Finger questions come from the easy end
+FASTEST_SHOWN  = 5             # Fastest correct answers listed in each result
+
+# Close codes (4000-4999 are free for applications)
+CLOSE_FORBIDDEN = 4403
+CLOSE_NOT_FOUND = 4404
+CLOSE_LAGGING   = 4408
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# PLAYERS AND ROUNDS
+# ============================================================
+
+class Player:
+    """One connection: its user and its queue of outgoing frames."""
+
+    def __init__(self, user, send):
+        self.user   = user
+        self.send   = send
+        self.queue  = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.sender = asyncio.create_task(self._drain())
+
+    def push(self, frame):
+        """Queue a frame without waiting. False if the player is too far behind."""
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _drain(self):
+        try:
+            while True:
+                frame = await self.queue.get()
+                await self.send({'type': 'websocket.send', 'text': frame})
+        except OSError:
+            pass   # Gone; the receive loop sees the disconnect
+
+    async def close(self, code):
+        self.sender.cancel()
+        await self.send({'type': 'websocket.close', 'code': code})
+
+
+class Round:
+    """One question in a room, and the answers received so far."""
+
+    def __init__(self, number, question, players):
+        self.number     = number
+        self.question   = question
+        self.players    = players
+        self.started_at = timezone.now()
+        self.sent_ns    = None
+        self.answers    = {}   # user id → (elapsed ns, chosen, correct, player)
+        self.all_in     = asyncio.Event()
+
+    def fastest(self):
+        """Correct answers, fastest first."""
+        return sorted(
+            (answer for answer in self.answers.values() if answer[2]),
+            key=lambda answer: answer[0],
+        )
+
+
+def ms(ns):
+    return round(ns / 1_000_000, 1)
+
+
+# ============================================================
+# ROOMS
+# ============================================================
+
+_rooms = {}
+
+
+def get_room(name):
+    room = _rooms.get(name)
+    if room is None:
+        room = _rooms[name] = Room(name)
+    return room
+
+
+class Room:
+    """A live room: its players and the task running its rounds."""
+
+    def __init__(self, name):
+        self.name    = name
+        self.players = set()
+        self.current = None   # The open Round, if any
+        self.rounds  = 0
+        self.changed = asyncio.Event()
+        self.task    = None
+
+    def join(self, player):
+        self.players.add(player)
+        self.changed.set()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def leave(self, player):
+        self.players.discard(player)
+        self.changed.set()
+        if self.current and len(self.current.answers) >= len(self.players):
+            self.current.all_in.set()
+
+    def broadcast(self, message):
+        """Serialize once and queue the same frame for every player."""
+        frame = json.dumps(message)
+        for player in list(self.players):
+            if not player.push(frame):
+                self.leave(player)
+                asyncio.create_task(player.close(CLOSE_LAGGING))
+        return frame
+
+    async def run(self):
+        try:
+            while self.players:
+                if len(self.players) < MIN_PLAYERS:
+                    self.changed.clear()
+                    await self.changed.wait()
+                    continue
+                await self.play_round()
+                await asyncio.sleep(BREAK_SECONDS)
+        except Exception:
+            logger.exception('Live room %s stopped', self.name)
+        finally:
+            if _rooms.get(self.name) is self:
+                del _rooms[self.name]
+
+    async def play_round(self):
+        question = await sync_to_async(question_pool.pick_question)(random.choice(LEVELS))
+        if question is None:
+            logger.error('Live room %s: no question to ask', self.name)
+            return
+
+        self.rounds += 1
+        current = self.current = Round(self.rounds, question, len(self.players))
+        current.sent_ns = time.monotonic_ns()
+        self.broadcast({
+            'type':     'question',
+            'round':    current.number,
+            'question': game.question_payload(question),
+            'seconds':  ANSWER_SECONDS,
+            'players':  current.players,
+            'sent_ns':  current.sent_ns,   # Server monotonic clock, for same-host latency checks
+        })
+        try:
+            await asyncio.wait_for(current.all_in.wait(), ANSWER_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        self.current = None
+
+        fastest = current.fastest()
+        winner  = fastest[0] if fastest else None
+        self.broadcast({
+            'type':           'result',
+            'round':          current.number,
+            'correct_option': question.correct_option,
+            'answers':        len(current.answers),
+            'winner':         winner[3].user.username if winner else None,
+            'winner_ms':      ms(winner[0]) if winner else None,
+            'fastest':        [[a[3].user.username, ms(a[0])] for a in fastest[:FASTEST_SHOWN]],
+        })
+
+        try:
+            await sync_to_async(save_round)(self.name, current, winner)
+        except DatabaseError:
+            logger.exception('Live room %s: could not save round %d', self.name, current.number)
+        if winner:
+            await self.seat(winner[3])
+
+    async def seat(self, player):
+        """
+        Start the winner's game in the hot seat and send them to it.
+        A game they already have in progress is left alone: they're told
+        to finish it instead.
+        """
+        session = await sync_to_async(seat_player)(player.user)
+        if session is BUSY:
+            player.push(json.dumps({'type': 'hot_seat_busy', 'url': reverse('play')}))
+        elif session:
+            player.push(json.dumps({'type': 'hot_seat', 'url': reverse('play')}))
+
+    def answer(self, player, data, received_ns):
+        """Take a player's first answer to the open round."""
+        current = self.current
+        chosen  = str(data.get('option', '')).upper()
+        if (current is None or data.get('round') != current.number
+                or player.user.pk in current.answers or chosen not in game.OPTIONS):
+            return
+
+        elapsed = received_ns - current.sent_ns
+        if elapsed > ANSWER_SECONDS * 1_000_000_000:
+            return
+        current.answers[player.user.pk] = (
+            elapsed, chosen, chosen == current.question.correct_option, player,
+        )
+        player.push(json.dumps({'type': 'answered', 'round': current.number, 'ms': ms(elapsed)}))
+        if len(current.answers) >= len(self.players):
+            current.all_in.set()
+
+
+BUSY = object()
+
+
+def seat_player(user):
+    """A new game for the winner, or BUSY if they have one in progress."""
+    if game.get_active_session(user):
+        return BUSY
+    return game.start_game(user)
+
+
+def save_round(room, current, winner):
+    """Write a closed round and its answers: one transaction, one bulk insert."""
+    with transaction.atomic():
+        row = FastestFingerRound.objects.create(
+            room        = room,
+            question_id = current.question.pk,
+            started_at  = current.started_at,
+            players     = current.players,
+            winner      = winner[3].user if winner else None,
+            winner_ms   = round(winner[0] / 1_000_000) if winner else None,
+        )
+        FastestFingerAnswer.objects.bulk_create([
+            FastestFingerAnswer(
+                round=row, user_id=user_id, chosen=chosen, correct=correct,
+                elapsed_ms=round(elapsed / 1_000_000),
+            )
+            for user_id, (elapsed, chosen, correct, _) in current.answers.items()
+        ], batch_size=500)
+    return row
+
+
+# ============================================================
+# ASGI APPLICATION
+# ============================================================
+
+def header(scope, name):
+    for key, value in scope.get('headers', ()):
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+
+def origin_allowed(scope):
+    """Browsers send Origin: refuse pages on hosts this site doesn't serve."""
+    origin = header(scope, b'origin')
+    if origin is None:
+        return True
+    host, _ = split_domain_port(urlsplit(origin).netloc)
+    allowed = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed:
+        allowed = ['.localhost', '127.0.0.1', '[::1]']
+    return validate_host(host, allowed)
+
+
+async def authenticate(scope):
+    """The user of the Django session named in the connection's cookie."""
+    cookie  = SimpleCookie(header(scope, b'cookie') or '')
+    morsel  = cookie.get(settings.SESSION_COOKIE_NAME)
+    request = HttpRequest()
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(
+        morsel.value if morsel else None
+    )
+    return await aget_user(request)
+
+
+async def application(scope, receive, send):
+    """ASGI app for /ws/fff/<room>/ WebSocket connections."""
+    if (await receive())['type'] != 'websocket.connect':
+        return
+
+    match = PATH_RE.match(scope['path'])
+    if not match:
+        await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+        return
+    user = await authenticate(scope) if origin_allowed(scope) else None
+    if user is None or not user.is_authenticated:
+        await send({'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
+        return
+
+    await send({'type': 'websocket.accept'})
+    room   = get_room(match['room'])
+    player = Player(user, send)
+    room.join(player)
+    player.push(json.dumps({'type': 'welcome', 'room': room.name, 'players': len(room.players)}))
+    try:
+        while True:
+            message = await receive()
+            received_ns = time.monotonic_ns()
+            if message['type'] == 'websocket.disconnect':
+                break
+            try:
+                data = json.loads(message.get('text') or '')
+            except ValueError:
+                continue
+            if isinstance(data, dict) and data.get('type') == 'answer':
+                room.answer(player, data, received_ns)
+    finally:
+        room.leave(player)
+        player.sender.cancel()
@@ -0,0 +1,239 @@
+# quiz/loadgen.py
+
+"""
+Synthetic players for load testing a running server.
+
+Each Player drives one browser-like session over plain HTTP (urllib,
+own cookie jar, CSRF token from the csrftoken cookie): register or log
+in, then play full games — answer with a configurable accuracy, use
+lifelines, sometimes quit. Every request is timed per endpoint into a
+shared LoadStats. Used by `manage.py loadtest`.
+"""
+
+import html
+import random
+import re
+import threading
+import time
+import http.cookiejar
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+from .models import Question
+
+
+QUESTION_RE = re.compile(r'<p [^>]*id="question-text"[^>]*>\s*(.*?)\s*</p>', re.S)
+OPTION_RE   = re.compile(r'name="answer"\s+value="([ABCD])"')
+LIFELINES   = ('fifty_fifty', 'skip', 'audience_poll')
+
+
+# ============================================================
+# STATS
+# ============================================================
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class LoadStats:
+    """Thread-safe per-endpoint latency and error counters."""
+
+    def __init__(self):
+        self._lock         = threading.Lock()
+        self.latencies     = {}   # {endpoint: [seconds, ...]}
+        self.errors        = {}   # {endpoint: count of non-2xx/3xx}
+        # 5xx responses. Under write load on SQLite these are nearly always
+        # "database is locked"; the text itself only shows with DEBUG on
+        self.server_errors = 0
+        self.games         = 0
+
+    def record(self, endpoint, seconds, status):
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if status >= 400 or status == 0:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            if status >= 500:
+                self.server_errors += 1
+
+    def game_done(self):
+        with self._lock:
+            self.games += 1
+
+    @property
+    def total_requests(self):
+        return sum(len(v) for v in self.latencies.values())
+
+    def summary(self):
+        """Rows of (endpoint, count, errors, p50, p95, p99) in milliseconds."""
+        rows = []
+        for endpoint in sorted(self.latencies):
+            values = sorted(self.latencies[endpoint])
+            rows.append((
+                endpoint, len(values), self.errors.get(endpoint, 0),
+                percentile(values, 50) * 1000,
+                percentile(values, 95) * 1000,
+                percentile(values, 99) * 1000,
+            ))
+        return rows
+
+
+# ============================================================
+# PLAYER
+# ============================================================
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Surface 3xx responses so each hop is timed as its own endpoint."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Player:
+    """One synthetic user with its own cookie jar."""
+
+    def __init__(self, base_url, username, password, stats, answers,
+                 accuracy=0.8, lifeline_rate=0.2, quit_rate=0.02, timeout=30):
+        self.base_url      = base_url.rstrip('/')
+        self.username      = username
+        self.password      = password
+        self.stats         = stats
+        self.answers       = answers      # {question text: correct option}, read-only
+        self.accuracy      = accuracy
+        self.lifeline_rate = lifeline_rate
+        self.quit_rate     = quit_rate
+        self.timeout       = timeout
+
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener  = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect,
+        )
+
+    # ── HTTP ──
+
+    def request(self, endpoint, path, data=None):
+        """Timed GET (or POST when data is given); returns (status, body)."""
+        url = self.base_url + path
+        if data is not None:
+            data = dict(data, csrfmiddlewaretoken=self.csrf_token())
+            data = urllib.parse.urlencode(data).encode()
+        req = urllib.request.Request(url, data=data, headers={'Referer': url})
+
+        start = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=self.timeout) as resp:
+                status, body = resp.status, resp.read()
+        except urllib.error.HTTPError as exc:
+            status, body = exc.code, exc.read()
+        except (urllib.error.URLError, OSError):
+            status, body = 0, b''
+        self.stats.record(endpoint, time.perf_counter() - start, status)
+        return status, body
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == 'csrftoken':
+                return cookie.value
+        return ''
+
+    # ── Flow ──
+
+    def sign_in(self):
+        """Register a fresh account, or log in if it already exists."""
+        self.request('register_form', '/register/')
+        status, _ = self.request('register', '/register/', {
+            'username':  self.username,
+            'email':     f'{self.username}@loadtest.local',
+            'password1': self.password,
+            'password2': self.password,
+        })
+        if status == 302:
+            return True
+
+        self.request('login_form', '/login/')
+        status, _ = self.request('login', '/login/', {
+            'username': self.username,
+            'password': self.password,
+        })
+        return status == 302
+
+    def correct_option(self, text):
+        return self.answers.get(text)
+
+    def play_game(self):
+        """Play one game to the end; returns when it is won, lost or quit."""
+        self.request('start', '/game/start/')
+        unused = list(LIFELINES)
+
+        for _ in range(16 + len(LIFELINES)):
+            status, body = self.request('play', '/game/play/')
+            if status != 200:
+                break
+            page = body.decode('utf-8', 'replace')
+            match = QUESTION_RE.search(page)
+            options = OPTION_RE.findall(page)
+            if not match or not options:
+                break
+
+            if random.random() < self.quit_rate:
+                self.request('quit', '/game/quit/', {})
+                break
+
+            if unused and random.random() < self.lifeline_rate:
+                lifeline = unused.pop(random.randrange(len(unused)))
+                self.request(f'lifeline:{lifeline}', f'/game/lifeline/{lifeline}/', {})
+                continue
+
+            correct = self.correct_option(html.unescape(match.group(1)))
+            if correct in options and random.random() < self.accuracy:
+                choice = correct
+            else:
+                choice = random.choice([o for o in options if o != correct] or options)
+
+            status, _ = self.request('answer', '/game/answer/', {'answer': choice})
+            if status == 302 and choice != correct:
+                break
+
+        self.request('result', '/game/result/')
+        self.stats.game_done()
+
+    def run(self, games):
+        try:
+            if not self.sign_in():
+                return
+            for _ in range(games):
+                self.play_game()
+        finally:
+            # Players only speak HTTP, but never leave a worker's connection open
+            connections.close_all()
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+
+def run_load(base_url, users=10, games=1, concurrency=None, prefix='load',
+             password='Quiz-Bench-7319', **player_options):
+    """
+    Play `games` games for each of `users` players, `concurrency` at a
+    time. Returns (LoadStats, wall-clock seconds).
+    """
+    stats   = LoadStats()
+    # Answer key, loaded once here: worker threads never query the database
+    answers = dict(Question.objects.values_list('text', 'correct_option').iterator(chunk_size=5000))
+    players = [
+        Player(base_url, f'{prefix}{i}', password, stats, answers, **player_options)
+        for i in range(users)
+    ]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency or users) as pool:
+        list(pool.map(lambda p: p.run(games), players))
+    return stats, time.perf_counter() - start
@@ -0,0 +1,107 @@
+# quiz/management/commands/bench_coldstart.py
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf                 import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+ENTRIES = {
+    # name: entry file, relative to the project root
+    'wsgi':       'KBC/wsgi.py',
+    'serverless': 'api/index.py',
+}
+
+# Run in a fresh interpreter: import the entry file, then serve one GET
+# through its WSGI callable. Prints timings as JSON.
+CHILD = r'''
+import io, json, resource, runpy, sys, time
+start   = time.perf_counter()
+entry   = runpy.run_path(sys.argv[1], run_name='entry')
+app     = entry.get('app') or entry['application']
+ready   = time.perf_counter()
+status  = []
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[2], 'QUERY_STRING': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+    'wsgi.input': io.BytesIO(), 'wsgi.url_scheme': 'http', 'wsgi.errors': sys.stderr,
+}
+body = b''.join(app(environ, lambda s, headers, exc_info=None: status.append(s)))
+done = time.perf_counter()
+print(json.dumps({
+    'import_ms':  (ready - start) * 1000,
+    'request_ms': (done - ready) * 1000,
+    'status':     int(status[0].split()[0]),
+    'modules':    len(sys.modules),
+    'rss_mb':     resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Measure cold start (import to first response) of the WSGI and serverless entry points'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5,
+                            help='Fresh processes per entry point (default: 5)')
+        parser.add_argument('--path', default='/',
+                            help='Path of the first request (default: /)')
+        parser.add_argument('--only', choices=sorted(ENTRIES),
+                            help='Measure a single entry point')
+        parser.add_argument('--max-ms', type=float,
+                            help='Fail if the serverless median import-to-first-response exceeds this (for CI)')
+
+    def handle(self, *args, **options):
+        names   = [options['only']] if options['only'] else list(ENTRIES)
+        results = {}
+        for name in names:
+            self.stdout.write(f"Starting {name} {options['runs']} times...")
+            results[name] = [self.cold_start(ENTRIES[name], options['path']) for _ in range(options['runs'])]
+
+        self.report(results)
+
+        limit = options['max_ms']
+        if limit is not None and 'serverless' in results:
+            median = statistics.median(r['total_ms'] for r in results['serverless'])
+            if median > limit:
+                raise CommandError(f'Serverless cold start {median:.0f} ms is over the {limit:.0f} ms budget.')
+            self.stdout.write(self.style.SUCCESS(f'Serverless cold start {median:.0f} ms is within {limit:.0f} ms.'))
+
+    def cold_start(self, entry, path):
+        # Each run gets a clean environment, apart from the database and settings
+        env = {
+            key: value for key, value in os.environ.items()
+            if not key.startswith('QUIZ_') or key in ('QUIZ_SQLITE_TUNING', 'QUIZ_SESSION_ENGINE')
+        }
+        started = time.perf_counter()
+        done    = subprocess.run(
+            [sys.executable, '-c', CHILD, entry, path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if done.returncode:
+            raise CommandError(f'{entry} failed to start:\n{done.stderr}')
+        result = json.loads(done.stdout.strip().splitlines()[-1])
+        if result['status'] >= 500:
+            raise CommandError(f"{entry} answered {path} with {result['status']}:\n{done.stderr}")
+        result['total_ms']   = result['import_ms'] + result['request_ms']
+        result['process_ms'] = (time.perf_counter() - started) * 1000
+        return result
+
+    def report(self, results):
+        header = (f"{'entry':<12}{'import ms':>11}{'1st req ms':>12}{'total ms':>10}"
+                  f"{'process ms':>12}{'modules':>9}{'RSS MB':>8}")
+        self.stdout.write('')
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, runs in results.items():
+            median = {key: statistics.median(r[key] for r in runs) for key in runs[0] if key != 'status'}
+            self.stdout.write(
+                f"{name:<12}{median['import_ms']:>11.0f}{median['request_ms']:>12.1f}{median['total_ms']:>10.0f}"
+                f"{median['process_ms']:>12.0f}{median['modules']:>9.0f}{median['rss_mb']:>8.1f}"
+            )
+        self.stdout.write('(medians; total = import to first response)')
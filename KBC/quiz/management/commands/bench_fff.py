@@ -0,0 +1,163 @@
+# quiz/management/commands/bench_fff.py
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf                 import settings
+from django.contrib.auth         import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models  import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz         import datagen
+from quiz.loadgen import percentile
+from quiz.management.commands.bench_servers import _Running
+
+
+PREFIX = 'fffbench'
+
+
+class Command(BaseCommand):
+    help = 'Measure Fastest Finger First fan-out latency: many WebSocket clients in one live room'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200,
+                            help='Players connected to the room (default: 200)')
+        parser.add_argument('--rounds', type=int, default=5,
+                            help='Questions to play (default: 5)')
+        parser.add_argument('--answer-seconds', type=float, default=2,
+                            help='How long each question stays open (default: 2)')
+        parser.add_argument('--port', type=int, default=8790,
+                            help='Port for the uvicorn server (default: 8790)')
+        # Internal: the subprocess role that creates players and their sessions
+        parser.add_argument('--setup', action='store_true', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['setup']:
+            return self.setup(options)
+        for module in ('uvicorn', 'websockets'):
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(f'{module} is not installed (pip install {module}).')
+
+        with tempfile.TemporaryDirectory(prefix='bench_fff_') as tmp:
+            database = os.path.join(tmp, 'fff.sqlite3')
+            env = dict(
+                os.environ,
+                DATABASE_URL            = f'sqlite:///{database}',
+                QUIZ_SESSION_ENGINE     = 'db',
+                QUIZ_FFF_MIN_PLAYERS    = str(options['clients']),   # Start once everyone is in
+                QUIZ_FFF_ANSWER_SECONDS = str(options['answer_seconds']),
+                QUIZ_FFF_BREAK_SECONDS  = '0.5',
+            )
+            self.stdout.write('Preparing a fresh database...')
+            self.manage(env, 'migrate', '-v0')
+            self.manage(env, 'seed_questions')
+            sessions = json.loads(self.manage(env, 'bench_fff', '--setup', '--clients', str(options['clients'])))
+
+            self.stdout.write(f"Connecting {options['clients']} clients to one room for {options['rounds']} rounds...")
+            port   = options['port']
+            server = subprocess.Popen(
+                [sys.executable, '-m', 'uvicorn', 'KBC.asgi:application',
+                 '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+                cwd=settings.BASE_DIR, env=env,
+            )
+            with _Running(server, f'http://127.0.0.1:{port}/'):
+                rounds = asyncio.run(self.play(f'ws://127.0.0.1:{port}/ws/fff/bench/', sessions, options['rounds']))
+
+            with sqlite3.connect(database) as db:
+                saved = db.execute('SELECT COUNT(*) FROM quiz_fastestfingeranswer').fetchone()[0]
+
+        self.report(rounds, saved)
+
+    def manage(self, env, *argv):
+        done = subprocess.run(
+            [sys.executable, 'manage.py', *argv],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if done.returncode:
+            raise CommandError(f"manage.py {' '.join(argv)} failed:\n{done.stderr}")
+        return done.stdout
+
+    # ── Clients ──
+
+    async def play(self, url, sessions, rounds):
+        """Connect every client, play `rounds` questions; returns {round: [latency ns]}."""
+        import websockets
+
+        latencies = {}
+
+        async def client(session_key, connected):
+            headers = {'Cookie': f'{settings.SESSION_COOKIE_NAME}={session_key}'}
+            async with websockets.connect(url, additional_headers=headers, max_queue=None) as ws:
+                connected.release()
+                results = 0
+                async for frame in ws:
+                    received = time.monotonic_ns()
+                    message  = json.loads(frame)
+                    if message['type'] == 'question':
+                        # Same host, same monotonic clock as the server
+                        latencies.setdefault(message['round'], []).append(received - message['sent_ns'])
+                        await asyncio.sleep(random.uniform(0, 0.2))   # Thinking
+                        await ws.send(json.dumps({
+                            'type': 'answer', 'round': message['round'], 'option': random.choice('ABCD'),
+                        }))
+                    elif message['type'] == 'result':
+                        results += 1
+                        if results == rounds:
+                            return
+
+        connected = asyncio.Semaphore(0)
+        tasks     = [asyncio.create_task(client(key, connected)) for key in sessions]
+        for _ in sessions:
+            await connected.acquire()
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks), timeout=rounds * 30)
+        except (asyncio.TimeoutError, OSError) as exc:
+            raise CommandError(f'The benchmark clients failed: {exc!r}')
+        return latencies
+
+    def report(self, rounds, saved):
+        header = f"{'round':<7}{'clients':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        self.stdout.write('')
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        every = []
+        for number, values in sorted(rounds.items()):
+            values = sorted(v / 1e6 for v in values)
+            every += values
+            self.stdout.write(
+                f"{number:<7}{len(values):>9}{percentile(values, 50):>9.1f}{percentile(values, 95):>9.1f}"
+                f"{percentile(values, 99):>9.1f}{values[-1]:>9.1f}"
+            )
+        every.sort()
+        self.stdout.write(
+            f"{'all':<7}{len(every):>9}{percentile(every, 50):>9.1f}{percentile(every, 95):>9.1f}"
+            f"{percentile(every, 99):>9.1f}{every[-1] if every else 0:>9.1f}"
+        )
+        self.stdout.write('(question sent by the room → received by each client; clients share this host\'s CPU)')
+        self.stdout.write(self.style.SUCCESS(f'{saved} answers saved.'))
+
+    # ── Subprocess ──
+
+    def setup(self, options):
+        """Create the players and a logged-in session for each; print the session keys."""
+        ids   = datagen.generate_users(options['clients'], PREFIX, batch_size=1000)
+        users = User.objects.filter(pk__in=ids).order_by('pk')
+        keys  = []
+        for user in users:
+            session = SessionStore()
+            session[SESSION_KEY]         = str(user.pk)
+            session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+            session[HASH_SESSION_KEY]    = user.get_session_auth_hash()
+            session.create()
+            keys.append(session.session_key)
+        self.stdout.write(json.dumps(keys))
@@ -0,0 +1,116 @@
+# quiz/management/commands/bench_servers.py
+
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+from django.conf                 import settings
+from django.core.management.base import BaseCommand, CommandError
+from quiz.loadgen import run_load, percentile
+
+
+SERVERS = {
+    # name: (python module, argv builder, QUIZ_ASYNC_VIEWS)
+    'wsgi': ('gunicorn', lambda port, workers, threads: [
+        'KBC.wsgi:application', '--bind', f'127.0.0.1:{port}',
+        '--workers', str(workers), '--threads', str(threads), '--log-level', 'warning',
+    ], '0'),
+    'asgi': ('uvicorn', lambda port, workers, threads: [
+        'KBC.asgi:application', '--host', '127.0.0.1', '--port', str(port),
+        '--workers', str(workers), '--log-level', 'warning',
+    ], '1'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare WSGI (gunicorn) and ASGI (uvicorn + async views) throughput under load'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200,
+                            help='Concurrent synthetic players (default: 200)')
+        parser.add_argument('--games', type=int, default=1,
+                            help='Games per player (default: 1)')
+        parser.add_argument('--workers', type=int, default=2,
+                            help='Server worker processes (default: 2)')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='Threads per gunicorn worker (default: 8)')
+        parser.add_argument('--port', type=int, default=8765,
+                            help='First port to bind (default: 8765)')
+        parser.add_argument('--only', choices=sorted(SERVERS),
+                            help='Benchmark a single server')
+
+    def handle(self, *args, **options):
+        names = [options['only']] if options['only'] else list(SERVERS)
+        for name in names:
+            module = SERVERS[name][0]
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(f'{module} is not installed (pip install {module}).')
+
+        results = []
+        for offset, name in enumerate(names):
+            port = options['port'] + offset
+            self.stdout.write(f"Benchmarking {name} on port {port}...")
+            with self.server(name, port, options['workers'], options['threads']):
+                stats, elapsed = run_load(
+                    f'http://127.0.0.1:{port}',
+                    users  = options['users'],
+                    games  = options['games'],
+                    prefix = f'bench{name}{int(time.time())}_',
+                )
+            results.append((name, stats, elapsed))
+
+        self.report(results)
+
+    def server(self, name, port, workers, threads):
+        module, argv, async_views = SERVERS[name]
+        env = dict(os.environ, QUIZ_ASYNC_VIEWS=async_views)
+        proc = subprocess.Popen(
+            [sys.executable, '-m', module] + argv(port, workers, threads),
+            cwd=settings.BASE_DIR, env=env,
+        )
+        return _Running(proc, f'http://127.0.0.1:{port}/')
+
+    def report(self, results):
+        header = f"{'server':<8}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'5xx':>8}"
+        self.stdout.write('')
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, stats, elapsed in results:
+            values = sorted(v for vs in stats.latencies.values() for v in vs)
+            self.stdout.write(
+                f"{name:<8}{len(values):>10}{len(values) / elapsed:>10.1f}"
+                f"{percentile(values, 50) * 1000:>10.1f}"
+                f"{percentile(values, 95) * 1000:>10.1f}"
+                f"{percentile(values, 99) * 1000:>10.1f}"
+                f"{sum(stats.errors.values()):>8}{stats.server_errors:>8}"
+            )
+
+
+class _Running:
+    """Context manager: wait for a server to answer, stop it on exit."""
+
+    def __init__(self, proc, url, timeout=30):
+        self.proc, self.url, self.timeout = proc, url, timeout
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise CommandError(f'Server exited with code {self.proc.returncode}.')
+            try:
+                urllib.request.urlopen(self.url, timeout=1).close()
+                return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise CommandError(f'Server did not start within {self.timeout}s.')
+
+    def __exit__(self, *exc):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
@@ -0,0 +1,189 @@
+# quiz/management/commands/bench_sqlite.py
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.conf                 import settings
+from django.contrib.auth.models  import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db                   import connection, OperationalError
+
+from quiz        import game, events, datagen
+from quiz.loadgen import percentile
+
+
+PROFILES = {
+    # name: QUIZ_SQLITE_TUNING
+    'default': '0',
+    'tuned':   '1',
+}
+PREFIX = 'sqlitebench'
+
+
+class Command(BaseCommand):
+    help = 'Compare SQLite write throughput and "database is locked" errors with and without QUIZ_SQLITE_TUNING'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=64,
+                            help='Concurrent players, one thread each (default: 64)')
+        parser.add_argument('--processes', type=int, default=4,
+                            help='Worker processes the players are spread over (default: 4)')
+        parser.add_argument('--seconds', type=float, default=15,
+                            help='How long each profile runs (default: 15)')
+        parser.add_argument('--accuracy', type=float, default=0.8,
+                            help='Chance of answering correctly (default: 0.8)')
+        parser.add_argument('--only', choices=sorted(PROFILES),
+                            help='Benchmark a single profile')
+        # Internal: the subprocess roles
+        parser.add_argument('--setup', action='store_true', help=argparse.SUPPRESS)
+        parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['setup']:
+            return self.setup(options)
+        if options['worker'] is not None:
+            return self.work(options)
+
+        if connection.vendor != 'sqlite':
+            self.stdout.write(self.style.WARNING('Note: this server runs on a non-SQLite database; '
+                                                 'the benchmark uses its own SQLite files either way.'))
+        names   = [options['only']] if options['only'] else list(PROFILES)
+        results = []
+        with tempfile.TemporaryDirectory(prefix='bench_sqlite_') as tmp:
+            for name in names:
+                env = dict(
+                    os.environ,
+                    DATABASE_URL          = f"sqlite:///{os.path.join(tmp, name + '.sqlite3')}",
+                    QUIZ_SQLITE_TUNING    = PROFILES[name],
+                    QUIZ_GAME_STATE_STORE = 'db',
+                )
+                self.stdout.write(f'Preparing a fresh {name} database...')
+                self.manage(env, 'migrate', '-v0')
+                self.manage(env, 'seed_questions')
+                self.manage(env, 'bench_sqlite', '--setup', '--players', str(options['players']))
+
+                self.stdout.write(f"Running {options['players']} players for {options['seconds']:g}s...")
+                results.append((name, self.run_workers(env, options)))
+
+        self.report(results, options['seconds'])
+
+    # ── Parent ──
+
+    def manage(self, env, *argv):
+        done = subprocess.run(
+            [sys.executable, 'manage.py', *argv],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if done.returncode:
+            raise CommandError(f"manage.py {' '.join(argv)} failed:\n{done.stderr}")
+        return done.stdout
+
+    def run_workers(self, env, options):
+        argv = [
+            sys.executable, 'manage.py', 'bench_sqlite',
+            '--players',   str(options['players']),
+            '--processes', str(options['processes']),
+            '--seconds',   str(options['seconds']),
+            '--accuracy',  str(options['accuracy']),
+        ]
+        procs = [
+            subprocess.Popen(argv + ['--worker', str(i)], cwd=settings.BASE_DIR, env=env,
+                             stdout=subprocess.PIPE, text=True)
+            for i in range(options['processes'])
+        ]
+        total = {'writes': 0, 'locked': 0, 'errors': 0, 'latencies': []}
+        for proc in procs:
+            out, _ = proc.communicate()
+            if proc.returncode:
+                raise CommandError(f'A benchmark worker exited with code {proc.returncode}.')
+            tally = json.loads(out.strip().splitlines()[-1])
+            for key in ('writes', 'locked', 'errors', 'latencies'):
+                total[key] += tally[key]
+        return total
+
+    def report(self, results, seconds):
+        header = (f"{'profile':<9}{'writes':>9}{'writes/s':>10}{'p50 ms':>9}{'p95 ms':>9}"
+                  f"{'p99 ms':>9}{'errors':>8}{'locked':>8}{'locked %':>10}")
+        self.stdout.write('')
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, total in results:
+            latencies = sorted(total['latencies'])
+            attempts  = total['writes'] + total['locked'] + total['errors']
+            self.stdout.write(
+                f"{name:<9}{total['writes']:>9}{total['writes'] / seconds:>10.1f}"
+                f"{percentile(latencies, 50) * 1000:>9.1f}"
+                f"{percentile(latencies, 95) * 1000:>9.1f}"
+                f"{percentile(latencies, 99) * 1000:>9.1f}"
+                f"{total['errors']:>8}{total['locked']:>8}"
+                f"{total['locked'] / max(attempts, 1) * 100:>9.2f}%"
+            )
+
+    # ── Subprocesses ──
+
+    def setup(self, options):
+        datagen.generate_users(options['players'], PREFIX, batch_size=1000)
+
+    def work(self, options):
+        """Play games on this worker's share of the players; print a JSON tally."""
+        per_process = math.ceil(options['players'] / options['processes'])
+        first       = options['worker'] * per_process
+        users       = list(
+            User.objects.filter(username__startswith=f'{PREFIX}user')
+            .order_by('id')[first:first + per_process]
+        )
+        deadline = time.monotonic() + options['seconds']
+        tally    = {'writes': 0, 'locked': 0, 'errors': 0, 'latencies': []}
+        lock     = threading.Lock()
+
+        threads = [
+            threading.Thread(target=self.play, args=(user, deadline, options['accuracy'], tally, lock))
+            for user in users
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        events.flush()
+        self.stdout.write(json.dumps(tally))
+
+    def play(self, user, deadline, accuracy, tally, lock):
+        """One player: start a game, answer until it ends, repeat until the deadline."""
+        def write(func, *args):
+            start = time.perf_counter()
+            try:
+                result = func(*args)
+            except OperationalError as exc:
+                with lock:
+                    tally['locked' if 'locked' in str(exc) else 'errors'] += 1
+                raise
+            with lock:
+                tally['writes'] += 1
+                tally['latencies'].append(time.perf_counter() - start)
+            return result
+
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    session = write(game.start_game, user)
+                    while session and time.monotonic() < deadline:
+                        question = session.current_question
+                        correct  = random.random() < accuracy
+                        choice   = question.correct_option if correct else next(
+                            o for o in game.OPTIONS if o != question.correct_option
+                        )
+                        if write(game.submit_answer, session, choice) != game.CORRECT:
+                            break
+                    events.flush_if_due()
+                except OperationalError:
+                    time.sleep(0.01)   # What a retrying client would do
+        finally:
+            connection.close()
@@ -0,0 +1,23 @@
+# quiz/management/commands/build_question_snapshot.py
+
+from django.core.management.base import BaseCommand
+from quiz import question_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Write the question bank to the shared memory-mapped snapshot (QUIZ_QUESTION_SNAPSHOT)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=question_snapshot.PATH,
+                            help='Snapshot file (default: the QUIZ_QUESTION_SNAPSHOT setting)')
+
+    def handle(self, *args, **options):
+        if not options['path']:
+            self.stdout.write('QUIZ_QUESTION_SNAPSHOT is not set; nothing to build.')
+            return
+
+        count, size, stamp = question_snapshot.build(options['path'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {count} questions ({size / 1024:.1f} KiB, version {stamp}) to {options['path']}."
+        ))
@@ -0,0 +1,92 @@
+# quiz/management/commands/calibrate_questions.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils                import timezone
+
+from quiz.models import Question
+from quiz        import calibration, question_pool
+
+
+# Questions per SELECT ... IN and per bulk_update: bounded, so a large bank
+# stays under the database's bound-parameter limit (999 on older SQLite)
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Fit per-question difficulty and discrimination from answer history and suggest level changes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=100000,
+                            help='Answers read per query (default: 100000)')
+        parser.add_argument('--bins', type=int, default=20,
+                            help='Player ability bins (default: 20)')
+        parser.add_argument('--min-answers', type=int, default=30,
+                            help='Answers a question needs to be calibrated (default: 30)')
+        parser.add_argument('--apply-levels', action='store_true',
+                            help='Move questions to their suggested levels')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report only; write nothing')
+
+    def handle(self, *args, **options):
+        if calibration.np is None:
+            raise CommandError('NumPy is required for calibration (pip install -r requirements-calibration.txt).')
+
+        result = calibration.calibrate(bins=options['bins'], chunk_size=options['chunk_size'])
+        if result is None:
+            self.stdout.write('No answers logged yet; nothing to calibrate.')
+            return
+
+        ids, counts, a, b = result
+        fitted = {
+            int(pk): (int(n), float(ai), float(bi))
+            for pk, n, ai, bi in zip(ids, counts, a, b)
+            if n >= options['min_answers']
+        }
+        questions = list(self.load(sorted(fitted)))
+        suggested = calibration.suggest_levels(
+            [(q.pk, q.level, fitted[q.pk][2]) for q in questions]
+        )
+        moves = [q for q in questions if suggested[q.pk] != q.level]
+
+        self.report(moves, suggested, fitted)
+
+        if options['dry_run']:
+            return
+
+        now = timezone.now()
+        for q in questions:
+            q.calibration_answers, q.discrimination, q.calibrated_difficulty = fitted[q.pk]
+            q.calibrated_at = now
+        fields = ['calibration_answers', 'discrimination', 'calibrated_difficulty', 'calibrated_at']
+
+        if options['apply_levels']:
+            for q in moves:
+                q.level      = suggested[q.pk]
+                q.difficulty = calibration.difficulty_for_level(q.level)
+            fields += ['level', 'difficulty']
+
+        for start in range(0, len(questions), BATCH_SIZE):
+            Question.objects.bulk_update(questions[start:start + BATCH_SIZE], fields)
+        # bulk_update skips post_save, so drop the pool index by hand
+        question_pool.invalidate()
+
+        moved = len(moves) if options['apply_levels'] else 0
+        self.stdout.write(
+            self.style.SUCCESS(f'Calibrated {len(questions)} questions; moved {moved} to new levels.')
+        )
+
+    def load(self, ids):
+        """The fitted questions, BATCH_SIZE IDs per query."""
+        for start in range(0, len(ids), BATCH_SIZE):
+            yield from Question.objects.filter(pk__in=ids[start:start + BATCH_SIZE]).only('id', 'level', 'difficulty')
+
+    def report(self, moves, suggested, fitted):
+        self.stdout.write(f'{len(moves)} questions would change level.')
+        if not moves:
+            return
+        header = f"{'id':>8}{'level':>7}{'→':>3}{'new':>5}{'b':>9}{'a':>8}{'answers':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for q in sorted(moves, key=lambda q: fitted[q.pk][2]):
+            n, a, b = fitted[q.pk]
+            self.stdout.write(f"{q.pk:>8}{q.level:>7}{'→':>3}{suggested[q.pk]:>5}{b:>9.2f}{a:>8.2f}{n:>10}")
@@ -0,0 +1,14 @@
+# quiz/management/commands/close_tournaments.py
+
+from django.core.management.base import BaseCommand
+from quiz import tournaments
+
+
+class Command(BaseCommand):
+    help = 'Close ended tournaments: finish games still in progress and write the standings in bulk'
+
+    def handle(self, *args, **options):
+        closed = tournaments.close_due()
+        for tournament in closed:
+            self.stdout.write(f'{tournament.name}: {tournament.participants} players ranked')
+        self.stdout.write(self.style.SUCCESS(f'Closed {len(closed)} tournaments.'))
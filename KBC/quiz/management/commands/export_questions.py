@@ -0,0 +1,32 @@
+# quiz/management/commands/export_questions.py
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from quiz import question_io
+
+
+class Command(BaseCommand):
+    help = 'Stream every question to a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to write, or '-' for stdout")
+        parser.add_argument('--format', choices=question_io.FORMATS,
+                            help='File format (default: from the file extension)')
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Rows fetched per query (default: 5000)')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt  = options['format'] or question_io.detect_format(path)
+        if fmt is None:
+            raise CommandError('Cannot tell the format from the file name; pass --format csv|jsonl.')
+
+        if path == '-':
+            question_io.export(sys.stdout, fmt, options['chunk_size'])
+            return
+
+        with open(path, 'w', encoding='utf-8', newline='') as fh:
+            count = question_io.export(fh, fmt, options['chunk_size'])
+
+        self.stdout.write(self.style.SUCCESS(f'Exported {count:,} questions to {path}.'))
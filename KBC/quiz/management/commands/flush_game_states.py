@@ -0,0 +1,25 @@
+# quiz/management/commands/flush_game_states.py
+
+from django.core.management.base import BaseCommand
+from quiz import game_store
+
+
+class Command(BaseCommand):
+    help = 'Write cached in-progress game state back to the database (QUIZ_GAME_STATE_STORE=cache)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Active sessions looked up per cache round trip (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        if not game_store.enabled():
+            self.stdout.write('QUIZ_GAME_STATE_STORE is not "cache"; nothing to flush.')
+            return
+
+        count = game_store.flush_all(batch_size=options['batch_size'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Flushed {count} in-progress games to the database.')
+        )
@@ -0,0 +1,71 @@
+# quiz/management/commands/generate_data.py
+
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from quiz import datagen, leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with synthetic questions, users and game sessions for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--questions-per-level', type=int, default=100,
+                            help='Synthetic questions on each of the 15 levels (default: 100)')
+        parser.add_argument('--users', type=int, default=1000,
+                            help='Synthetic users (default: 1000)')
+        parser.add_argument('--sessions', type=int, default=10000,
+                            help='Finished game sessions (default: 10000)')
+        parser.add_argument('--active', type=int, default=100,
+                            help='Active game sessions, at most one per user (default: 100)')
+        parser.add_argument('--days', type=int, default=90,
+                            help='Spread finished games over this many past days (default: 90)')
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='Rows per insert transaction (default: 10000)')
+        parser.add_argument('--prefix', default='synth',
+                            help='Name prefix for generated users and questions (default: synth)')
+        parser.add_argument('--seed', type=int, default=None,
+                            help='Random seed for a repeatable dataset')
+        parser.add_argument('--skip-stats', action='store_true',
+                            help="Don't rebuild the leaderboard and ranks afterwards")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        rng    = random.Random(options['seed'])
+        batch  = options['batch_size']
+        prefix = options['prefix']
+
+        self.step('questions', datagen.generate_questions,
+                  options['questions_per_level'], prefix, batch)
+
+        user_ids = self.step('users', datagen.generate_users, options['users'], prefix, batch)
+        if not user_ids and (options['sessions'] or options['active']):
+            raise CommandError('No users to attach sessions to; use --users.')
+
+        self.step('sessions', datagen.generate_sessions,
+                  options['sessions'], options['active'], user_ids, options['days'], batch, rng=rng)
+
+        if not options['skip_stats']:
+            start = time.monotonic()
+            players = leaderboard.rebuild()
+            self.stdout.write(f'leaderboard: {players:,} players in {time.monotonic() - start:.1f}s')
+
+        self.stdout.write(self.style.SUCCESS('Synthetic data ready.'))
+
+    def step(self, what, func, *args, **kwargs):
+        """Run one generator with a progress line per batch, then a total."""
+        start = time.monotonic()
+
+        def progress(count):
+            rate = count / max(time.monotonic() - start, 1e-9)
+            self.stdout.write(f'  {what:<10}{count:>12,} rows  {rate:>10,.0f} rows/s')
+
+        result = func(*args, on_batch=progress, **kwargs)
+        if isinstance(result, tuple):
+            total = ' + '.join(f'{n:,}' for n in result) + ' (finished + active)'
+        else:
+            total = f'{result if isinstance(result, int) else len(result):,}'
+        self.stdout.write(f'{what}: {total} in {time.monotonic() - start:.1f}s')
+        return result
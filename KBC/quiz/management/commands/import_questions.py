@@ -0,0 +1,64 @@
+# quiz/management/commands/import_questions.py
+
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from quiz.models import Question
+from quiz        import question_io
+
+
+class Command(BaseCommand):
+    help = 'Stream questions from a CSV or JSONL file and upsert them by content'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin")
+        parser.add_argument('--format', choices=question_io.FORMATS,
+                            help='File format (default: from the file extension)')
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Rows per upsert statement (default: 5000)')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt  = options['format'] or question_io.detect_format(path)
+        if fmt is None:
+            raise CommandError('Cannot tell the format from the file name; pass --format csv|jsonl.')
+
+        if path == '-':
+            fh, total = sys.stdin.buffer, None
+        else:
+            try:
+                fh, total = open(path, 'rb'), os.path.getsize(path)
+            except OSError as exc:
+                raise CommandError(f'Cannot open {path}: {exc.strerror}')
+
+        before = Question.objects.count()
+        start  = time.monotonic()
+
+        def report(progress):
+            elapsed = max(time.monotonic() - start, 1e-9)
+            done    = f'{progress.bytes / total:6.1%}  ' if total else ''
+            self.stdout.write(f'{done}{progress.rows:>12,} rows  {progress.rows / elapsed:>10,.0f} rows/s')
+
+        progress = question_io.Progress()
+        with fh:
+            question_io.upsert(
+                question_io.read_rows(fh, fmt, progress),
+                chunk_size = options['chunk_size'],
+                on_chunk   = report,
+                progress   = progress,
+            )
+
+        for line, message in progress.errors:
+            self.stderr.write(f'line {line}: {message}')
+        if progress.skipped > len(progress.errors):
+            self.stderr.write(f'... and {progress.skipped - len(progress.errors)} more invalid rows')
+
+        added = Question.objects.count() - before
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Imported {progress.rows:,} rows: {added:,} new, '
+                f'{progress.rows - added:,} updated or unchanged, {progress.skipped:,} skipped.'
+            )
+        )
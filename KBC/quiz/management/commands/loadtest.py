@@ -0,0 +1,70 @@
+# quiz/management/commands/loadtest.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from quiz.loadgen import run_load
+
+
+class Command(BaseCommand):
+    help = 'Play concurrent synthetic games against a running server and report latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000',
+                            help='Base URL of the running server')
+        parser.add_argument('--users', type=int, default=20,
+                            help='Number of synthetic players (default: 20)')
+        parser.add_argument('--games', type=int, default=3,
+                            help='Games per player (default: 3)')
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help='Players running at once (default: all)')
+        parser.add_argument('--accuracy', type=float, default=0.8,
+                            help='Chance of answering correctly (default: 0.8)')
+        parser.add_argument('--lifeline-rate', type=float, default=0.2,
+                            help='Chance of using a lifeline per question (default: 0.2)')
+        parser.add_argument('--quit-rate', type=float, default=0.02,
+                            help='Chance of quitting per question (default: 0.02)')
+        parser.add_argument('--prefix', default=None,
+                            help='Username prefix (default: unique per run)')
+
+    def handle(self, *args, **options):
+        for name in ('accuracy', 'lifeline_rate', 'quit_rate'):
+            if not 0 <= options[name] <= 1:
+                raise CommandError(f'--{name.replace("_", "-")} must be between 0 and 1')
+
+        prefix = options['prefix'] or f'load{int(time.time())}_'
+        self.stdout.write(
+            f"Playing {options['games']} game(s) for {options['users']} players "
+            f"against {options['url']}..."
+        )
+
+        stats, elapsed = run_load(
+            options['url'],
+            users         = options['users'],
+            games         = options['games'],
+            concurrency   = options['concurrency'],
+            prefix        = prefix,
+            accuracy      = options['accuracy'],
+            lifeline_rate = options['lifeline_rate'],
+            quit_rate     = options['quit_rate'],
+        )
+        self.report(stats, elapsed)
+
+    def report(self, stats, elapsed):
+        header = f"{'endpoint':<26}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        self.stdout.write('')
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for endpoint, count, errors, p50, p95, p99 in stats.summary():
+            self.stdout.write(
+                f"{endpoint:<26}{count:>8}{errors:>8}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}"
+            )
+
+        total = stats.total_requests
+        self.stdout.write('')
+        self.stdout.write(f"Games completed : {stats.games}")
+        self.stdout.write(f"Requests        : {total} in {elapsed:.2f}s")
+        self.stdout.write(f"Throughput      : {total / elapsed if elapsed else 0:.1f} req/s")
+
+        style = self.style.ERROR if stats.server_errors else self.style.SUCCESS
+        self.stdout.write(style(f"Server errors   : {stats.server_errors} (5xx; on SQLite, usually lock errors)"))
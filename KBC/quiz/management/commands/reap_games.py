@@ -0,0 +1,18 @@
+# quiz/management/commands/reap_games.py
+
+from django.core.management.base import BaseCommand
+from quiz import reaper
+
+
+class Command(BaseCommand):
+    help = 'Close active games whose current question has gone unanswered too long (paid out as a timeout)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--idle-seconds', type=int, default=reaper.IDLE_SECONDS,
+                            help=f'Idle time before a game is closed (default: {reaper.IDLE_SECONDS})')
+        parser.add_argument('--batch-size', type=int, default=reaper.BATCH_SIZE,
+                            help=f'Games closed per UPDATE (default: {reaper.BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        count = reaper.reap(idle_seconds=options['idle_seconds'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Closed {count} abandoned games.'))
@@ -0,0 +1,21 @@
+# quiz/management/commands/rebuild_leaderboard.py
+
+from django.core.management.base import BaseCommand
+from quiz import leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized leaderboard and rank histogram from game history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows per bulk insert (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        count = leaderboard.rebuild(batch_size=options['batch_size'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt leaderboard and ranks for {count} players.')
+        )
@@ -1,7 +1,7 @@
 # quiz/management/commands/seed_questions.py
 
 from django.core.management.base import BaseCommand
-from quiz.models import Question
+from quiz import question_io
 
 
 QUESTIONS = [
@@ -342,16 +342,12 @@ class Command(BaseCommand):
     help = 'Seed the database with sample quiz questions'
 
     def handle(self, *args, **kwargs):
-        # Clear existing questions
-        Question.objects.all().delete()
-        self.stdout.write('Cleared existing questions...')
-
-        # Bulk create all questions
-        objs = [Question(**q) for q in QUESTIONS]
-        Question.objects.bulk_create(objs)
+        # Upsert by content: existing questions (and games on them) are kept
+        objs = [question_io.to_question(q) for q in QUESTIONS]
+        question_io.upsert(objs)
 
         self.stdout.write(
             self.style.SUCCESS(
                 f'Successfully seeded {len(objs)} questions across 15 levels!'
             )
-        )
\ No newline at end of file
+        )
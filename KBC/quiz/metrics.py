@@ -0,0 +1,255 @@
+# quiz/metrics.py
+
+"""
+Per-view request metrics, in process memory.
+
+MetricsMiddleware times every request and files it under the resolved
+URL name. It records wall time, SQL query count and time, template
+render time and response size. SQL is timed by an execute wrapper that
+is installed on each database connection as it opens (see signals.py).
+Templates are timed by the InstrumentedTemplates backend. Both report
+to the current request through a context variable, so async views and
+the threads their ORM calls run in are counted too.
+
+render() returns the histograms in the Prometheus text format, served
+at /metrics. Each worker process keeps its own numbers; scrape every
+worker, or sum them in Prometheus.
+
+When QUIZ_SLOW_REQUEST_MS is set, a QUIZ_SLOW_REQUEST_SAMPLE fraction
+of requests also keep their SQL. Those that run past the threshold are
+logged with their statements.
+"""
+
+import logging
+import random
+import threading
+from bisect      import bisect_left
+from contextvars import ContextVar
+from time        import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf  import settings
+from django.template                 import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+
+ENABLED        = getattr(settings, 'QUIZ_METRICS', True)
+SLOW_MS        = getattr(settings, 'QUIZ_SLOW_REQUEST_MS', None)    # None: no slow log
+SLOW_SAMPLE    = getattr(settings, 'QUIZ_SLOW_REQUEST_SAMPLE', 1.0)
+MAX_STATEMENTS = 50   # SQL kept per sampled request
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('quiz_request_metrics', default=None)
+
+
+class RequestStats:
+    """What one request has spent so far."""
+
+    __slots__ = ('queries', 'sql', 'template', 'statements')
+
+    def __init__(self, keep_sql=False):
+        self.queries    = 0
+        self.sql        = 0.0
+        self.template   = 0.0
+        self.statements = [] if keep_sql else None   # [(seconds, sql)]
+
+
+# ============================================================
+# HISTOGRAMS
+# ============================================================
+
+class Histogram:
+    """A Prometheus histogram with one series per view."""
+
+    def __init__(self, name, help, buckets):
+        self.name    = name
+        self.help    = help
+        self.buckets = tuple(buckets)
+        self.series  = {}   # view -> [count per bucket..., +Inf count, sum]
+
+    def observe(self, view, value):
+        row = self.series.get(view)
+        if row is None:
+            row = self.series[view] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} histogram'
+        for view, row in sorted(self.series.items()):
+            label, total = _label(view), 0
+            for bound, count in zip(self.buckets, row):
+                total += count
+                yield f'{self.name}_bucket{{view="{label}",le="{bound:g}"}} {total}'
+            total += row[-2]
+            yield f'{self.name}_bucket{{view="{label}",le="+Inf"}} {total}'
+            yield f'{self.name}_sum{{view="{label}"}} {row[-1]:.6g}'
+            yield f'{self.name}_count{{view="{label}"}} {total}'
+
+
+def _label(value):
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+DURATION  = Histogram('quiz_request_duration_seconds', 'Wall time per request.',
+                      (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+QUERIES   = Histogram('quiz_request_queries', 'SQL queries per request.',
+                      (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100))
+SQL       = Histogram('quiz_request_sql_seconds', 'Time in SQL per request.',
+                      (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1))
+TEMPLATES = Histogram('quiz_request_template_seconds', 'Template render time per request.',
+                      (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5))
+SIZE      = Histogram('quiz_response_bytes', 'Response body size.',
+                      (256, 1024, 4096, 16384, 65536, 262144, 1048576))
+HISTOGRAMS = (DURATION, QUERIES, SQL, TEMPLATES, SIZE)
+
+_lock     = threading.Lock()
+_statuses = {}   # (view, status code) -> count
+
+
+def observe(view, status, seconds, stats, size):
+    with _lock:
+        DURATION.observe(view, seconds)
+        QUERIES.observe(view, stats.queries)
+        SQL.observe(view, stats.sql)
+        TEMPLATES.observe(view, stats.template)
+        if size is not None:
+            SIZE.observe(view, size)
+        _statuses[view, status] = _statuses.get((view, status), 0) + 1
+
+
+def render():
+    """Every metric in the Prometheus text exposition format."""
+    with _lock:
+        lines = [
+            '# HELP quiz_requests_total Requests by view and status code.',
+            '# TYPE quiz_requests_total counter',
+        ]
+        lines += [
+            f'quiz_requests_total{{view="{_label(view)}",status="{status}"}} {count}'
+            for (view, status), count in sorted(_statuses.items())
+        ]
+        for histogram in HISTOGRAMS:
+            lines.extend(histogram.render())
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    """Forget everything recorded (tests)."""
+    with _lock:
+        _statuses.clear()
+        for histogram in HISTOGRAMS:
+            histogram.series.clear()
+
+
+# ============================================================
+# SQL AND TEMPLATE TIMING
+# ============================================================
+
+def time_sql(execute, sql, params, many, context):
+    """Database execute wrapper: charge the query to the current request."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = perf_counter() - start
+        stats.queries += 1
+        stats.sql     += elapsed
+        if stats.statements is not None and len(stats.statements) < MAX_STATEMENTS:
+            stats.statements.append((elapsed, sql))
+
+
+def install(connection):
+    """Add time_sql to a database connection (once)."""
+    if time_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_sql)
+
+
+class TimedTemplate(Template):
+
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None:
+            return super().render(context, request)
+        start = perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template += perf_counter() - start
+
+
+class InstrumentedTemplates(DjangoTemplates):
+    """The Django template backend, timing each top-level render."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+# ============================================================
+# MIDDLEWARE
+# ============================================================
+
+class MetricsMiddleware:
+    """Record every request against its URL name (first in MIDDLEWARE)."""
+
+    sync_capable  = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async     = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if not ENABLED:
+            return self.get_response(request)
+        if self.is_async:
+            return self.acall(request)
+        stats, token, start = self.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, stats, start)
+        return response
+
+    async def acall(self, request):
+        stats, token, start = self.begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, stats, start)
+        return response
+
+    def begin(self):
+        keep_sql = SLOW_MS is not None and random.random() < SLOW_SAMPLE
+        stats    = RequestStats(keep_sql)
+        return stats, _current.set(stats), perf_counter()
+
+    def finish(self, request, response, stats, start):
+        seconds = perf_counter() - start
+        match   = request.resolver_match
+        view    = match.view_name if match else 'unmatched'
+        size    = None if response.streaming else len(response.content)
+        observe(view, response.status_code, seconds, stats, size)
+
+        if stats.statements is not None and seconds * 1000 >= SLOW_MS:
+            logger.warning(
+                'Slow request: %s %s (%s) took %.0f ms, %d queries in %.0f ms, templates %.0f ms%s',
+                request.method, request.path, view, seconds * 1000,
+                stats.queries, stats.sql * 1000, stats.template * 1000,
+                ''.join(f'\n  {elapsed * 1000:7.1f} ms  {sql}' for elapsed, sql in stats.statements),
+            )
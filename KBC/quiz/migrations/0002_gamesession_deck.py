@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='deck',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def populate_user_stats(apps, schema_editor):
+    """Seed UserStats from existing finished sessions."""
+    GameSession = apps.get_model('quiz', 'GameSession')
+    UserStats   = apps.get_model('quiz', 'UserStats')
+
+    rows = (
+        GameSession.objects.exclude(status='active')
+        .order_by().values('user').annotate(best=Max('score'))
+    )
+    UserStats.objects.bulk_create(
+        [UserStats(user_id=r['user'], best_score=r['best']) for r in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('quiz', '0002_gamesession_deck'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('best_score', models.PositiveIntegerField(default=0)),
+                ('best_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'user stats',
+                'indexes': [models.Index(fields=['-best_score', 'best_at'], name='userstats_leaderboard_idx')],
+            },
+        ),
+        migrations.RunPython(populate_user_stats, migrations.RunPython.noop),
+    ]
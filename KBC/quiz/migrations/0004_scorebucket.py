@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:29
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_score_buckets(apps, schema_editor):
+    """Seed the rank histogram from existing UserStats rows."""
+    UserStats   = apps.get_model('quiz', 'UserStats')
+    ScoreBucket = apps.get_model('quiz', 'ScoreBucket')
+
+    rows = UserStats.objects.order_by().values('best_score').annotate(n=Count('pk'))
+    ScoreBucket.objects.bulk_create(
+        [ScoreBucket(score=r['best_score'], players=r['n']) for r in rows]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0003_userstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreBucket',
+            fields=[
+                ('score', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('players', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-score'],
+            },
+        ),
+        migrations.RunPython(populate_score_buckets, migrations.RunPython.noop),
+    ]
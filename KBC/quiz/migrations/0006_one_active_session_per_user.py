@@ -0,0 +1,57 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:38
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+from django.utils import timezone
+
+
+def close_duplicate_active_sessions(apps, schema_editor):
+    """
+    Keep each user's newest active game; mark older ones as quit, and
+    fold them into UserStats and the rank histogram as end_game() would.
+    """
+    GameSession = apps.get_model('quiz', 'GameSession')
+    UserStats   = apps.get_model('quiz', 'UserStats')
+    ScoreBucket = apps.get_model('quiz', 'ScoreBucket')
+
+    now   = timezone.now()
+    users = (
+        GameSession.objects.filter(status='active')
+        .order_by().values('user').annotate(n=Count('id')).filter(n__gt=1)
+    )
+    changed = False
+    for row in users:
+        active = GameSession.objects.filter(user=row['user'], status='active').order_by('-id')
+        stale_ids = list(active.values_list('id', flat=True)[1:])
+        GameSession.objects.filter(id__in=stale_ids).update(status='quit', ended_at=now)
+
+        best = GameSession.objects.filter(id__in=stale_ids).aggregate(best=Max('score'))['best']
+        stats, created = UserStats.objects.get_or_create(user_id=row['user'])
+        if created or best > stats.best_score:
+            stats.best_score, stats.best_at = max(stats.best_score, best), now
+            stats.save()
+            changed = True
+
+    if changed:
+        rows = UserStats.objects.order_by().values('best_score').annotate(n=Count('pk'))
+        ScoreBucket.objects.all().delete()
+        ScoreBucket.objects.bulk_create(
+            [ScoreBucket(score=r['best_score'], players=r['n']) for r in rows]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0005_gamesession_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(close_duplicate_active_sessions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='gamesession',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'active')), fields=('user',), name='one_active_session_per_user'),
+        ),
+    ]
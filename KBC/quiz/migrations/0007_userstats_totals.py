@@ -0,0 +1,66 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:44
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+
+
+def populate_totals(apps, schema_editor):
+    """Fill the new counters from existing finished sessions."""
+    GameSession = apps.get_model('quiz', 'GameSession')
+    UserStats   = apps.get_model('quiz', 'UserStats')
+
+    rows = (
+        GameSession.objects.exclude(status='active')
+        .order_by().values('user')
+        .annotate(
+            games_played   = Count('id'),
+            wins           = Count('id', filter=Q(status='won')),
+            losses         = Count('id', filter=Q(status='lost')),
+            quits          = Count('id', filter=Q(status='quit')),
+            total_winnings = Sum('score'),
+            last_played    = Max('ended_at'),
+        )
+    )
+    for row in rows.iterator():
+        UserStats.objects.filter(user_id=row.pop('user')).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0006_one_active_session_per_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstats',
+            name='games_played',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userstats',
+            name='last_played',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userstats',
+            name='losses',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userstats',
+            name='quits',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userstats',
+            name='total_winnings',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userstats',
+            name='wins',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:46
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0007_userstats_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='question_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='AnswerEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.PositiveIntegerField()),
+                ('kind', models.CharField(choices=[('answer', 'Answer'), ('fifty_fifty', '50-50'), ('skip', 'Skip'), ('audience_poll', 'Audience Poll')], default='answer', max_length=15)),
+                ('chosen', models.CharField(blank=True, default='', max_length=7)),
+                ('correct', models.BooleanField(blank=True, null=True)),
+                ('elapsed_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('lifelines_used', models.CharField(blank=True, default='', max_length=40)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('question', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='quiz.question')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='quiz.gamesession')),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
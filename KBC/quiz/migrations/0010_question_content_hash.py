@@ -0,0 +1,49 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:52
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def question_hash(*parts):
+    # Frozen copy of quiz.models.question_hash
+    key = '\x1f'.join(' '.join(str(p).split()).casefold() for p in parts)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def populate_content_hash(apps, schema_editor):
+    """
+    Hash existing questions. Exact duplicates are merged into the
+    oldest copy (games and events repointed) so the hash can be unique.
+    """
+    Question    = apps.get_model('quiz', 'Question')
+    GameSession = apps.get_model('quiz', 'GameSession')
+    AnswerEvent = apps.get_model('quiz', 'AnswerEvent')
+
+    seen = {}
+    for q in Question.objects.order_by('id').iterator():
+        digest = question_hash(q.text, q.option_a, q.option_b, q.option_c, q.option_d)
+        if digest in seen:
+            GameSession.objects.filter(current_question_id=q.id).update(current_question_id=seen[digest])
+            AnswerEvent.objects.filter(question_id=q.id).update(question_id=seen[digest])
+            q.delete()
+            continue
+        seen[digest] = q.id
+        Question.objects.filter(pk=q.id).update(content_hash=digest)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0009_question_calibration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='content_hash',
+            field=models.CharField(default='', editable=False, max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_content_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from 0010 so the data step's updates are committed before
+    # the unique index is built (PostgreSQL won't mix the two).
+
+    dependencies = [
+        ('quiz', '0010_question_content_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='question',
+            name='content_hash',
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+    ]
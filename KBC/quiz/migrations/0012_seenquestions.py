@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('quiz', '0011_question_content_hash_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeenQuestions',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='seen_questions', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('data', models.BinaryField(default=b'')),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'seen questions',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0012_seenquestions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='audience_poll',
+            field=models.CharField(blank=True, default='', max_length=24),
+        ),
+    ]
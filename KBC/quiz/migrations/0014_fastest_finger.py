@@ -0,0 +1,46 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0013_gamesession_audience_poll'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FastestFingerRound',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room', models.CharField(db_index=True, max_length=40)),
+                ('started_at', models.DateTimeField()),
+                ('players', models.PositiveIntegerField(default=0)),
+                ('winner_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('question', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='quiz.question')),
+                ('winner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='fastest_finger_wins', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FastestFingerAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chosen', models.CharField(max_length=1)),
+                ('correct', models.BooleanField()),
+                ('elapsed_ms', models.PositiveIntegerField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('round', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='quiz.fastestfingerround')),
+            ],
+            options={
+                'ordering': ['round', 'elapsed_ms'],
+                'constraints': [models.UniqueConstraint(fields=('round', 'user'), name='one_answer_per_round')],
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0014_fastest_finger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tournament',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('deck', models.TextField(blank=True, default='')),
+                ('closed_at', models.DateTimeField(blank=True, null=True)),
+                ('participants', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-starts_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TournamentStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('rank', models.PositiveIntegerField()),
+                ('score', models.PositiveIntegerField()),
+                ('level', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('active', 'Active'), ('won', 'Won'), ('lost', 'Lost'), ('quit', 'Quit')], max_length=10)),
+                ('duration_ms', models.PositiveBigIntegerField()),
+            ],
+            options={
+                'ordering': ['tournament', 'position'],
+            },
+        ),
+        migrations.AddField(
+            model_name='gamesession',
+            name='tournament',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='games', to='quiz.tournament'),
+        ),
+        migrations.AddConstraint(
+            model_name='gamesession',
+            constraint=models.UniqueConstraint(fields=('tournament', 'user'), name='one_game_per_tournament'),
+        ),
+        migrations.AddField(
+            model_name='tournamentstanding',
+            name='tournament',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='quiz.tournament'),
+        ),
+        migrations.AddField(
+            model_name='tournamentstanding',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tournament_standings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='tournamentstanding',
+            constraint=models.UniqueConstraint(fields=('tournament', 'position'), name='standing_position_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='tournamentstanding',
+            constraint=models.UniqueConstraint(fields=('tournament', 'user'), name='standing_user_unique'),
+        ),
+    ]
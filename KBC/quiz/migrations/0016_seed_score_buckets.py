@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:05
+
+from django.db import migrations
+
+
+# 0 and every prize-ladder amount: all the personal bests there can be
+SCORES = [
+    0, 1000, 2000, 3000, 5000, 10000, 20000, 40000, 80000, 160000,
+    320000, 640000, 1250000, 2500000, 5000000, 10000000,
+]
+
+
+def seed_score_buckets(apps, schema_editor):
+    """Create every bucket up front, so games never race to insert one."""
+    ScoreBucket = apps.get_model('quiz', 'ScoreBucket')
+    ScoreBucket.objects.bulk_create(
+        [ScoreBucket(score=score, players=0) for score in SCORES], ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0015_tournaments'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_score_buckets, migrations.RunPython.noop),
+    ]
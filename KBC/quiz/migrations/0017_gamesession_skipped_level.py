@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0016_seed_score_buckets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='skipped_level',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
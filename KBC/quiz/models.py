@@ -1,7 +1,11 @@
 # quiz/models.py
 
+import hashlib
+
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 # ----------------------------
@@ -14,6 +18,17 @@ DIFFICULTY_CHOICES = [
 ]
 
 
+def question_hash(text, option_a, option_b, option_c, option_d):
+    """
+    Identity of a question for imports: its text and options, ignoring
+    surrounding whitespace and case. Answer, level and difficulty are
+    not part of it, so re-importing a corrected row updates it in place.
+    """
+    parts = (text, option_a, option_b, option_c, option_d)
+    key   = '\x1f'.join(' '.join(str(p).split()).casefold() for p in parts)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
 class Question(models.Model):
     """
     Represents a single MCQ question with 4 options.
@@ -33,6 +48,28 @@ class Question(models.Model):
         help_text="Question level (1 to 15). Higher = harder."
     )
 
+    # Fitted from answer history by `manage.py calibrate_questions` (2PL item response model)
+    calibrated_difficulty = models.FloatField(null=True, blank=True)   # IRT b: ability with a 50% chance
+    discrimination        = models.FloatField(null=True, blank=True)   # IRT a: slope at b
+    calibration_answers   = models.PositiveIntegerField(default=0)     # Answers the fit was based on
+    calibrated_at         = models.DateTimeField(null=True, blank=True)
+
+    # Upsert key for import_questions (see question_hash)
+    content_hash  = models.CharField(max_length=64, unique=True, editable=False)
+
+    def clean(self):
+        # content_hash isn't a form field, so forms never check it is unique
+        duplicate = Question.objects.filter(content_hash=self.compute_hash()).exclude(pk=self.pk)
+        if duplicate.exists():
+            raise ValidationError('A question with this text and these options already exists.')
+
+    def save(self, *args, **kwargs):
+        self.content_hash = self.compute_hash()
+        super().save(*args, **kwargs)
+
+    def compute_hash(self):
+        return question_hash(self.text, self.option_a, self.option_b, self.option_c, self.option_d)
+
     def __str__(self):
         return f"[Level {self.level}] {self.text[:60]}"
 
@@ -40,6 +77,40 @@ class Question(models.Model):
         ordering = ['level']
 
 
+class Tournament(models.Model):
+    """
+    A scheduled event: every participant plays the same deck once
+    between starts_at and ends_at. Ranked in bulk when it closes
+    (see quiz/tournaments.py).
+    """
+    name         = models.CharField(max_length=100)
+    starts_at    = models.DateTimeField()
+    ends_at      = models.DateTimeField()
+    # Drawn once and shared by every game, as "primary:alternate,..." (see question_pool.draw_deck)
+    deck         = models.TextField(blank=True, default='')
+    closed_at    = models.DateTimeField(null=True, blank=True)   # When the standings were written
+    participants = models.PositiveIntegerField(default=0)         # Set at close
+
+    def is_open(self, now=None):
+        now = now or timezone.now()
+        return self.closed_at is None and self.starts_at <= now < self.ends_at
+
+    @property
+    def status(self):
+        if self.closed_at:
+            return 'closed'
+        now = timezone.now()
+        if now < self.starts_at:
+            return 'scheduled'
+        return 'open' if now < self.ends_at else 'closing'
+
+    def __str__(self):
+        return f"{self.name} | {self.starts_at:%Y-%m-%d %H:%M}"
+
+    class Meta:
+        ordering = ['-starts_at']
+
+
 class GameSession(models.Model):
     """
     Stores each user's game attempt — current level, lifelines used,
@@ -64,6 +135,7 @@ class GameSession(models.Model):
     lifeline_5050     = models.BooleanField(default=True)   # 50-50
     lifeline_skip     = models.BooleanField(default=True)   # Skip Question
     lifeline_poll     = models.BooleanField(default=True)   # Audience Poll
+    skipped_level     = models.PositiveIntegerField(null=True, blank=True)   # Where Skip was used
 
     # Track which question was served this turn (for lifeline logic)
     current_question  = models.ForeignKey(
@@ -76,11 +148,204 @@ class GameSession(models.Model):
     # Store eliminated options from 50-50 as comma-separated e.g. "B,C"
     eliminated_options = models.CharField(max_length=10, blank=True, default='')
 
+    # Audience poll on the current question as "A:52,B:18,C:20,D:10"
+    audience_poll     = models.CharField(max_length=24, blank=True, default='')
+
+    # When the current question was served (answer timing in AnswerEvent)
+    question_started_at = models.DateTimeField(null=True, blank=True)
+
+    # Pre-drawn question IDs per level as "primary:alternate,..." (see question_pool.draw_deck)
+    deck              = models.TextField(blank=True, default='')
+
+    # Set for a tournament game, which plays the tournament's shared deck
+    tournament        = models.ForeignKey(
+        Tournament,
+        null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='games'
+    )
+
     def __str__(self):
         return f"{self.user.username} | Level {self.current_level} | {self.status} | ₹{self.score}"
 
     class Meta:
         ordering = ['-score', '-started_at']
+        indexes = [
+            # get_active_session: one user's active game
+            models.Index(fields=['user', 'status'], name='session_user_status_idx'),
+            # Finished-game scans ordered by score (leaderboard rebuild)
+            models.Index(fields=['status', 'score'], name='session_status_score_idx'),
+            # result_view: a user's most recently finished game
+            models.Index(fields=['user', '-ended_at'], name='session_user_ended_idx'),
+        ]
+        constraints = [
+            # A user can only have one game in progress
+            models.UniqueConstraint(
+                fields=['user'], condition=models.Q(status='active'),
+                name='one_active_session_per_user',
+            ),
+            # One game per player per tournament
+            models.UniqueConstraint(fields=['tournament', 'user'], name='one_game_per_tournament'),
+        ]
+
+class UserStats(models.Model):
+    """
+    Materialized per-user results, maintained as games end
+    (see quiz/leaderboard.py) so the leaderboard, dashboard and admin
+    user list are plain reads instead of aggregates over GameSession.
+    Rebuild from history with `manage.py rebuild_leaderboard`.
+    """
+    user           = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    best_score     = models.PositiveIntegerField(default=0)
+    best_at        = models.DateTimeField(null=True, blank=True)   # When the best was first reached
+
+    # Lifetime totals over finished games
+    games_played   = models.PositiveIntegerField(default=0)
+    wins           = models.PositiveIntegerField(default=0)
+    losses         = models.PositiveIntegerField(default=0)
+    quits          = models.PositiveIntegerField(default=0)
+    total_winnings = models.PositiveBigIntegerField(default=0)
+    last_played    = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user.username} | Best ₹{self.best_score}"
+
+    class Meta:
+        verbose_name_plural = 'user stats'
+        indexes = [
+            models.Index(fields=['-best_score', 'best_at'], name='userstats_leaderboard_idx'),
+        ]
+
+class ScoreBucket(models.Model):
+    """
+    Number of users whose personal best equals `score`.
+    Scores only take prize-ladder values, so this stays tiny and a
+    player's global rank is a sum over at most 16 rows (quiz/ranks.py).
+    """
+    score   = models.PositiveIntegerField(primary_key=True)
+    players = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"₹{self.score}: {self.players} players"
+
+    class Meta:
+        ordering = ['-score']
+
+class SeenQuestions(models.Model):
+    """
+    Questions a user has already been served, per level, packed as
+    sorted integer arrays (see quiz/seen_questions.py). Folded in as games end.
+    """
+    user    = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='seen_questions')
+    data    = models.BinaryField(default=b'')
+    count   = models.PositiveIntegerField(default=0)   # Total IDs in data
+
+    def __str__(self):
+        return f"{self.user.username} | {self.count} questions seen"
+
+    class Meta:
+        verbose_name_plural = 'seen questions'
+
+class AnswerEvent(models.Model):
+    """
+    Append-only log of every answer and lifeline use.
+    Buffered in process and written in batches (see quiz/events.py).
+    """
+    KIND_CHOICES = [
+        ('answer',        'Answer'),
+        ('fifty_fifty',   '50-50'),
+        ('skip',          'Skip'),
+        ('audience_poll', 'Audience Poll'),
+    ]
+
+    session        = models.ForeignKey(GameSession, on_delete=models.CASCADE, related_name='events')
+    question       = models.ForeignKey(
+        Question,
+        null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='events'
+    )
+    level          = models.PositiveIntegerField()
+    kind           = models.CharField(max_length=15, choices=KIND_CHOICES, default='answer')
+    chosen         = models.CharField(max_length=7, blank=True, default='')   # A–D or TIMEOUT
+    correct        = models.BooleanField(null=True, blank=True)               # None for lifelines
+    elapsed_ms     = models.PositiveIntegerField(null=True, blank=True)       # Since the question was served
+    lifelines_used = models.CharField(max_length=40, blank=True, default='')  # Spent so far this game, e.g. "skip,fifty_fifty"
+    # When it happened, not when the batch was written
+    created_at     = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Session {self.session_id} | Level {self.level} | {self.kind} {self.chosen}".rstrip()
+
+    class Meta:
+        ordering = ['created_at']
+
+
+class FastestFingerRound(models.Model):
+    """
+    One Fastest Finger First question played in a live room
+    (see quiz/live.py). Written with its answers when the round closes.
+    """
+    room       = models.CharField(max_length=40, db_index=True)
+    question   = models.ForeignKey(Question, null=True, on_delete=models.SET_NULL, related_name='+')
+    started_at = models.DateTimeField()
+    players    = models.PositiveIntegerField(default=0)                 # In the room when it went out
+    winner     = models.ForeignKey(
+        User,
+        null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='fastest_finger_wins'
+    )
+    winner_ms  = models.PositiveIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.room} | {self.started_at:%Y-%m-%d %H:%M:%S} | {self.winner or 'no winner'}"
+
+    class Meta:
+        ordering = ['-started_at']
+
+
+class FastestFingerAnswer(models.Model):
+    """A player's first answer in a round, timed by the server."""
+    round      = models.ForeignKey(FastestFingerRound, on_delete=models.CASCADE, related_name='answers')
+    user       = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    chosen     = models.CharField(max_length=1)
+    correct    = models.BooleanField()
+    elapsed_ms = models.PositiveIntegerField()   # From sending the question to receiving this
+
+    def __str__(self):
+        return f"Round {self.round_id} | {self.user_id} | {self.chosen} in {self.elapsed_ms} ms"
+
+    class Meta:
+        ordering    = ['round', 'elapsed_ms']
+        constraints = [
+            models.UniqueConstraint(fields=['round', 'user'], name='one_answer_per_round'),
+        ]
+
+
+class TournamentStanding(models.Model):
+    """
+    A participant's final place in a closed tournament. Written in bulk
+    by tournaments.close(); standings pages read a range of positions.
+    """
+    tournament  = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name='standings')
+    position    = models.PositiveIntegerField()   # 1..participants, unique: for paging
+    rank        = models.PositiveIntegerField()   # Shown; equal for ties
+    user        = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tournament_standings')
+    score       = models.PositiveIntegerField()
+    level       = models.PositiveIntegerField()   # Level reached
+    status      = models.CharField(max_length=10, choices=GameSession.STATUS_CHOICES)
+    duration_ms = models.PositiveBigIntegerField()   # Start of the game to its end; breaks score ties
+
+    def __str__(self):
+        return f"{self.tournament} | #{self.rank} {self.user_id} | ₹{self.score}"
+
+    class Meta:
+        ordering    = ['tournament', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['tournament', 'position'], name='standing_position_unique'),
+            models.UniqueConstraint(fields=['tournament', 'user'], name='standing_user_unique'),
+        ]
 
 # quiz/models.py  ← append at bottom
 
@@ -0,0 +1,192 @@
+# quiz/question_io.py
+
+"""
+Streaming question import/export as CSV or JSON Lines.
+
+Rows are read lazily and upserted in chunks with
+bulk_create(update_conflicts=True) keyed on Question.content_hash.
+Memory stays flat whatever the file size, and each chunk commits on its
+own, so a long import never holds a write lock for long. Existing
+questions keep their IDs, so the live games and decks that point at
+them are unaffected. Re-running an import changes nothing.
+
+Used by import_questions, export_questions and seed_questions.
+"""
+
+import csv
+import json
+
+from django.db import transaction
+
+from .models      import Question, DIFFICULTY_CHOICES, question_hash
+from .calibration import difficulty_for_level
+from .            import question_pool
+
+
+FIELDS        = ('text', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_option', 'difficulty', 'level')
+UPDATE_FIELDS = ('correct_option', 'difficulty', 'level')   # Everything not in the hash
+FORMATS       = ('csv', 'jsonl')
+DIFFICULTIES  = {value for value, _ in DIFFICULTY_CHOICES}
+MAX_ERRORS    = 20   # Bad rows reported individually
+
+
+class RowError(ValueError):
+    """A row that can't become a Question."""
+
+
+def detect_format(path):
+    """Guess the format from the file extension; None if unknown."""
+    name = path.lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return None
+
+
+# ============================================================
+# READING
+# ============================================================
+
+class Progress:
+    """Bytes read and rows handled so far, for progress reports."""
+
+    def __init__(self):
+        self.bytes   = 0
+        self.rows    = 0
+        self.skipped = 0
+        self.errors  = []   # [(line, message)], first MAX_ERRORS only
+
+
+def _lines(fh, progress):
+    """Decode a binary file line by line, counting bytes as they go."""
+    for number, raw in enumerate(fh):
+        progress.bytes += len(raw)
+        line = raw.decode('utf-8')
+        yield line.lstrip('\ufeff') if number == 0 else line
+
+
+def read_rows(fh, fmt, progress):
+    """Yield (line number, dict) from a binary CSV or JSONL file."""
+    lines = _lines(fh, progress)
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, RowError(f'invalid JSON: {exc.msg}')
+
+
+def to_question(row):
+    """Validate one row and build an unsaved Question (hash filled in)."""
+    if isinstance(row, RowError):
+        raise row
+    if not isinstance(row, dict):
+        raise RowError('expected an object')
+
+    values = {}
+    for field in FIELDS[:5]:
+        value = str(row.get(field) or '').strip()
+        if not value:
+            raise RowError(f'missing {field}')
+        values[field] = value
+
+    values['correct_option'] = str(row.get('correct_option') or '').strip().upper()
+    if values['correct_option'] not in ('A', 'B', 'C', 'D'):
+        raise RowError('correct_option must be A, B, C or D')
+
+    try:
+        values['level'] = int(row.get('level'))
+    except (TypeError, ValueError):
+        raise RowError('level must be a number') from None
+    if not 1 <= values['level'] <= 15:
+        raise RowError('level must be between 1 and 15')
+
+    values['difficulty'] = str(row.get('difficulty') or '').strip().lower() or difficulty_for_level(values['level'])
+    if values['difficulty'] not in DIFFICULTIES:
+        raise RowError(f"difficulty must be one of {', '.join(sorted(DIFFICULTIES))}")
+
+    return Question(content_hash=question_hash(*(values[f] for f in FIELDS[:5])), **values)
+
+
+# ============================================================
+# UPSERT
+# ============================================================
+
+def _write_chunk(chunk):
+    with transaction.atomic():
+        Question.objects.bulk_create(
+            list(chunk.values()),
+            update_conflicts = True,
+            unique_fields    = ['content_hash'],
+            update_fields    = list(UPDATE_FIELDS),
+        )
+
+
+def upsert(questions, chunk_size=5000, on_chunk=None, progress=None):
+    """
+    Insert-or-update unsaved Questions (content_hash set) in chunks.
+    Accepts Questions, or (line, row) pairs from read_rows() which are
+    validated on the way; bad rows are skipped and recorded.
+    Calls on_chunk(progress) after each chunk; returns the Progress.
+    """
+    progress = progress or Progress()
+    chunk = {}
+    for item in questions:
+        if not isinstance(item, Question):
+            line, row = item
+            try:
+                item = to_question(row)
+            except RowError as exc:
+                progress.skipped += 1
+                if len(progress.errors) < MAX_ERRORS:
+                    progress.errors.append((line, str(exc)))
+                continue
+
+        # Last copy wins within a chunk (a row can't be upserted twice in one statement)
+        chunk[item.content_hash] = item
+        progress.rows += 1
+        if len(chunk) >= chunk_size:
+            _write_chunk(chunk)
+            chunk = {}
+            if on_chunk:
+                on_chunk(progress)
+
+    if chunk:
+        _write_chunk(chunk)
+        if on_chunk:
+            on_chunk(progress)
+
+    # bulk_create skips post_save, so drop the pool index by hand
+    question_pool.invalidate()
+    return progress
+
+
+# ============================================================
+# EXPORT
+# ============================================================
+
+def export(fh, fmt, chunk_size=5000):
+    """Stream every question to a text file. Returns the row count."""
+    rows = Question.objects.order_by('id').values_list(*FIELDS).iterator(chunk_size=chunk_size)
+    count = 0
+
+    if fmt == 'csv':
+        writer = csv.writer(fh)
+        writer.writerow(FIELDS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+
+    for row in rows:
+        fh.write(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + '\n')
+        count += 1
+    return count
@@ -0,0 +1,256 @@
+# quiz/question_pool.py
+
+"""
+In-process index of the question pool.
+
+Picking a question used to load every row for a level on each request.
+Instead we keep just the question IDs per level in a compact array and
+load full rows lazily into a small LRU cache, so a pick costs O(1) plus
+at most one primary-key lookup.
+
+The index is per process. It is dropped by the Question post_save /
+post_delete signals (see quiz/signals.py) and by seed_questions, and is
+rebuilt with a single query on the next pick.
+
+With QUIZ_QUESTION_SNAPSHOT set, IDs and rows come from the shared
+memory-mapped snapshot instead (quiz/question_snapshot.py), and a
+question change rebuilds the snapshot rather than this index.
+"""
+
+import random
+import threading
+from array       import array
+from bisect      import bisect_left
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .models import Question
+from .       import question_snapshot
+
+
+# How many full Question rows to keep in memory per process
+CACHE_SIZE = getattr(settings, 'QUIZ_QUESTION_CACHE_SIZE', 512)
+
+# Random draws to try before falling back to an exact pick
+MAX_DRAWS = 8
+
+_lock      = threading.Lock()
+_level_ids = None            # {level: array('q', [id, ...])}
+_rows      = OrderedDict()   # {id: Question} in LRU order
+
+
+# ============================================================
+# INDEX
+# ============================================================
+
+def _build_index():
+    """Load every (level, id) pair with one query; each level's IDs sorted."""
+    index = {}
+    rows = Question.objects.order_by('id').values_list('level', 'id')
+    for level, pk in rows.iterator(chunk_size=2000):
+        index.setdefault(level, array('q')).append(pk)
+    return index
+
+
+def get_level_ids(level):
+    """Return the compact array of question IDs for a level."""
+    global _level_ids
+    snapshot = question_snapshot.current()
+    if snapshot is not None:
+        return snapshot.level_ids(level)
+    index = _level_ids
+    if index is None:
+        with _lock:
+            if _level_ids is None:
+                _level_ids = _build_index()
+            index = _level_ids
+    return index.get(level, array('q'))
+
+
+def invalidate():
+    """Drop the ID index and cached rows; rebuilt on next use."""
+    global _level_ids
+    with _lock:
+        _level_ids = None
+        _rows.clear()
+    question_snapshot.rebuild_on_commit()
+
+
+# ============================================================
+# ROW CACHE
+# ============================================================
+
+def _cached(pk):
+    with _lock:
+        question = _rows.get(pk)
+        if question is not None:
+            _rows.move_to_end(pk)
+        return question
+
+
+def _remember(question):
+    with _lock:
+        _rows[question.pk] = question
+        _rows.move_to_end(question.pk)
+        while len(_rows) > CACHE_SIZE:
+            _rows.popitem(last=False)
+    return question
+
+
+def get_question(pk):
+    """
+    Return the Question with this ID, from the LRU cache if possible.
+    Returns None if the row no longer exists.
+    """
+    snapshot = question_snapshot.current()
+    question = snapshot.question(pk) if snapshot is not None else _cached(pk)
+    if question is None:
+        question = Question.objects.filter(pk=pk).first()
+        if question is not None and snapshot is None:
+            _remember(question)
+    return question
+
+
+async def aget_question(pk):
+    """Async twin of get_question() for the async views."""
+    snapshot = question_snapshot.current()
+    question = snapshot.question(pk) if snapshot is not None else _cached(pk)
+    if question is None:
+        question = await Question.objects.filter(pk=pk).afirst()
+        if question is not None and snapshot is None:
+            _remember(question)
+    return question
+
+
+# ============================================================
+# PICKING
+# ============================================================
+
+def _contains(ids, pk):
+    i = bisect_left(ids, pk)
+    return i < len(ids) and ids[i] == pk
+
+
+def _pick_avoiding(ids, seen=(), excluded=()):
+    """
+    Uniform random ID from sorted `ids` that is in neither the sorted
+    `seen` array nor the `excluded` set, or None if every ID is taken.
+
+    A few random draws settle it while most of the pool is free. After
+    that it picks the r-th free ID exactly, stepping over the taken
+    positions, in O(t log n) for t taken IDs. t is what the player has
+    seen at the level, so this nears O(pool) for a player who has seen
+    most of it.
+    """
+    n = len(ids)
+    if not seen and not excluded:
+        return ids[random.randrange(n)]
+
+    for _ in range(MAX_DRAWS):
+        pk = ids[random.randrange(n)]
+        if pk not in excluded and not _contains(seen, pk):
+            return pk
+
+    taken = sorted({
+        bisect_left(ids, pk) for source in (seen, excluded) for pk in source if _contains(ids, pk)
+    })
+    free = n - len(taken)
+    if free <= 0:
+        return None
+    index = random.randrange(free)
+    for position in taken:
+        if position > index:
+            break
+        index += 1
+    return ids[index]
+
+
+def pick_question_id(level, exclude_ids=None, seen=()):
+    """
+    Pick a random question ID for the level, avoiding exclude_ids and
+    the sorted `seen` IDs (see quiz/seen_questions.py) where possible.
+    Falls back to ignoring `seen`, then to any ID at the level, or None.
+    """
+    ids = get_level_ids(level)
+    if not ids:
+        return None
+
+    excluded = set(exclude_ids or ())
+    for avoid_seen in (seen, ()):
+        pk = _pick_avoiding(ids, avoid_seen, excluded)
+        if pk is not None:
+            return pk
+    return ids[random.randrange(len(ids))]
+
+
+def pick_question(level, exclude_ids=None, seen=()):
+    """
+    Return a random Question for the level, or None if there is none.
+    A stale index (row deleted by another process) is rebuilt once.
+    """
+    for _ in range(2):
+        pk = pick_question_id(level, exclude_ids, seen)
+        if pk is None:
+            return None
+        question = get_question(pk)
+        if question is not None:
+            return question
+        invalidate()
+    return None
+
+
+# ============================================================
+# DECK
+# ============================================================
+
+def draw_deck(levels=range(1, 16), seen=None):
+    """
+    Draw a primary question and one skip alternate for every level,
+    encoded compactly as "primary:alternate,..." (0 = none available).
+    With a SeenSet (quiz/seen_questions.py), both come from questions
+    the player hasn't seen, as far as the level allows. Uses only the
+    in-memory index, so it costs at most the one query that builds it.
+    """
+    entries = []
+    for level in levels:
+        ids = get_level_ids(level)
+        if not ids:
+            entries.append('0:0')
+            continue
+        level_seen = seen.get(level) if seen else ()
+        first  = pick_question_id(level, seen=level_seen)
+        second = 0
+        if len(ids) > 1:
+            second = pick_question_id(level, exclude_ids=[first], seen=level_seen)
+        entries.append(f"{first}:{second}")
+    return ','.join(entries)
+
+
+def deck_entry(deck, level):
+    """
+    Return (primary_id, alternate_id) for a level from an encoded deck,
+    or (None, None) if the deck is missing or has no question there.
+    """
+    if not deck:
+        return None, None
+    entries = deck.split(',')
+    if not 1 <= level <= len(entries):
+        return None, None
+    primary, alternate = (int(pk) or None for pk in entries[level - 1].split(':'))
+    return primary, alternate
+
+
+def with_deck_entry(deck, level, pk, alternate=False):
+    """
+    The deck with one level's primary (or alternate) set to `pk`, so it
+    records a question served in place of the one drawn. Levels the deck
+    doesn't cover leave it unchanged.
+    """
+    entries = deck.split(',') if deck else []
+    if not 1 <= level <= len(entries):
+        return deck
+    pair = entries[level - 1].split(':')
+    pair[1 if alternate else 0] = str(pk or 0)
+    entries[level - 1] = ':'.join(pair)
+    return ','.join(entries)
@@ -0,0 +1,282 @@
+# quiz/question_snapshot.py
+
+"""
+Memory-mapped question bank shared by every worker process.
+
+build() writes the whole bank into one binary file (QUIZ_QUESTION_SNAPSHOT).
+Every process maps it read-only, so the OS page cache holds a single copy
+however many gunicorn workers there are, and question_pool answers from
+it without a query or a per-process copy.
+
+Layout (header little-endian; the arrays are in native byte order, so
+build on the architecture that serves):
+
+    header       HEADER: magic, format, top level, version stamp, count,
+                 and the offset of each section below
+    level table  (start, count) per level 0..top, into ids / records
+    ids          int64 question IDs, grouped by level, sorted in a level
+    by_id        int64 IDs sorted globally, then uint32 record numbers
+    records      RECORD per question, in ids order: (offset, length) of
+                 each string in STRING_FIELDS, correct option, level
+    strings      UTF-8 string table, each distinct string stored once
+
+build() writes a temporary file and renames it over the old one, so a
+reader sees either the old snapshot or the new one, never a mix.
+current() re-stats the file at most every QUIZ_QUESTION_SNAPSHOT_CHECK_SECONDS
+and maps a new one when its version stamp changes. The old mapping stays
+valid until nothing uses it.
+
+A question change (question_pool.invalidate()) only marks the snapshot
+stale when its transaction commits: that process reads questions from
+the database again, and a background thread rebuilds the file
+QUIZ_QUESTION_SNAPSHOT_REBUILD_DELAY seconds later, once for a whole
+burst of changes (e.g. an import). The request that made the change
+never waits for a scan of the bank.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from array  import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db   import connection, transaction
+
+from .models import Question
+
+
+PATH          = getattr(settings, 'QUIZ_QUESTION_SNAPSHOT', None)   # None: disabled
+CHECK_SECONDS = getattr(settings, 'QUIZ_QUESTION_SNAPSHOT_CHECK_SECONDS', 2)
+REBUILD_DELAY = getattr(settings, 'QUIZ_QUESTION_SNAPSHOT_REBUILD_DELAY', 1)
+
+MAGIC         = b'KBCQ'
+FORMAT        = 1
+HEADER        = struct.Struct('<4sHHQIIQQQQ8x')   # 64 bytes
+LEVEL         = struct.Struct('<II')
+STRING_FIELDS = ('text', 'option_a', 'option_b', 'option_c', 'option_d', 'difficulty')
+RECORD        = struct.Struct(f'<{2 * len(STRING_FIELDS)}Icb2x')
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# BUILD
+# ============================================================
+
+def build(path=None, chunk_size=5000):
+    """Write the current question bank to `path`. Returns (count, bytes, stamp)."""
+    path = path or PATH
+    ids, levels = array('q'), {}
+    records, strings, offsets = bytearray(), bytearray(), {}
+
+    def intern(value):
+        offset = offsets.get(value)
+        data   = value.encode('utf-8')
+        if offset is None:
+            offset = offsets[value] = len(strings)
+            strings.extend(data)
+        return offset, len(data)
+
+    rows = (
+        Question.objects.order_by('level', 'id')
+        .values_list('id', 'level', 'correct_option', *STRING_FIELDS)
+    )
+    for pk, level, correct, *texts in rows.iterator(chunk_size=chunk_size):
+        start, count = levels.get(level, (len(ids), 0))
+        levels[level] = (start, count + 1)
+        ids.append(pk)
+        spans = [n for value in texts for n in intern(value)]
+        records += RECORD.pack(*spans, correct.encode(), level)
+
+    order   = sorted(range(len(ids)), key=ids.__getitem__)
+    by_id   = array('q', (ids[i] for i in order))
+    by_rec  = array('I', order)
+    top     = max(levels, default=0)
+    table   = b''.join(LEVEL.pack(*levels.get(level, (0, 0))) for level in range(top + 1))
+
+    ids_off     = HEADER.size + len(table)
+    by_id_off   = ids_off + len(ids) * 8
+    records_off = by_id_off + len(ids) * 12
+    strings_off = records_off + len(records)
+    stamp       = time.time_ns()
+    header      = HEADER.pack(MAGIC, FORMAT, top, stamp, len(ids),
+                              0, ids_off, by_id_off, records_off, strings_off)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp   = tempfile.mkstemp(dir=directory, prefix='.questions-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            for part in (header, table, ids, by_id, by_rec, records, strings):
+                fh.write(part)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    _recheck()
+    return len(ids), strings_off + len(strings), stamp
+
+
+_rebuild_lock = threading.Lock()
+_requested    = 0   # Changes marked stale in this process
+_built        = 0   # Of those, how many the last good build covers
+_wake         = threading.Event()
+_thread       = None
+
+
+def rebuild_on_commit():
+    """Mark the snapshot stale once the current transaction commits."""
+    if not PATH:
+        return
+    transaction.on_commit(mark_stale)
+
+
+def mark_stale():
+    """Serve this process from the database until the rebuilder thread has built a new file."""
+    global _requested
+    with _rebuild_lock:
+        _requested += 1
+    _wake.set()
+    _start()
+
+
+def stale():
+    return _built < _requested
+
+
+def rebuild():
+    """Build now, covering every change marked stale so far. Returns True on success."""
+    global _built
+    with _rebuild_lock:
+        target = _requested
+    try:
+        build()
+    except Exception:
+        logger.exception('Could not rebuild the question snapshot %s', PATH)
+        return False
+    with _rebuild_lock:
+        _built = max(_built, target)
+    return True
+
+
+def _start():
+    global _thread
+    if _thread is not None:
+        return
+    with _rebuild_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name='quiz-question-snapshot', daemon=True)
+            _thread.start()
+
+
+def _run():
+    while True:
+        _wake.wait()
+        time.sleep(REBUILD_DELAY)   # Let the rest of a burst of changes land
+        _wake.clear()
+        try:
+            rebuild()
+        finally:
+            connection.close()
+
+
+# ============================================================
+# READ
+# ============================================================
+
+class Snapshot:
+    """A read-only mapping of one snapshot file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as fh:
+            stat    = os.fstat(fh.fileno())
+            self.mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self.key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        (magic, fmt, top, self.stamp, count, _,
+         ids_off, by_id_off, records_off, self.strings_off) = HEADER.unpack_from(self.mm)
+        if magic != MAGIC or fmt != FORMAT:
+            raise ValueError(f'{path} is not a format {FORMAT} question snapshot')
+
+        view = memoryview(self.mm)
+        self.count       = count
+        self.records_off = records_off
+        self.ids         = view[ids_off:ids_off + count * 8].cast('q')
+        self.by_id       = view[by_id_off:by_id_off + count * 8].cast('q')
+        self.by_rec      = view[by_id_off + count * 8:by_id_off + count * 12].cast('I')
+        self.levels      = {
+            level: LEVEL.unpack_from(self.mm, HEADER.size + level * LEVEL.size)
+            for level in range(top + 1)
+        }
+
+    def level_ids(self, level):
+        """Sorted IDs on a level: a zero-copy view into the mapping."""
+        start, count = self.levels.get(level, (0, 0))
+        return self.ids[start:start + count]
+
+    def question(self, pk):
+        """An unsaved-looking Question built from the mapping, or None."""
+        i = bisect_left(self.by_id, pk)
+        if i == self.count or self.by_id[i] != pk:
+            return None
+        *spans, correct, level = RECORD.unpack_from(
+            self.mm, self.records_off + self.by_rec[i] * RECORD.size
+        )
+        base   = self.strings_off
+        values = {
+            field: str(self.mm[base + offset:base + offset + length], 'utf-8')
+            for field, offset, length in zip(STRING_FIELDS, spans[::2], spans[1::2])
+        }
+        values.update(id=pk, level=level, correct_option=correct.decode())
+        # Fields not in the snapshot are deferred: loaded from the DB if used
+        names = [f.attname for f in Question._meta.concrete_fields if f.attname in values]
+        return Question.from_db('default', names, [values[name] for name in names])
+
+
+_lock     = threading.Lock()
+_current  = None
+_checked  = float('-inf')
+
+
+def current():
+    """The mapped snapshot, reloaded when the file changes; None if disabled, missing or stale."""
+    if not PATH or stale():
+        return None
+    if time.monotonic() - _checked >= CHECK_SECONDS:
+        with _lock:
+            if time.monotonic() - _checked >= CHECK_SECONDS:
+                _refresh()
+    return _current
+
+
+def _refresh():
+    global _current, _checked
+    _checked = time.monotonic()
+    try:
+        stat = os.stat(PATH)
+    except FileNotFoundError:
+        _current = None
+        return
+    if _current is not None and _current.key == (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+        return
+    try:
+        snapshot = Snapshot(PATH)
+    except (OSError, ValueError):
+        logger.exception('Could not map the question snapshot %s; keeping the current one', PATH)
+        return
+    if _current is None or snapshot.stamp != _current.stamp:
+        _current = snapshot
+
+
+def _recheck():
+    """Look at the file again on the next current() call."""
+    global _checked
+    with _lock:
+        _checked = float('-inf')
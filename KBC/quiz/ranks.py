@@ -0,0 +1,109 @@
+# quiz/ranks.py
+
+"""
+Global rank from a score histogram.
+
+Personal bests can only be prize-ladder values (plus 0), so instead of
+counting users with a better score we keep {score: players} — in memory
+for reads, with a ScoreBucket copy in the database. A player's rank is
+1 + the number of players in higher buckets: no aggregate query.
+
+The in-memory copy is refreshed from the 16-odd ScoreBucket rows every
+QUIZ_RANK_REFRESH_SECONDS so that separate worker processes converge.
+"""
+
+import threading
+import time
+
+from django.conf      import settings
+from django.db        import transaction
+from django.db.models import Count, F
+
+from .models import ScoreBucket, UserStats, PRIZE_LADDER
+
+
+REFRESH_SECONDS = getattr(settings, 'QUIZ_RANK_REFRESH_SECONDS', 60)
+
+# Every possible personal best. Their buckets always exist (seeded by a
+# migration, kept by rebuild()), so recording a best is a single UPDATE
+SCORES = (0, *PRIZE_LADDER.values())
+
+_lock      = threading.Lock()
+_counts    = None   # {score: players}
+_loaded_at = 0.0
+
+
+def _get_counts():
+    """Return the in-memory histogram, reloading it when stale."""
+    global _counts, _loaded_at
+    with _lock:
+        if _counts is None or time.monotonic() - _loaded_at > REFRESH_SECONDS:
+            _counts = dict(ScoreBucket.objects.values_list('score', 'players'))
+            _loaded_at = time.monotonic()
+        return _counts
+
+
+def _apply(old_best, new_best):
+    """Move one player between buckets in the in-memory copy."""
+    with _lock:
+        if _counts is None:
+            return
+        if old_best is not None:
+            _counts[old_best] = max(_counts.get(old_best, 0) - 1, 0)
+        _counts[new_best] = _counts.get(new_best, 0) + 1
+
+
+def invalidate():
+    """Force the next read to reload from ScoreBucket."""
+    global _counts
+    with _lock:
+        _counts = None
+
+
+def record_best_change(old_best, new_best):
+    """
+    Move a player from old_best (None for a new player) to new_best.
+    Runs inside the caller's transaction; the in-memory copy follows
+    on commit.
+    """
+    if old_best == new_best:
+        return
+    if old_best is not None:
+        ScoreBucket.objects.filter(score=old_best, players__gt=0).update(players=F('players') - 1)
+    if not _bump(new_best):
+        # No bucket (a score off the ladder). A concurrent request may be
+        # adding the row too: insert-or-ignore, then count this player in it
+        ScoreBucket.objects.bulk_create([ScoreBucket(score=new_best, players=0)], ignore_conflicts=True)
+        _bump(new_best)
+    transaction.on_commit(lambda: _apply(old_best, new_best))
+
+
+def _bump(score):
+    """Add a player to an existing bucket. Returns rows updated (0 or 1)."""
+    return ScoreBucket.objects.filter(score=score).update(players=F('players') + 1)
+
+
+def rank_for_score(score):
+    """1-based global rank for a personal best of `score`."""
+    return 1 + sum(n for s, n in _get_counts().items() if s > score)
+
+
+def rank_for_user(user):
+    """Global rank of the user's personal best, or None if unranked."""
+    best = UserStats.objects.filter(user=user).values_list('best_score', flat=True).first()
+    if best is None:
+        return None
+    return rank_for_score(best)
+
+
+def rebuild():
+    """Recompute every bucket from UserStats."""
+    rows    = UserStats.objects.order_by().values('best_score').annotate(n=Count('pk'))
+    players = dict.fromkeys(SCORES, 0)
+    players.update((r['best_score'], r['n']) for r in rows)
+    with transaction.atomic():
+        ScoreBucket.objects.all().delete()
+        ScoreBucket.objects.bulk_create(
+            [ScoreBucket(score=score, players=n) for score, n in players.items()]
+        )
+    invalidate()
@@ -0,0 +1,132 @@
+# quiz/reaper.py
+
+"""
+Closes abandoned games.
+
+A game whose tab was closed stays active until the player starts
+another one, so the active set only grows. Once the current question
+has gone unanswered for QUIZ_IDLE_GAME_SECONDS, reap() ends the game the
+way a timeout would: status 'lost' and the safe-haven payout.
+
+Games are closed a batch at a time. One UPDATE per batch computes each
+payout in SQL (safe_score() is get_safe_score() as a CASE on the level)
+and is conditional on the game still being active and idle, so a player
+answering at that moment keeps their game. The closed games are then
+folded into UserStats and seen questions in the same transaction, as
+end_game() does.
+
+Run it with `manage.py reap_games` (e.g. from cron), or set
+QUIZ_REAPER_INTERVAL_SECONDS to reap from a thread in each server
+process, started on its first request.
+"""
+
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf      import settings
+from django.db        import connection, transaction
+from django.db.models import Case, Q, Value, When
+from django.utils     import timezone
+
+from .models import GameSession, SAFE_HAVENS
+from .       import game_store, leaderboard, seen_questions
+
+
+IDLE_SECONDS = getattr(settings, 'QUIZ_IDLE_GAME_SECONDS', 15 * 60)
+INTERVAL     = getattr(settings, 'QUIZ_REAPER_INTERVAL_SECONDS', 0)   # 0: no thread
+BATCH_SIZE   = 500
+
+logger = logging.getLogger(__name__)
+
+
+def safe_score():
+    """get_safe_score(current_level) as a SQL expression."""
+    return Case(
+        *[When(current_level__gt=level, then=Value(amount))
+          for level, amount in sorted(SAFE_HAVENS.items(), reverse=True)],
+        default=Value(0),
+    )
+
+
+def idle(cutoff):
+    """Active games whose current question was served before `cutoff`."""
+    return GameSession.objects.filter(status='active').filter(
+        Q(question_started_at__lt=cutoff)
+        | Q(question_started_at__isnull=True, started_at__lt=cutoff)
+    )
+
+
+def reap(idle_seconds=IDLE_SECONDS, batch_size=BATCH_SIZE, now=None):
+    """Close every game idle as of `now` (default: now). Returns how many."""
+    now    = now or timezone.now()
+    cutoff = now - timedelta(seconds=idle_seconds)
+    return close_games(idle(cutoff), cutoff, now, batch_size)
+
+
+def close_games(games, cutoff, now, batch_size=BATCH_SIZE):
+    """
+    Close `games`, a filter of idle(cutoff), a batch at a time as a
+    timeout would. Returns how many. Also used to close a tournament's
+    unfinished games (quiz/tournaments.py).
+    """
+    closed, last = 0, 0
+    while True:
+        batch = list(
+            games.filter(pk__gt=last)
+            .order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            return closed
+        last    = batch[-1]
+        closed += _close(games, game_store.settle(batch, cutoff), now)
+
+
+def _close(games, pks, now):
+    if not pks:
+        return 0
+    with transaction.atomic():
+        updated = games.filter(pk__in=pks).update(
+            status='lost', ended_at=now, score=safe_score(),
+        )
+        if not updated:
+            return 0
+        sessions = GameSession.objects.filter(pk__in=pks, status='lost', ended_at=now)
+        for session in sessions:
+            leaderboard.record_result(session)
+            seen_questions.record_served(session)
+        transaction.on_commit(lambda: game_store.forget(pks))
+    return updated
+
+
+# ============================================================
+# BACKGROUND THREAD
+# ============================================================
+
+_thread      = None
+_thread_lock = threading.Lock()
+
+
+def start(interval=INTERVAL):
+    """Start this process's reaper thread, once (no-op when interval is 0)."""
+    global _thread
+    if interval <= 0 or _thread is not None:
+        return
+    with _thread_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, args=(interval,), name='quiz-reaper', daemon=True)
+            _thread.start()
+
+
+def _run(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            closed = reap()
+            if closed:
+                logger.info('Closed %d abandoned games', closed)
+        except Exception:
+            logger.exception('Reaping abandoned games failed')
+        finally:
+            connection.close()
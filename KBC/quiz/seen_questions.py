@@ -0,0 +1,132 @@
+# quiz/seen_questions.py
+
+"""
+Per-user record of questions already served, so new games are drawn
+from questions the player hasn't seen (see question_pool.draw_deck).
+
+A user's set is one SeenQuestions row holding, for every level, a
+sorted array of question IDs packed as raw 32-bit integers (64-bit
+if IDs ever outgrow that). That's 4 bytes per question. Each level
+loads with a single array.frombytes(), and membership is a binary
+search. It is updated once per game, in the transaction that ends it
+(game.end_game). When a player has seen a whole level, that level
+starts over.
+"""
+
+from array  import array
+from bisect import bisect_left
+
+from .models import SeenQuestions
+from .       import question_pool
+
+
+LEVELS = range(1, 16)
+
+
+def contains(ids, pk):
+    """Binary search in a sorted array."""
+    i = bisect_left(ids, pk)
+    return i < len(ids) and ids[i] == pk
+
+
+class SeenSet:
+    """Sorted question IDs per level, with a compact byte encoding."""
+
+    def __init__(self, levels=None):
+        self.levels = levels or {}   # {level: sorted array}
+
+    def __len__(self):
+        return sum(len(ids) for ids in self.levels.values())
+
+    def get(self, level):
+        return self.levels.get(level, ())
+
+    def add(self, level, ids):
+        merged = sorted(set(self.get(level)).union(ids))
+        self.levels[level] = array('I' if not merged or merged[-1] < 2 ** 32 else 'Q', merged)
+
+    def reset(self, level):
+        self.levels.pop(level, None)
+
+    # ── Encoding: typecode byte, 15 × uint32 counts, then the IDs ──
+
+    def to_bytes(self):
+        wide   = any(ids.typecode == 'Q' for ids in self.levels.values())
+        code   = 'Q' if wide else 'I'
+        counts = array('I', (len(self.get(level)) for level in LEVELS))
+        body   = b''.join(array(code, self.get(level)).tobytes() for level in LEVELS)
+        return code.encode() + counts.tobytes() + body
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = bytes(data or b'')
+        if not data:
+            return cls()
+        code   = data[:1].decode()
+        counts = array('I')
+        counts.frombytes(data[1:1 + 4 * len(LEVELS)])
+        offset, size, levels = 1 + 4 * len(LEVELS), array(code).itemsize, {}
+        for level, count in zip(LEVELS, counts):
+            if count:
+                ids = array(code)
+                ids.frombytes(data[offset:offset + count * size])
+                levels[level] = ids
+                offset += count * size
+        return cls(levels)
+
+
+# ============================================================
+# STORAGE
+# ============================================================
+
+def load(user_id):
+    """The user's SeenSet (empty if they have never finished a game)."""
+    data = SeenQuestions.objects.filter(user_id=user_id).values_list('data', flat=True).first()
+    return SeenSet.from_bytes(data)
+
+
+def served_questions(session):
+    """
+    {level: [question IDs]} the finished session put in front of the
+    player: the deck's primaries up to the level reached, the question
+    they ended on, and on the level where they used Skip, both the
+    question they skipped and its alternate. Fallback picks are written
+    into the deck as they are served (see game.served_in_place).
+    """
+    served = {}
+    for level in range(1, session.current_level + 1):
+        primary, alternate = question_pool.deck_entry(session.deck, level)
+        if level == session.current_level:
+            ids = [session.current_question_id]
+            if level == session.skipped_level:
+                ids.append(primary)
+        elif level == session.skipped_level:
+            ids = [primary, alternate]
+        else:
+            ids = [primary]
+        ids = [pk for pk in dict.fromkeys(ids) if pk]
+        if ids:
+            served[level] = ids
+    return served
+
+
+def record_served(session):
+    """
+    Fold a finished session's questions into the user's seen set.
+    Must run inside the transaction that ends the session.
+    """
+    served = served_questions(session)
+    if not served:
+        return
+
+    row  = SeenQuestions.objects.select_for_update().filter(user_id=session.user_id).first()
+    seen = SeenSet.from_bytes(row.data if row else None)
+    for level, ids in served.items():
+        if len(seen.get(level)) + len(ids) >= len(question_pool.get_level_ids(level)):
+            seen.reset(level)   # Seen them all: start the level over
+        seen.add(level, ids)
+
+    if row is None:
+        SeenQuestions.objects.create(user_id=session.user_id, data=seen.to_bytes(), count=len(seen))
+    else:
+        SeenQuestions.objects.filter(pk=row.pk).update(data=seen.to_bytes(), count=len(seen))
@@ -0,0 +1,70 @@
+# quiz/signals.py
+
+from django.core.signals      import request_started, request_finished
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch          import receiver
+
+from .models import Question
+from .       import question_pool, events, game_store, metrics, sqlite_tuning, reaper
+
+
+# ----------------------------
+# Question Pool Invalidation
+# ----------------------------
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_pool(sender, **kwargs):
+    """Any change to a question drops the in-process pool index."""
+    question_pool.invalidate()
+
+
+# ----------------------------
+# Answer Event Log
+# ----------------------------
+@receiver(request_finished)
+def flush_answer_events(sender, **kwargs):
+    """Write buffered answer events once the response is out, if due."""
+    events.flush_if_due()
+
+
+@receiver(request_started)
+def start_event_flusher(sender, **kwargs):
+    """Start the thread that flushes events between requests."""
+    events.start()
+
+
+# ----------------------------
+# Request Metrics
+# ----------------------------
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    """Charge every query on a new connection to the request running it."""
+    metrics.install(connection)
+
+
+# ----------------------------
+# SQLite Tuning (opt-in)
+# ----------------------------
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    """Apply the QUIZ_SQLITE_TUNING PRAGMAs to each new SQLite connection."""
+    sqlite_tuning.apply(connection)
+
+
+# ----------------------------
+# Abandoned Game Reaper (opt-in)
+# ----------------------------
+@receiver(request_started)
+def start_reaper(sender, **kwargs):
+    """Start the reaper thread with the first request a server handles."""
+    reaper.start()
+
+
+# ----------------------------
+# Cached Game State Write-Back (QUIZ_GAME_STATE_STORE = 'cache')
+# ----------------------------
+@receiver(request_started)
+def start_game_store(sender, **kwargs):
+    """Start the thread that writes cached games back to their rows."""
+    game_store.start()
@@ -0,0 +1,47 @@
+# quiz/sqlite_tuning.py
+
+"""
+Opt-in SQLite profile for many concurrent players (QUIZ_SQLITE_TUNING).
+
+Out of the box SQLite uses a rollback journal, so a writer blocks every
+reader. Django also opens transactions as DEFERRED. A transaction that
+reads and then writes (every answer does) asks for the write lock only
+at its first write. If another connection holds it, SQLite fails at
+once with "database is locked" rather than wait, because waiting could
+deadlock.
+
+The profile fixes both:
+
+- settings.py sets the backend's transaction_mode to IMMEDIATE. Every
+  atomic block then takes the write lock at BEGIN and queues on
+  busy_timeout instead of failing part way through.
+- apply() runs the PRAGMAs below on each new connection
+  (connection_created, see signals.py). WAL lets readers run alongside
+  the single writer. synchronous=NORMAL syncs at checkpoints rather
+  than on every commit, which is safe under WAL. mmap and a larger page
+  cache cut read syscalls.
+"""
+
+from django.conf import settings
+
+
+ENABLED = getattr(settings, 'QUIZ_SQLITE_TUNING', False)
+
+PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous',  'NORMAL'),
+    ('busy_timeout', getattr(settings, 'QUIZ_SQLITE_BUSY_TIMEOUT_MS', 20000)),
+    ('mmap_size',    256 * 1024 * 1024),
+    ('cache_size',   -64 * 1024),   # Negative: KiB, so 64 MiB
+    ('temp_store',   'MEMORY'),
+)
+
+
+def apply(connection):
+    """Run the profile's PRAGMAs on a new SQLite connection."""
+    if not ENABLED or connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in PRAGMAS:
+            cursor.execute(f'PRAGMA {name} = {value}')
+
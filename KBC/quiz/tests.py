@@ -1,3 +1,1249 @@
-from django.test import TestCase
+import asyncio
+import importlib
+import io
+import json
+import math
+import os
+import random
+import tempfile
+from datetime import timedelta
+from array import array
+from unittest import skipUnless
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth.models import User
+from django.core.cache         import cache
+from django.core.management    import call_command, CommandError
+from django.db                 import connection, connections, transaction, IntegrityError, OperationalError
+from django.db.models          import Sum
+from django.test               import TestCase
+from django.test.utils         import CaptureQueriesContext, override_settings
+from django.urls               import reverse, resolve, clear_url_caches
+from django.utils              import timezone
+
+from .models import Question, GameSession, UserStats, ScoreBucket, AnswerEvent, FastestFingerRound, Tournament, TournamentStanding, PRIZE_LADDER
+from .       import question_pool, ranks, leaderboard, game, game_store, events, calibration, seen_questions, async_views, metrics, sqlite_tuning, reaper, question_snapshot, live, tournaments, datagen
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+class QuizTestCase(TestCase):
+    """
+    Seeds the sample questions and logs in a player.
+    In-process caches are reset because test transactions roll back
+    without firing the signals that would normally invalidate them.
+    """
+
+    def setUp(self):
+        call_command('seed_questions', stdout=io.StringIO())
+        question_pool.invalidate()
+        ranks.invalidate()
+        cache.clear()
+        # Never leave test events for the atexit flush
+        events.discard()
+        self.addCleanup(events.discard)
+        # Tests flush explicitly; no background flush threads
+        for module in (events, game_store):
+            patcher = patch.object(module, 'start')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user('player', password='kbc-pass-123')
+        self.client.force_login(self.user)
+
+    def active_session(self):
+        # Through get_active_session so cached game state is applied
+        session = game.get_active_session(self.user)
+        self.assertIsNotNone(session)
+        return session
+
+    def stored_level(self):
+        return GameSession.objects.get(user=self.user, status='active').current_level
+
+    def start(self):
+        self.client.get(reverse('start_game'))
+        return self.active_session()
+
+    def wrong_option(self, session):
+        correct = session.current_question.correct_option
+        return next(o for o in 'ABCD' if o != correct)
+
+    def play_to_level(self, level):
+        """Start a game and answer correctly until `level` is current."""
+        session = self.start()
+        while session.current_level < level:
+            self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+            session = self.active_session()
+        return session
+
+    def finish_game(self, wrong_at=None):
+        """Play a whole game, losing at `wrong_at` or winning."""
+        session = self.play_to_level(wrong_at or 15)
+        answer = self.wrong_option(session) if wrong_at else session.current_question.correct_option
+        self.client.post(reverse('answer'), {'answer': answer})
+        return GameSession.objects.filter(user=self.user).latest('id')
+
+    def assertMaxQueries(self, budget, func, *args, **kwargs):
+        """Run func and fail if it issues more than `budget` queries."""
+        with CaptureQueriesContext(connection) as ctx:
+            result = func(*args, **kwargs)
+        sql = '\n'.join(q['sql'] for q in ctx.captured_queries)
+        self.assertLessEqual(
+            len(ctx.captured_queries), budget,
+            f"{len(ctx.captured_queries)} queries, budget {budget}:\n{sql}"
+        )
+        return result
+
+
+# ============================================================
+# GAME FLOW
+# ============================================================
+
+class GameFlowTests(QuizTestCase):
+
+    def test_win_pays_top_prize(self):
+        session = self.finish_game()
+        self.assertEqual(session.status, 'won')
+        self.assertEqual(session.score, 10000000)
+
+    def test_wrong_answer_pays_safe_haven(self):
+        session = self.finish_game(wrong_at=7)
+        self.assertEqual(session.status, 'lost')
+        self.assertEqual(session.score, 10000)
+
+    def test_timeout_counts_as_wrong(self):
+        self.play_to_level(3)
+        self.client.post(reverse('answer'), {'answer': 'TIMEOUT'})
+        session = GameSession.objects.get(user=self.user)
+        self.assertEqual((session.status, session.score), ('lost', 0))
+
+    def test_double_submit_is_rejected(self):
+        session = self.start()
+        stale = GameSession.objects.get(pk=session.pk)
+        correct = session.current_question.correct_option
+
+        self.assertEqual(game.submit_answer(session, correct), game.CORRECT)
+        self.assertEqual(game.submit_answer(stale, correct), game.STALE)
+        self.assertEqual(self.active_session().current_level, 2)
+
+        # A stale wrong answer can't end the game either
+        self.assertEqual(game.submit_answer(stale, self.wrong_option(stale)), game.STALE)
+        self.assertEqual(self.active_session().current_level, 2)
+
+    def test_lifeline_spent_once_under_race(self):
+        session = self.start()
+        stale = GameSession.objects.get(pk=session.pk)
+        self.assertIsNotNone(game.use_lifeline(session, 'fifty_fifty'))
+        self.assertIsNone(game.use_lifeline(stale, 'fifty_fifty'))
+
+    def test_one_active_session_per_user(self):
+        session = self.start()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            GameSession.objects.create(user=self.user, current_question=session.current_question)
+
+    def test_skip_uses_deck_alternate(self):
+        session = self.start()
+        _, alternate = question_pool.deck_entry(session.deck, 1)
+        self.client.post(reverse('lifeline', args=['skip']))
+        self.assertEqual(self.active_session().current_question_id, alternate)
+
+    def test_leaderboard_and_rank_follow_personal_best(self):
+        self.finish_game(wrong_at=7)
+        self.finish_game(wrong_at=2)
+        self.assertEqual(self.user.stats.best_score, 10000)
+        self.assertEqual(ranks.rank_for_user(self.user), 1)
+
+        rival = User.objects.create_user('rival', password='kbc-pass-123')
+        self.client.force_login(rival)
+        self.user = rival
+        with self.captureOnCommitCallbacks(execute=True):
+            self.finish_game()
+
+        self.assertEqual(ranks.rank_for_score(10000), 2)
+        response = self.client.get(reverse('leaderboard'))
+        self.assertEqual(
+            [e['user__username'] for e in response.context['top_sessions']],
+            ['rival', 'player']
+        )
+
+    def test_first_player_on_a_score_survives_a_concurrent_insert(self):
+        # A missing bucket that another request adds between our UPDATE and INSERT
+        ScoreBucket.objects.update_or_create(score=PRIZE_LADDER[3], defaults={'players': 5})
+        bump    = ranks._bump
+        results = iter([lambda score: 0, bump])
+        with patch.object(ranks, '_bump', side_effect=lambda score: next(results)(score)):
+            ranks.record_best_change(None, PRIZE_LADDER[3])
+        self.assertEqual(ScoreBucket.objects.get(score=PRIZE_LADDER[3]).players, 6)
+
+    def test_stats_count_every_finished_game(self):
+        self.finish_game(wrong_at=7)
+        self.finish_game()
+        self.start()
+        self.client.get(reverse('start_game'))   # abandons the game above
+        self.client.post(reverse('quit_game'))
+
+        stats = UserStats.objects.get(user=self.user)
+        self.assertEqual(
+            (stats.games_played, stats.wins, stats.losses, stats.quits),
+            (4, 1, 1, 2)
+        )
+        self.assertEqual(stats.total_winnings, 10000 + 10000000)
+
+        expected = {(s.user_id, s.games_played, s.wins, s.losses, s.quits, s.total_winnings)
+                    for s in UserStats.objects.all()}
+        leaderboard.rebuild()
+        self.assertEqual(
+            {(s.user_id, s.games_played, s.wins, s.losses, s.quits, s.total_winnings)
+             for s in UserStats.objects.all()},
+            expected
+        )
+
+    def test_audience_poll_stays_with_its_question(self):
+        session = self.start()
+        self.client.post(reverse('lifeline', args=['audience_poll']))
+        poll = self.client.get(reverse('play')).context['audience_poll']
+        self.assertEqual(list(poll), ['A', 'B', 'C', 'D'])
+        self.assertEqual(sum(poll.values()), 100)
+        # Still there on reload, gone once the question changes
+        self.assertEqual(self.client.get(reverse('play')).context['audience_poll'], poll)
+        self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+        self.assertIsNone(self.client.get(reverse('play')).context['audience_poll'])
+
+    def test_partial_lifelines_return_only_the_delta(self):
+        session = self.start()
+        url = lambda lifeline: reverse('lifeline_partial', args=[lifeline])
+        as_json = {'HTTP_ACCEPT': 'application/json'}
+
+        data = self.client.post(url('fifty_fifty'), **as_json).json()
+        self.assertEqual(set(data), {'result', 'lifeline', 'eliminated'})
+        self.assertEqual(data['eliminated'], self.active_session().eliminated_options.split(','))
+        self.assertNotIn(session.current_question.correct_option, data['eliminated'])
+
+        data = self.client.post(url('audience_poll'), **as_json).json()
+        self.assertEqual(data['poll'], self.client.get(reverse('play')).context['audience_poll'])
+
+        data = self.client.post(url('skip'), **as_json).json()
+        session = self.active_session()
+        self.assertEqual(data['question'], game.question_payload(session.current_question))
+        self.assertEqual((data['eliminated'], data['poll']), ([], None))
+
+        self.assertEqual(self.client.post(url('skip'), **as_json).status_code, 409)
+        self.assertEqual(self.client.post(url('nope'), **as_json).status_code, 404)
+
+    def test_partial_lifeline_html_fragment(self):
+        self.start()
+        response = self.client.post(reverse('lifeline_partial', args=['fifty_fifty']))
+        html = response.content.decode()
+        self.assertIn('id="answer-options"', html)
+        self.assertEqual(html.count('rounded-3 eliminated'), 2)
+        self.assertNotIn('id="question-text"', html)
+        self.assertNotIn('<html', html)
+
+        html = self.client.post(reverse('lifeline_partial', args=['skip'])).content.decode()
+        for part in ('question-text', 'answer-options', 'audience-poll'):
+            self.assertIn(f'id="{part}"', html)
+
+    def test_game_pages_do_not_write_the_session(self):
+        session = self.start()
+        with CaptureQueriesContext(connection) as ctx:
+            for lifeline in game.LIFELINE_FIELDS:
+                self.client.post(reverse('lifeline', args=[lifeline]))
+                session = self.active_session()
+                self.client.get(reverse('play'))
+            self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+            self.client.get(reverse('play'))
+        writes = [
+            q['sql'] for q in ctx.captured_queries
+            if 'django_session' in q['sql'] and not q['sql'].startswith('SELECT')
+        ]
+        self.assertEqual(writes, [])
+
+    def test_late_answer_times_out(self):
+        session = self.play_to_level(7)
+        late    = (game.QUESTION_SECONDS + game.ANSWER_GRACE) * 1000 + 1
+        with patch.object(game, 'elapsed_ms', return_value=late):
+            self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+        session = GameSession.objects.get(pk=session.pk)
+        self.assertEqual((session.status, session.score), ('lost', game.get_safe_score(7)))
+
+    def test_resumed_game_keeps_its_clock(self):
+        self.start()
+        with patch.object(game, 'elapsed_ms', return_value=22_500):
+            response = self.client.get(reverse('play'))
+            state    = self.client.get(reverse('api_state')).json()['state']
+        self.assertEqual(response.context['seconds_left'], 8)
+        self.assertContains(response, 'data-seconds-left="8"')
+        self.assertEqual(state['seconds_left'], 8)
+
+    def test_no_lifelines_once_time_is_up(self):
+        session = self.start()
+        late    = (game.QUESTION_SECONDS + game.ANSWER_GRACE) * 1000 + 1
+        with patch.object(game, 'elapsed_ms', return_value=late):
+            self.assertIsNone(game.use_lifeline(session, 'fifty_fifty'))
+            response = self.client.post(reverse('lifeline_partial', args=['fifty_fifty']),
+                                        HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(self.active_session().lifeline_5050)
+
+    def test_reaper_closes_abandoned_games(self):
+        session = self.play_to_level(12)
+        other   = User.objects.create_user('idler', password='kbc-pass-123')
+        game.start_game(other)
+
+        # Nothing has been idle for QUIZ_IDLE_GAME_SECONDS yet
+        self.assertEqual(reaper.reap(), 0)
+
+        later = timezone.now() + timedelta(seconds=reaper.IDLE_SECONDS + 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(reaper.reap(batch_size=1, now=later), 2)
+
+        session = GameSession.objects.get(pk=session.pk)
+        self.assertEqual(
+            (session.status, session.current_level, session.score, session.ended_at),
+            ('lost', 12, game.get_safe_score(12), later),
+        )
+        self.assertEqual(UserStats.objects.get(user=self.user).losses, 1)
+        self.assertEqual(GameSession.objects.get(user=other).score, 0)
+        self.assertIsNone(game.get_active_session(self.user))
+        self.assertEqual(reaper.reap(now=later), 0)
+
+    def test_reaper_payout_matches_safe_score(self):
+        session = self.start()
+        for level in range(1, 16):
+            GameSession.objects.filter(pk=session.pk).update(current_level=level)
+            payout = GameSession.objects.filter(pk=session.pk).values_list(reaper.safe_score(), flat=True).get()
+            self.assertEqual(payout, game.get_safe_score(level))
+
+    def test_answers_and_lifelines_are_logged(self):
+        session = self.start()
+        self.client.post(reverse('lifeline', args=['fifty_fifty']))
+        self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+        session = self.active_session()
+        self.client.post(reverse('answer'), {'answer': self.wrong_option(session)})
+        events.flush()
+
+        log = list(AnswerEvent.objects.filter(session=session).order_by('id'))
+        self.assertEqual([e.kind for e in log], ['fifty_fifty', 'answer', 'answer'])
+        self.assertEqual([e.level for e in log], [1, 1, 2])
+        self.assertEqual([e.correct for e in log], [None, True, False])
+        self.assertEqual(log[2].question_id, session.current_question_id)
+        self.assertEqual(log[2].lifelines_used, 'fifty_fifty')
+        self.assertTrue(all(e.elapsed_ms is not None for e in log))
+
+    @patch.object(events, 'FLUSH_SECONDS', 3600)
+    def test_events_are_written_in_batches(self):
+        session = self.start()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+        self.assertNotIn('quiz_answerevent', ' '.join(q['sql'] for q in ctx.captured_queries))
+        self.assertEqual(events.pending(), 1)
+
+        session = self.active_session()
+        with patch.object(events, 'BATCH_SIZE', 2), CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+        inserts = [q for q in ctx.captured_queries if 'INSERT INTO "quiz_answerevent"' in q['sql']]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(AnswerEvent.objects.count(), 2)
+
+    def test_rejected_events_are_dropped_alone(self):
+        session = self.start()
+        for level in (1, 2, 3):
+            events.record(session_id=session.pk, question_id=None, level=level, kind='answer')
+
+        def save(event, **kwargs):
+            if event.level == 2:
+                raise IntegrityError('gone')
+            return original(event, **kwargs)
+
+        original = AnswerEvent.save
+        with patch.object(AnswerEvent.objects, 'bulk_create', side_effect=IntegrityError('gone')), \
+             patch.object(AnswerEvent, 'save', autospec=True, side_effect=save):
+            self.assertEqual(events.flush(), 2)
+        self.assertEqual(events.pending(), 0)
+        self.assertEqual(sorted(AnswerEvent.objects.values_list('level', flat=True)), [1, 3])
+
+    def test_events_are_requeued_while_the_database_is_unavailable(self):
+        session = self.start()
+        events.record(session_id=session.pk, question_id=None, level=1, kind='answer')
+        with patch.object(AnswerEvent.objects, 'bulk_create', side_effect=OperationalError('database is locked')):
+            self.assertEqual(events.flush(), 0)
+        self.assertEqual(events.pending(), 1)
+        self.assertEqual(events.flush(), 1)
+
+    def test_skipped_level_records_both_questions(self):
+        session = self.play_to_level(2)
+        primary, alternate = question_pool.deck_entry(session.deck, 2)
+        self.client.post(reverse('lifeline', args=['skip']))
+        session = self.active_session()
+        self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+        session = self.active_session()
+        self.client.post(reverse('answer'), {'answer': self.wrong_option(session)})
+
+        finished = GameSession.objects.get(pk=session.pk)
+        self.assertEqual(finished.skipped_level, 2)
+        served = seen_questions.served_questions(finished)
+        self.assertEqual(sorted(served[2]), sorted([primary, alternate]))
+        self.assertEqual(served[3], [session.current_question_id])
+
+    def test_fallback_question_is_recorded_as_served(self):
+        session = self.start()
+        drawn, _ = question_pool.deck_entry(session.deck, 2)
+        Question.objects.filter(pk=drawn).delete()
+        self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+        session = self.active_session()
+        served_at_2 = session.current_question_id
+        self.assertNotEqual(served_at_2, drawn)
+        self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+        session = self.active_session()
+        self.client.post(reverse('answer'), {'answer': self.wrong_option(session)})
+
+        served = seen_questions.served_questions(GameSession.objects.get(pk=session.pk))
+        self.assertEqual(served[2], [served_at_2])
+
+    def test_new_games_avoid_seen_questions(self):
+        # Two questions per level: after one game, the next starts on the other
+        first = self.finish_game(wrong_at=3)
+        served = seen_questions.served_questions(first)
+        self.assertEqual(sorted(served), [1, 2, 3])
+
+        second = self.start()
+        for level in (1, 2):
+            primary, _ = question_pool.deck_entry(second.deck, level)
+            self.assertNotIn(primary, served[level])
+
+        # Every level 1 question seen: the level starts over instead of running dry
+        self.client.post(reverse('answer'), {'answer': self.wrong_option(second)})
+        self.assertEqual(len(seen_questions.load(self.user.pk).get(1)), 1)
+        self.assertIsNotNone(self.start().current_question)
+
+    def test_pick_avoids_seen_in_large_pool(self):
+        ids = array('q', range(1, 10001))
+        seen = array('I', range(1, 10001, 2))
+        picks = {question_pool._pick_avoiding(ids, seen, {2, 4}) for _ in range(200)}
+        self.assertTrue(picks and all(pk % 2 == 0 and pk > 4 for pk in picks))
+        self.assertIsNone(question_pool._pick_avoiding(ids, array('I', ids)))
+
+    def test_seen_set_round_trip(self):
+        seen = seen_questions.SeenSet()
+        seen.add(3, [30, 10, 20])
+        seen.add(15, [2 ** 33])
+        restored = seen_questions.SeenSet.from_bytes(seen.to_bytes())
+        self.assertEqual(list(restored.get(3)), [10, 20, 30])
+        self.assertEqual(list(restored.get(15)), [2 ** 33])
+        self.assertEqual(len(restored), 4)
+
+
+# ============================================================
+# JSON API
+# ============================================================
+
+class GameApiTests(QuizTestCase):
+
+    def test_correct_answer_returns_next_turn(self):
+        session = self.start()
+        response = self.client.post(
+            reverse('api_answer'), {'answer': session.current_question.correct_option}
+        )
+        data = response.json()
+        self.assertEqual(data['result'], 'correct')
+        self.assertEqual(data['state']['level'], 2)
+        self.assertEqual(data['state']['prize'], 2000)
+        self.assertEqual(data['state']['question']['text'], self.active_session().current_question.text)
+        self.assertNotIn('correct_option', data['state']['question'])
+
+    def test_wrong_answer_ends_game(self):
+        session = self.start()
+        response = self.client.post(reverse('api_answer'), {'answer': self.wrong_option(session)})
+        data = response.json()
+        self.assertEqual(data['result'], 'lost')
+        self.assertEqual(data['correct_option'], session.current_question.correct_option)
+        self.assertEqual(data['result_url'], reverse('result'))
+        self.assertIsNone(data['state']['question'])
+
+    def test_lifelines_once_each(self):
+        self.client.post(reverse('api_start'))
+        data = self.client.post(reverse('api_lifeline', args=['audience_poll'])).json()
+        self.assertEqual(sum(data['poll'].values()), 100)
+        self.assertFalse(data['state']['lifelines']['audience_poll'])
+
+        data = self.client.post(reverse('api_lifeline', args=['fifty_fifty'])).json()
+        self.assertEqual(len(data['state']['eliminated']), 2)
+
+        response = self.client.post(reverse('api_lifeline', args=['fifty_fifty']))
+        self.assertEqual(response.status_code, 409)
+
+    def test_quit_and_auth(self):
+        self.client.post(reverse('api_start'))
+        self.assertEqual(self.client.post(reverse('api_quit')).json()['result'], 'quit')
+        self.assertEqual(self.client.get(reverse('api_state')).status_code, 404)
+
+        self.client.logout()
+        self.assertEqual(self.client.post(reverse('api_answer'), {'answer': 'A'}).status_code, 401)
+
+
+# ============================================================
+# ASYNC VIEWS
+# ============================================================
+
+class AsyncViewTests(GameFlowTests):
+    """Re-run the game flow with QUIZ_ASYNC_VIEWS routing."""
+
+    def setUp(self):
+        super().setUp()
+        override = override_settings(QUIZ_ASYNC_VIEWS=True)
+        override.enable()
+        self.addCleanup(self.reload_urls)
+        self.addCleanup(override.disable)
+        self.reload_urls()
+
+    @staticmethod
+    def reload_urls():
+        from KBC import urls as project_urls
+        from .   import urls as quiz_urls
+        importlib.reload(quiz_urls)
+        importlib.reload(project_urls)
+        clear_url_caches()
+
+    def test_routes_are_async(self):
+        for name in ('play', 'answer', 'leaderboard'):
+            self.assertIs(resolve(reverse(name)).func, getattr(async_views, f'{name}_view'))
+
+
+class GameStateStoreTests(GameFlowTests):
+    """Re-run the game flow with active state in the write-behind cache."""
+
+    def setUp(self):
+        super().setUp()
+        override = override_settings(QUIZ_GAME_STATE_STORE='cache')
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_turns_are_written_back_at_safe_havens(self):
+        self.play_to_level(3)
+        self.assertEqual(self.stored_level(), 1)
+
+        self.play_to_level(6)
+        self.assertEqual(self.stored_level(), 6)
+
+    def test_correct_answer_skips_the_database_write(self):
+        session = self.start()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+        self.assertFalse([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')])
+        self.assertEqual(self.active_session().current_level, 2)
+
+    def test_lost_cache_resumes_from_last_checkpoint(self):
+        self.play_to_level(8)
+        cache.clear()
+
+        session = self.active_session()
+        self.assertEqual(session.current_level, 6)
+        self.client.post(reverse('answer'), {'answer': session.current_question.correct_option})
+        self.assertEqual(self.active_session().current_level, 7)
+
+    def test_flush_command(self):
+        self.play_to_level(3)
+        call_command('flush_game_states', stdout=io.StringIO())
+        self.assertEqual(self.stored_level(), 3)
+
+
+# ============================================================
+# IMPORT / EXPORT
+# ============================================================
+
+class QuestionImportTests(QuizTestCase):
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write(content)
+        return path
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_reseed_keeps_live_games(self):
+        session = self.start()
+        ids = set(Question.objects.values_list('id', flat=True))
+
+        call_command('seed_questions', stdout=io.StringIO())
+
+        self.assertEqual(set(Question.objects.values_list('id', flat=True)), ids)
+        self.assertEqual(self.active_session().current_question_id, session.current_question_id)
+
+    def test_import_upserts_by_content(self):
+        path = self.write('bank.csv', (
+            'text,option_a,option_b,option_c,option_d,correct_option,difficulty,level\n'
+            '"Largest ocean?",Atlantic,Indian,Pacific,Arctic,C,,4\n'
+            '"Broken row",a,b,c,d,E,,1\n'
+        ))
+        call_command('import_questions', path, '--chunk-size', '1', stdout=io.StringIO(), stderr=io.StringIO())
+        question = Question.objects.get(text='Largest ocean?')
+        self.assertEqual((question.level, question.difficulty), (4, 'easy'))
+
+        # Same content, whitespace and case aside, with a new level: updated in place
+        path = self.write('fix.jsonl', json.dumps({
+            'text': ' largest  ocean? ', 'option_a': 'Atlantic', 'option_b': 'Indian',
+            'option_c': 'Pacific', 'option_d': 'Arctic', 'correct_option': 'c', 'level': 9,
+        }) + '\n')
+        out = io.StringIO()
+        call_command('import_questions', path, stdout=out)
+        self.assertIn('0 new', out.getvalue())
+        question.refresh_from_db()
+        self.assertEqual((question.level, question.difficulty), (9, 'medium'))
+
+    def test_export_round_trip(self):
+        count = Question.objects.count()
+        for name in ('bank.csv', 'bank.jsonl'):
+            path = os.path.join(self.tmp.name, name)
+            call_command('export_questions', path, stdout=io.StringIO())
+            out = io.StringIO()
+            call_command('import_questions', path, stdout=out)
+            self.assertIn(f'Imported {count} rows: 0 new', out.getvalue())
+        self.assertEqual(Question.objects.count(), count)
+
+    def test_admin_edit_that_duplicates_a_question_is_rejected(self):
+        original, edited = Question.objects.filter(level=1)[:2]
+        admin = User.objects.create_superuser('admin', password='kbc-pass-123')
+        self.client.force_login(admin)
+        fields = ('text', 'level', 'difficulty', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_option')
+        response = self.client.post(
+            reverse('admin:quiz_question_change', args=[edited.pk]),
+            {field: getattr(original, field) for field in fields},
+        )
+        self.assertContains(response, 'A question with this text and these options already exists.')
+        edited.refresh_from_db()
+        self.assertNotEqual(edited.text, original.text)
+
+
+class GenerateDataTests(QuizTestCase):
+
+    def test_generates_consistent_dataset(self):
+        call_command('generate_data', '--questions-per-level', '3', '--users', '20',
+                     '--sessions', '200', '--active', '5', '--batch-size', '64',
+                     '--seed', '3', stdout=io.StringIO())
+
+        synthetic = GameSession.objects.filter(user__username__startswith='synthuser')
+        self.assertEqual(synthetic.exclude(status='active').count(), 200)
+        self.assertEqual(synthetic.filter(status='active').count(), 5)
+        self.assertEqual(Question.objects.filter(text__startswith='[synth]').count(), 45)
+
+        # Scores follow the prize ladder rules and the leaderboard was rebuilt
+        self.assertFalse(synthetic.exclude(score__in=[0, 10000, 320000, 10000000, *PRIZE_LADDER.values()]).exists())
+        self.assertFalse(synthetic.filter(status='won').exclude(score=10000000).exists())
+        self.assertEqual(
+            UserStats.objects.filter(user__username__startswith='synthuser').aggregate(n=Sum('games_played'))['n'],
+            200
+        )
+
+
+# ============================================================
+# REQUEST METRICS
+# ============================================================
+
+class MetricsTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def series(self, text, name, view):
+        prefix = f'{name}{{view="{view}"}} '
+        return float(next(line for line in text.splitlines() if line.startswith(prefix))[len(prefix):])
+
+    def test_views_are_measured(self):
+        self.start()
+        self.client.get(reverse('play'))
+        self.client.get(reverse('play'))
+
+        self.user.is_staff = True
+        self.user.save()
+        text = self.client.get(reverse('metrics')).content.decode()
+
+        self.assertIn('quiz_requests_total{view="play",status="200"} 2', text)
+        self.assertIn('quiz_requests_total{view="start_game",status="302"} 1', text)
+        self.assertEqual(self.series(text, 'quiz_request_duration_seconds_count', 'play'), 2)
+        self.assertGreater(self.series(text, 'quiz_request_queries_sum', 'play'), 0)
+        self.assertGreater(self.series(text, 'quiz_request_sql_seconds_sum', 'play'), 0)
+        self.assertGreater(self.series(text, 'quiz_request_template_seconds_sum', 'play'), 0)
+        self.assertGreater(self.series(text, 'quiz_response_bytes_sum', 'play'), 1000)
+        self.assertIn('quiz_request_queries_bucket{view="play",le="+Inf"} 2', text)
+
+    def test_endpoint_needs_staff_or_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        with self.settings(QUIZ_METRICS_TOKEN='s3cret'):
+            self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer nope').status_code, 403)
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+    def test_slow_requests_are_logged_with_sql(self):
+        self.start()
+        with patch.object(metrics, 'SLOW_MS', 0), self.assertLogs('quiz.metrics', 'WARNING') as logs:
+            self.client.get(reverse('play'))
+        self.assertIn('(play)', logs.output[0])
+        self.assertIn('quiz_gamesession', logs.output[0])
+
+
+# ============================================================
+# SQLITE TUNING
+# ============================================================
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite only')
+class SqliteTuningTests(QuizTestCase):
+
+    def connect(self):
+        """A second connection to the test database, opened now."""
+        other = connections.create_connection('default')
+        self.addCleanup(other.close)
+        other.ensure_connection()
+        return other
+
+    def pragma(self, conn, name):
+        with conn.cursor() as cursor:
+            return cursor.execute(f'PRAGMA {name}').fetchone()[0]
+
+    def test_profile_is_opt_in(self):
+        self.assertEqual(self.pragma(self.connect(), 'synchronous'), 2)   # FULL
+
+    def test_profile_applies_on_connect(self):
+        with patch.object(sqlite_tuning, 'ENABLED', True):
+            other = self.connect()
+        self.assertEqual(self.pragma(other, 'synchronous'), 1)   # NORMAL
+        self.assertEqual(self.pragma(other, 'cache_size'), -64 * 1024)
+        self.assertEqual(self.pragma(other, 'busy_timeout'), dict(sqlite_tuning.PRAGMAS)['busy_timeout'])
+
+
+# ============================================================
+# SERVERLESS ENTRY POINT
+# ============================================================
+
+class ColdStartTests(TestCase):
+
+    def test_serverless_entry_serves_first_request(self):
+        out = io.StringIO()
+        call_command('bench_coldstart', runs=1, only='serverless', stdout=out)
+        self.assertIn('serverless', out.getvalue())
+
+    def test_budget_is_enforced(self):
+        with self.assertRaises(CommandError):
+            call_command('bench_coldstart', runs=1, only='serverless', max_ms=1, stdout=io.StringIO())
+
+
+# ============================================================
+# QUESTION SNAPSHOT
+# ============================================================
+
+class QuestionSnapshotTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp  = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, 'questions.bin')
+        self.addCleanup(tmp.cleanup)
+        for name, value in (('PATH', path), ('_current', None), ('_requested', 0), ('_built', 0)):
+            patcher = patch.object(question_snapshot, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        call_command('build_question_snapshot', stdout=io.StringIO())
+
+    def test_matches_the_database(self):
+        snapshot = question_snapshot.current()
+        for level in range(1, 16):
+            ids = list(Question.objects.filter(level=level).order_by('id').values_list('id', flat=True))
+            self.assertEqual(list(snapshot.level_ids(level)), ids)
+        for stored in Question.objects.all():
+            question = snapshot.question(stored.pk)
+            for field in ('text', 'option_a', 'option_b', 'option_c', 'option_d',
+                          'correct_option', 'level', 'difficulty'):
+                self.assertEqual(getattr(question, field), getattr(stored, field))
+            # Anything else is loaded on demand
+            self.assertEqual(question.content_hash, stored.content_hash)
+        self.assertIsNone(snapshot.question(-1))
+
+    def test_questions_come_from_the_snapshot(self):
+        session = self.start()
+        with CaptureQueriesContext(connection) as ctx:
+            question = question_pool.get_question(session.current_question_id)
+            question_pool.pick_question(5)
+        self.assertEqual(question.pk, session.current_question_id)
+        self.assertFalse([q for q in ctx.captured_queries if 'quiz_question' in q['sql']])
+
+    @patch.object(question_snapshot, '_start')
+    def test_question_change_marks_stale_and_rebuilds_in_the_background(self, start):
+        question = Question.objects.filter(level=1).first()
+        question.text = 'Which planet is known as the Red Planet, revised?'
+        with self.captureOnCommitCallbacks(execute=True), \
+             patch.object(question_snapshot, 'build', wraps=question_snapshot.build) as build:
+            question.save()
+            question_pool.invalidate()   # A second change in the same transaction
+        build.assert_not_called()
+        start.assert_called()
+
+        # Stale: served from the database until the rebuilder thread has run
+        self.assertIsNone(question_snapshot.current())
+        self.assertEqual(question_pool.get_question(question.pk).text, question.text)
+
+        self.assertTrue(question_snapshot.rebuild())   # What the thread does
+        self.assertEqual(question_snapshot.current().question(question.pk).text, question.text)
+
+    def test_falls_back_to_the_database_without_a_file(self):
+        os.unlink(question_snapshot.PATH)
+        question_snapshot._recheck()
+        self.assertIsNone(question_snapshot.current())
+        self.assertTrue(question_pool.get_level_ids(1))
+
+
+# ============================================================
+# LIVE FASTEST FINGER FIRST
+# ============================================================
+
+class Socket:
+    """In-memory WebSocket client for quiz/live.py: no server, no network."""
+
+    def __init__(self, path, cookie=None, origin=None):
+        headers = [(b'cookie', cookie.encode())] if cookie else []
+        if origin:
+            headers.append((b'origin', origin.encode()))
+        self.scope    = {'type': 'websocket', 'path': path, 'headers': headers}
+        self.to_app   = asyncio.Queue()
+        self.from_app = asyncio.Queue()
+
+    async def connect(self):
+        """Open the connection; returns the accept or close message."""
+        self.task = asyncio.create_task(live.application(self.scope, self.to_app.get, self.from_app.put))
+        await self.to_app.put({'type': 'websocket.connect'})
+        return await asyncio.wait_for(self.from_app.get(), 5)
+
+    async def receive(self, kind):
+        """The next JSON message of this kind, skipping others."""
+        while True:
+            message = await asyncio.wait_for(self.from_app.get(), 5)
+            data = json.loads(message['text'])
+            if data['type'] == kind:
+                return data
+
+    async def answer(self, round, option):
+        await self.to_app.put({'type': 'websocket.receive', 'text': json.dumps(
+            {'type': 'answer', 'round': round, 'option': option}
+        )})
+
+    async def close(self):
+        await self.to_app.put({'type': 'websocket.disconnect', 'code': 1000})
+        await self.task
+
+
+@patch.multiple(live, ANSWER_SECONDS=5, BREAK_SECONDS=0, MIN_PLAYERS=2)
+class LiveRoomTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.rival = User.objects.create_user('rival', password='kbc-pass-123')
+        rival_client = self.client_class()
+        rival_client.force_login(self.rival)
+        self.cookies = [
+            f"sessionid={c.cookies['sessionid'].value}" for c in (self.client, rival_client)
+        ]
+
+    async def test_fastest_correct_answer_takes_the_hot_seat(self):
+        me, rival = [Socket('/ws/fff/main/', cookie) for cookie in self.cookies]
+        for socket in (me, rival):
+            self.assertEqual((await socket.connect())['type'], 'websocket.accept')
+
+        # One question, the same for everyone
+        asked = await me.receive('question')
+        self.assertEqual(await rival.receive('question'), asked)
+        self.assertNotIn('correct_option', asked['question'])
+        question = await Question.objects.aget(text=asked['question']['text'])
+        wrong    = next(o for o in 'ABCD' if o != question.correct_option)
+
+        await rival.answer(asked['round'], wrong)
+        await me.answer(asked['round'], question.correct_option)
+        await me.answer(asked['round'], wrong)   # Only the first answer counts
+
+        result = await rival.receive('result')
+        self.assertEqual((result['winner'], result['answers']), ('player', 2))
+        self.assertEqual(result['correct_option'], question.correct_option)
+        self.assertEqual((await me.receive('hot_seat'))['url'], reverse('play'))
+
+        room = live._rooms['main']
+        for socket in (me, rival):
+            await socket.close()
+        await room.task
+
+        saved = await FastestFingerRound.objects.filter(room='main').order_by('started_at').afirst()
+        self.assertEqual(saved.winner_id, self.user.pk)
+        answers = {a.user_id: a async for a in saved.answers.all()}
+        self.assertEqual((answers[self.user.pk].correct, answers[self.rival.pk].correct), (True, False))
+        self.assertTrue(await GameSession.objects.filter(user=self.user, status='active').aexists())
+
+    async def test_winner_with_a_game_in_progress_keeps_it(self):
+        playing = await sync_to_async(game.start_game)(self.user)
+        me, rival = [Socket('/ws/fff/main/', cookie) for cookie in self.cookies]
+        for socket in (me, rival):
+            await socket.connect()
+
+        asked    = await me.receive('question')
+        question = await Question.objects.aget(text=asked['question']['text'])
+        await me.answer(asked['round'], question.correct_option)
+        await rival.answer(asked['round'], next(o for o in 'ABCD' if o != question.correct_option))
+        self.assertEqual((await me.receive('hot_seat_busy'))['url'], reverse('play'))
+
+        room = live._rooms['main']
+        for socket in (me, rival):
+            await socket.close()
+        await room.task
+        active = [pk async for pk in GameSession.objects.filter(user=self.user, status='active').values_list('pk', flat=True)]
+        self.assertEqual(active, [playing.pk])
+
+    def test_room_page(self):
+        response = self.client.get(reverse('live', args=['main']))
+        self.assertContains(response, 'data-ws-path="/ws/fff/main/"')
+
+    async def test_connections_are_checked(self):
+        closed = {'type': 'websocket.close', 'code': live.CLOSE_FORBIDDEN}
+        self.assertEqual(await Socket('/ws/fff/main/').connect(), closed)
+        self.assertEqual(
+            await Socket('/ws/fff/main/', self.cookies[0], origin='https://evil.example').connect(), closed
+        )
+        self.assertEqual(
+            (await Socket('/ws/fff/../', self.cookies[0]).connect())['code'], live.CLOSE_NOT_FOUND
+        )
+
+    async def test_broadcast_serializes_once_and_drops_laggards(self):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        room    = live.Room('bench')
+        players = [live.Player(self.user, send) for _ in range(3)]
+        room.players.update(players)
+        slow = players[0]
+        slow.sender.cancel()
+        for _ in range(live.QUEUE_SIZE):
+            slow.push('{}')
+
+        with patch.object(json, 'dumps', wraps=json.dumps) as dumps:
+            frame = room.broadcast({'type': 'question'})
+        self.assertEqual(dumps.call_count, 1)
+        self.assertEqual(room.players, set(players[1:]))
+
+        await asyncio.sleep(0.05)
+        self.assertEqual([m['text'] for m in sent if 'text' in m], [frame, frame])
+        self.assertIn({'type': 'websocket.close', 'code': live.CLOSE_LAGGING}, sent)
+        for player in players:
+            player.sender.cancel()
+
+
+# ============================================================
+# TOURNAMENTS
+# ============================================================
+
+class TournamentTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.tournament = Tournament.objects.create(
+            name='Cup', starts_at=now - timedelta(hours=1), ends_at=now + timedelta(hours=1),
+        )
+
+    def enter(self, client=None):
+        return (client or self.client).post(reverse('enter_tournament', args=[self.tournament.pk]))
+
+    def field(self, results, tournament=None):
+        """Finished games for new players: one (score, seconds) per player."""
+        tournament = tournament or self.tournament
+        ids  = datagen.generate_users(len(results), f'cup{tournament.pk}', batch_size=500)
+        base = timezone.now() - timedelta(minutes=30)
+        GameSession.objects.bulk_create([
+            GameSession(
+                user_id=user_id, tournament=tournament, status='lost', current_level=3,
+                score=score, ended_at=base + timedelta(seconds=seconds),
+            )
+            for user_id, (score, seconds) in zip(ids, results)
+        ])
+        GameSession.objects.filter(tournament=tournament).update(started_at=base)
+        return ids
+
+    def test_players_share_one_deck(self):
+        other = self.client_class()
+        other.force_login(User.objects.create_user('rival', password='kbc-pass-123'))
+        self.assertRedirects(self.enter(), reverse('play'), fetch_redirect_response=False)
+        self.enter(other)
+
+        self.tournament.refresh_from_db()
+        games = GameSession.objects.filter(tournament=self.tournament)
+        self.assertEqual(games.count(), 2)
+        self.assertTrue(self.tournament.deck)
+        self.assertEqual({g.deck for g in games}, {self.tournament.deck})
+        self.assertEqual(len({g.current_question_id for g in games}), 1)
+
+    def test_one_game_per_tournament(self):
+        self.enter()
+        session = self.active_session()
+        self.client.post(reverse('answer'), {'answer': self.wrong_option(session)})
+
+        response = self.enter()
+        self.assertRedirects(response, reverse('tournament', args=[self.tournament.pk]), fetch_redirect_response=False)
+        self.assertEqual(GameSession.objects.filter(tournament=self.tournament).count(), 1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            GameSession.objects.create(user=self.user, tournament=self.tournament, status='quit')
+
+    def test_closed_to_entry_outside_its_window(self):
+        Tournament.objects.filter(pk=self.tournament.pk).update(starts_at=timezone.now() + timedelta(hours=1))
+        self.tournament.refresh_from_db()
+        self.assertIsNone(tournaments.enter(self.user, self.tournament))
+        self.assertFalse(GameSession.objects.filter(tournament=self.tournament).exists())
+
+    def test_close_ranks_the_field(self):
+        ids = self.field([(1000, 50), (5000, 90), (5000, 60), (0, 10), (0, 10)])
+        self.enter()
+        GameSession.objects.filter(user=self.user).update(current_level=7)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(tournaments.close(self.tournament), 6)
+
+        # Games still running end as a timeout would
+        session = GameSession.objects.get(user=self.user, tournament=self.tournament)
+        self.assertEqual((session.status, session.score), ('lost', game.get_safe_score(7)))
+
+        # Highest score first, then the quicker game; equal on both, equal rank
+        standings = list(TournamentStanding.objects.filter(tournament=self.tournament).order_by('position'))
+        self.assertEqual([s.position for s in standings], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(
+            [(s.user_id, s.score, s.rank) for s in standings[:4]],
+            [(self.user.pk, game.get_safe_score(7), 1), (ids[2], 5000, 2), (ids[1], 5000, 3), (ids[0], 1000, 4)],
+        )
+        self.assertEqual([s.duration_ms for s in standings[1:3]], [60_000, 90_000])
+        self.assertEqual([s.rank for s in standings[4:]], [5, 5])
+        self.assertEqual(Tournament.objects.get(pk=self.tournament.pk).participants, 6)
+
+        # Closing again rewrites the same standings
+        tournaments.close(self.tournament)
+        self.assertEqual(TournamentStanding.objects.filter(tournament=self.tournament).count(), 6)
+
+    def test_close_writes_standings_in_batches(self):
+        self.field([(random.choice(list(PRIZE_LADDER.values())), random.randint(1, 900)) for _ in range(25)])
+        # closing active games + ranked select + savepoint pair + delete
+        # + one INSERT per 10 standings + tournament update
+        self.assertMaxQueries(6 + 3, tournaments.close, self.tournament, batch_size=10)
+        self.assertEqual(self.tournament.participants, 25)
+
+    def test_close_due(self):
+        Tournament.objects.filter(pk=self.tournament.pk).update(ends_at=timezone.now() - timedelta(minutes=1))
+        call_command('close_tournaments', stdout=io.StringIO())
+        self.assertIsNotNone(Tournament.objects.get(pk=self.tournament.pk).closed_at)
+
+    def test_standings_page_cost_is_flat(self):
+        big = Tournament.objects.create(
+            name='Big Cup', starts_at=self.tournament.starts_at, ends_at=self.tournament.ends_at,
+        )
+        self.field([(1000, 60)] * 3)
+        self.field([(1000, seconds) for seconds in range(150)], tournament=big)
+        tournaments.close(self.tournament)
+        tournaments.close(big)
+
+        def queries(tournament, page=1):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse('tournament', args=[tournament.pk]), {'page': page})
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        small = queries(self.tournament)
+        self.assertEqual(queries(big, 3), small)
+        self.assertEqual(queries(big, 3), small - 1)   # Page now cached
+
+        response = self.client.get(reverse('tournament', args=[big.pk]), {'page': 3})
+        self.assertEqual(response.context['pages'], 3)
+        self.assertEqual([row['position'] for row in response.context['standings']], list(range(101, 151)))
+
+
+# ============================================================
+# CALIBRATION
+# ============================================================
+
+@skipUnless(calibration.np is not None, 'NumPy is not installed')
+class CalibrationTests(QuizTestCase):
+
+    def test_fit_orders_questions_by_observed_difficulty(self):
+        # Three level-1..3 questions whose real difficulty runs the other way
+        rng = random.Random(7)
+        questions = [
+            question_pool.pick_question(level) for level in (1, 2, 3)
+        ]
+        true_b = {questions[0].pk: 1.5, questions[1].pk: 0.0, questions[2].pk: -1.5}
+
+        log = []
+        for i in range(40):
+            ability = (i - 20) / 8
+            user    = User.objects.create_user(f'cal{i}')
+            session = GameSession.objects.create(user=user, status='lost')
+            for question in questions:
+                for _ in range(10):
+                    p = 1 / (1 + math.exp(-1.5 * (ability - true_b[question.pk])))
+                    log.append(AnswerEvent(
+                        session=session, question=question, level=question.level,
+                        correct=rng.random() < p,
+                    ))
+        AnswerEvent.objects.bulk_create(log)
+
+        # Two questions per query, so the three are loaded and saved in chunks
+        command = importlib.import_module('quiz.management.commands.calibrate_questions')
+        with patch.object(command, 'BATCH_SIZE', 2):
+            call_command('calibrate_questions', '--apply-levels', '--chunk-size', '500',
+                         '--min-answers', '100', stdout=io.StringIO())
+
+        fitted = {q.pk: q for q in Question.objects.filter(pk__in=true_b)}
+        b = [fitted[q.pk].calibrated_difficulty for q in questions]
+        self.assertGreater(b[0], b[1])
+        self.assertGreater(b[1], b[2])
+        self.assertTrue(all(q.calibration_answers == 400 for q in fitted.values()))
+        self.assertEqual([fitted[q.pk].level for q in questions], [3, 2, 1])
+        # Questions without enough answers are left alone
+        self.assertFalse(Question.objects.exclude(pk__in=true_b).filter(calibrated_at__isnull=False).exists())
+
+
+# ============================================================
+# QUERY BUDGETS
+# ============================================================
+
+class QueryBudgetTests(QuizTestCase):
+    """
+    Fixed query budget per route. Each request pays 2 queries for the
+    auth session and user; the rest is the view's own work.
+    """
+
+    def test_start(self):
+        self.start()
+        # old session lookup + close it (stats, histogram, seen set) +
+        # load the seen set + create, the create wrapped in a savepoint
+        # for the one-active constraint
+        self.assertMaxQueries(16, self.client.get, reverse('start_game'))
+
+    def test_play(self):
+        self.start()
+        self.assertMaxQueries(4, self.client.get, reverse('play'))
+
+    def test_answer_correct(self):
+        session = self.start()
+        self.assertMaxQueries(
+            6, self.client.post, reverse('answer'),
+            {'answer': session.current_question.correct_option}
+        )
+
+    def test_answer_wrong(self):
+        session = self.start()
+        self.assertMaxQueries(
+            13, self.client.post, reverse('answer'),
+            {'answer': self.wrong_option(session)}
+        )
+
+    def test_answer_timeout(self):
+        self.start()
+        self.assertMaxQueries(13, self.client.post, reverse('answer'), {'answer': 'TIMEOUT'})
+
+    def test_lifelines(self):
+        self.start()
+        for lifeline in game.LIFELINE_FIELDS:
+            with self.subTest(lifeline=lifeline):
+                self.assertMaxQueries(5, self.client.post, reverse('lifeline', args=[lifeline]))
+
+    def test_partial_lifelines(self):
+        # The lifeline alone: no redirect, no play page
+        self.start()
+        for lifeline in game.LIFELINE_FIELDS:
+            with self.subTest(lifeline=lifeline):
+                self.assertMaxQueries(
+                    5, self.client.post, reverse('lifeline_partial', args=[lifeline]),
+                    HTTP_ACCEPT='application/json'
+                )
+
+    def test_api_answer(self):
+        # Same as the HTML answer, but with no follow-up play request
+        session = self.start()
+        self.assertMaxQueries(
+            6, self.client.post, reverse('api_answer'),
+            {'answer': session.current_question.correct_option}
+        )
+
+    def test_quit(self):
+        self.start()
+        self.assertMaxQueries(12, self.client.post, reverse('quit_game'))
+
+    def test_result(self):
+        self.finish_game(wrong_at=3)
+        self.assertMaxQueries(5, self.client.get, reverse('result'))
+
+    def test_dashboard(self):
+        self.finish_game(wrong_at=3)
+        self.assertMaxQueries(6, self.client.get, reverse('dashboard'))
+
+    def test_admin_user_list(self):
+        self.finish_game(wrong_at=3)
+        for i in range(5):
+            User.objects.create_user(f'player{i}')
+        self.user.is_staff = self.user.is_superuser = True
+        self.user.save()
+        # auth + group filter + two counts + users joined to their stats,
+        # however many rows
+        self.assertMaxQueries(6, self.client.get, reverse('admin:auth_user_changelist'))
+
+    def test_leaderboard(self):
+        self.finish_game(wrong_at=3)
+        self.client.logout()
+        self.assertMaxQueries(1, self.client.get, reverse('leaderboard'))
+
+
+# ============================================================
+# QUERY PLANS
+# ============================================================
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN checks are SQLite-specific')
+class QueryPlanTests(QuizTestCase):
+    """
+    Hot queries must be index searches, never full table scans.
+    Runs the real helper, then EXPLAINs each SQL statement it issued.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.finish_game(wrong_at=3)
+        self.start()
+
+    def assertUsesIndexes(self, func, *args):
+        with CaptureQueriesContext(connection) as ctx:
+            func(*args)
+        self.assertTrue(ctx.captured_queries)
+        for query in ctx.captured_queries:
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                plan = '\n'.join(row[-1] for row in cursor.fetchall())
+            for line in plan.splitlines():
+                if line.startswith('SCAN'):
+                    self.assertIn('USING', line, f"Full table scan:\n{query['sql']}\n{plan}")
+        return plan
+
+    def test_get_active_session(self):
+        plan = self.assertUsesIndexes(game.get_active_session, self.user)
+        self.assertIn('session_user_status_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_leaderboard(self):
+        plan = self.assertUsesIndexes(lambda: list(leaderboard.top_players(10)))
+        self.assertIn('userstats_leaderboard_idx', plan)
+
+    def test_result_lookup(self):
+        self.assertUsesIndexes(game.get_last_finished_session, self.user)
+
+    def test_finished_by_score(self):
+        qs = GameSession.objects.filter(status='won').order_by('-score')
+        self.assertUsesIndexes(list, qs)
@@ -0,0 +1,158 @@
+# quiz/tournaments.py
+
+"""
+Scheduled tournaments.
+
+A tournament has a fixed window (starts_at to ends_at) and one deck,
+drawn once from the question pool, that every participant plays: the
+same 15 questions and skip alternates for everyone. Each player gets one
+game, an ordinary GameSession tagged with the tournament.
+
+Nothing is ranked while it runs. close() scores the whole field in bulk:
+games still in progress end as a timeout would (through the reaper's
+batched close), then a single windowed SELECT ranks every finished game
+(higher score, then the quicker game) and the standings are written with
+bulk_create, up to BATCH_SIZE rows per INSERT. Run it with
+`manage.py close_tournaments` (e.g. from cron) once tournaments end.
+
+The standings page reads a range of positions on the unique
+(tournament, position) index and caches each page until the tournament
+is closed again, so its cost doesn't grow with the number of players.
+"""
+
+from itertools import islice
+
+from django.conf        import settings
+from django.core.cache  import cache
+from django.db          import transaction
+from django.db.models   import DurationField, ExpressionWrapper, F, Window
+from django.db.models.functions import Rank, RowNumber
+from django.utils       import timezone
+
+from .models import GameSession, Tournament, TournamentStanding
+from .       import game, question_pool, reaper
+
+
+PAGE_SIZE     = 50
+CACHE_SECONDS = getattr(settings, 'QUIZ_STANDINGS_CACHE_SECONDS', 3600)
+BATCH_SIZE    = 1000
+
+# Best first: highest score, then quickest game, then earliest entry
+RANKING = [F('score').desc(), F('duration').asc()]
+ORDER   = [*RANKING, F('started_at').asc(), F('pk').asc()]
+
+STANDING_FIELDS = ('position', 'rank', 'user__username', 'score', 'level', 'status', 'duration_ms')
+
+
+# ============================================================
+# ENTRY
+# ============================================================
+
+def ensure_deck(tournament):
+    """The tournament's shared deck, drawn on first use."""
+    if not tournament.deck:
+        # Conditional, so racing first entrants all end up with one deck
+        Tournament.objects.filter(pk=tournament.pk, deck='').update(deck=question_pool.draw_deck())
+        tournament.refresh_from_db(fields=['deck'])
+    return tournament.deck
+
+
+def enter(user, tournament, now=None):
+    """
+    The user's game in the tournament, started on first entry.
+    None if they have already finished it, or it isn't open.
+    """
+    existing = GameSession.objects.filter(tournament=tournament, user=user).first()
+    if existing:
+        return existing if existing.status == 'active' else None
+    if not tournament.is_open(now):
+        return None
+    return game.start_game(user, deck=ensure_deck(tournament), tournament=tournament)
+
+
+# ============================================================
+# CLOSING
+# ============================================================
+
+def close(tournament, now=None, batch_size=BATCH_SIZE):
+    """
+    End the tournament's unfinished games and write its standings in
+    bulk. Safe to run again. Returns the number of participants.
+    """
+    now = now or timezone.now()
+    reaper.close_games(reaper.idle(now).filter(tournament=tournament), now, now, batch_size)
+
+    ranked = (
+        GameSession.objects
+        .filter(tournament=tournament).exclude(status='active')
+        .annotate(duration=ExpressionWrapper(F('ended_at') - F('started_at'), output_field=DurationField()))
+        .annotate(
+            rank     = Window(Rank(), order_by=RANKING),
+            position = Window(RowNumber(), order_by=ORDER),
+        )
+        .values_list('position', 'rank', 'user_id', 'score', 'current_level', 'status', 'duration')
+    )
+    standings = (
+        TournamentStanding(
+            tournament=tournament, position=position, rank=rank, user_id=user_id,
+            score=score, level=level, status=status,
+            duration_ms=max(int(duration.total_seconds() * 1000), 0),
+        )
+        for position, rank, user_id, score, level, status, duration in ranked.iterator(chunk_size=batch_size)
+    )
+
+    participants = 0
+    with transaction.atomic():
+        TournamentStanding.objects.filter(tournament=tournament).delete()
+        while batch := list(islice(standings, batch_size)):
+            TournamentStanding.objects.bulk_create(batch)
+            participants += len(batch)
+        Tournament.objects.filter(pk=tournament.pk).update(closed_at=now, participants=participants)
+    tournament.closed_at, tournament.participants = now, participants
+    return participants
+
+
+def close_due(now=None):
+    """Close every tournament that has ended. Returns them."""
+    now  = now or timezone.now()
+    done = list(Tournament.objects.filter(closed_at__isnull=True, ends_at__lte=now).order_by('ends_at'))
+    for tournament in done:
+        close(tournament, now)
+    return done
+
+
+# ============================================================
+# STANDINGS
+# ============================================================
+
+def page_count(tournament):
+    return max((tournament.participants + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+
+
+def standings_page(tournament, page=1):
+    """
+    One page of a closed tournament's standings, as dicts of
+    STANDING_FIELDS. Cached per close, so a re-close is never stale.
+    """
+    key  = f'quiz:standings:{tournament.pk}:{tournament.closed_at.timestamp():.6f}:{page}'
+    rows = cache.get(key)
+    if rows is None:
+        first = (page - 1) * PAGE_SIZE
+        rows  = list(
+            TournamentStanding.objects
+            .filter(tournament=tournament, position__gt=first, position__lte=first + PAGE_SIZE)
+            .order_by('position')
+            .values(*STANDING_FIELDS)
+        )
+        cache.set(key, rows, CACHE_SECONDS)
+    return rows
+
+
+def standing_of(tournament, user):
+    """The user's own row in the standings, or None."""
+    return (
+        TournamentStanding.objects
+        .filter(tournament=tournament, user=user)
+        .values(*STANDING_FIELDS)
+        .first()
+    )
@@ -1,7 +1,15 @@
 # quiz/urls.py
 
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, api
+
+# Under ASGI, serve the hot game routes from native async views
+# (imported only then, so WSGI processes never load them)
+if settings.QUIZ_ASYNC_VIEWS:
+    from . import async_views as game_views
+else:
+    game_views = views
 
 urlpatterns = [
 
@@ -15,7 +23,7 @@ urlpatterns = [
     ),
     path(
         'leaderboard/',
-        views.leaderboard_view,
+        game_views.leaderboard_view,
         name='leaderboard'
     ),
 
@@ -57,12 +65,12 @@ urlpatterns = [
     ),
     path(
         'game/play/',
-        views.play_view,
+        game_views.play_view,
         name='play'
     ),
     path(
         'game/answer/',
-        views.answer_view,
+        game_views.answer_view,
         name='answer'
     ),
     path(
@@ -81,8 +89,79 @@ urlpatterns = [
     # ─────────────────────────────
     path(
         'game/lifeline/<str:lifeline_type>/',
-        views.lifeline_view,
+        game_views.lifeline_view,
         name='lifeline'
     ),
+    path(
+        'game/lifeline/<str:lifeline_type>/partial/',
+        game_views.lifeline_partial_view,
+        name='lifeline_partial'
+    ),
+
+    # ─────────────────────────────
+    # JSON Game API
+    # ─────────────────────────────
+    path(
+        'api/game/start/',
+        api.start_view,
+        name='api_start'
+    ),
+    path(
+        'api/game/state/',
+        api.state_view,
+        name='api_state'
+    ),
+    path(
+        'api/game/answer/',
+        api.answer_view,
+        name='api_answer'
+    ),
+    path(
+        'api/game/lifeline/<str:lifeline_type>/',
+        api.lifeline_view,
+        name='api_lifeline'
+    ),
+    path(
+        'api/game/quit/',
+        api.quit_view,
+        name='api_quit'
+    ),
+
+    # ─────────────────────────────
+    # Tournaments
+    # ─────────────────────────────
+    path(
+        'tournaments/',
+        views.tournaments_view,
+        name='tournaments'
+    ),
+    path(
+        'tournaments/<int:pk>/',
+        views.tournament_view,
+        name='tournament'
+    ),
+    path(
+        'tournaments/<int:pk>/enter/',
+        views.enter_tournament_view,
+        name='enter_tournament'
+    ),
+
+    # ─────────────────────────────
+    # Live Fastest Finger First (WebSocket under KBC/asgi.py)
+    # ─────────────────────────────
+    path(
+        'live/<slug:room>/',
+        views.live_view,
+        name='live'
+    ),
+
+    # ─────────────────────────────
+    # Metrics (Prometheus)
+    # ─────────────────────────────
+    path(
+        'metrics',
+        views.metrics_view,
+        name='metrics'
+    ),
 
 ]
\ No newline at end of file
@@ -1,54 +1,21 @@
 # quiz/views.py
 
-import random
+import hmac
 from datetime import datetime
 
+from django.conf              import settings
+from django.http              import Http404, HttpResponse, HttpResponseForbidden, JsonResponse
+from django.views.decorators.http import require_POST
+
 from django.shortcuts         import render, redirect, get_object_or_404
 from django.contrib.auth      import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib           import messages
-from django.utils             import timezone
-from django.db.models         import Max
 
-from .models  import Question, GameSession, PRIZE_LADDER, SAFE_HAVENS
+from .models  import GameSession, Tournament, UserStats, PRIZE_LADDER, SAFE_HAVENS
 from .forms   import RegisterForm, LoginForm
-
-
-# ============================================================
-# HELPER FUNCTIONS
-# ============================================================
-
-def get_safe_score(level):
-    """
-    Return the safe haven score the player keeps
-    even if they lose — based on levels crossed.
-    """
-    safe = 0
-    for safe_level, amount in SAFE_HAVENS.items():
-        if level > safe_level:
-            safe = amount
-    return safe
-
-
-def get_active_session(user):
-    """Return the user's currently active game session, or None."""
-    return GameSession.objects.filter(user=user, status='active').first()
-
-
-def get_question_for_level(level, exclude_ids=None):
-    """
-    Fetch a random question matching the given level.
-    Optionally exclude already-seen question IDs.
-    """
-    qs = Question.objects.filter(level=level)
-    if exclude_ids:
-        qs = qs.exclude(id__in=exclude_ids)
-    if not qs.exists():
-        # Fallback: any question at this level
-        qs = Question.objects.filter(level=level)
-    if qs.exists():
-        return random.choice(list(qs))
-    return None
+from .        import game, leaderboard, ranks, metrics, api, tournaments
+from .game    import get_active_session, get_last_finished_session, get_current_question
 
 
 # ============================================================
@@ -101,10 +68,7 @@ def logout_view(request):
     # If there's an active session, mark it as quit
     session = get_active_session(request.user)
     if session:
-        session.status   = 'quit'
-        session.ended_at = timezone.now()
-        session.score    = get_safe_score(session.current_level)
-        session.save()
+        game.quit_game(session)
 
     logout(request)
     messages.info(request, "You have been logged out.")
@@ -121,21 +85,23 @@ def dashboard_view(request):
     User dashboard showing:
     - Play button
     - Past game sessions
-    - Personal best score
+    - Personal best, lifetime totals and global rank
     """
     sessions = GameSession.objects.filter(
         user=request.user
     ).exclude(status='active').order_by('-started_at')[:5]
 
-    best = GameSession.objects.filter(
-        user=request.user
-    ).aggregate(best=Max('score'))['best'] or 0
+    # Lifetime totals from the materialized stats; rank from the histogram
+    stats = UserStats.objects.filter(user=request.user).first() or UserStats(user=request.user)
+    rank  = ranks.rank_for_score(stats.best_score) if stats.games_played else None
 
     active_session = get_active_session(request.user)
 
     context = {
         'sessions':       sessions,
-        'best_score':     best,
+        'stats':          stats,
+        'best_score':     stats.best_score,
+        'rank':           rank,
         'active_session': active_session,
         'prize_ladder':   PRIZE_LADDER,
     }
@@ -152,27 +118,11 @@ def start_game_view(request):
     Start a new game session.
     Ends any existing active session first.
     """
-    # Close any lingering active session
-    old = get_active_session(request.user)
-    if old:
-        old.status   = 'quit'
-        old.ended_at = timezone.now()
-        old.save()
-
-    # Pick a question for level 1
-    question = get_question_for_level(1)
-    if not question:
+    session = game.start_game(request.user)
+    if not session:
         messages.error(request, "No questions found. Please contact admin.")
         return redirect('dashboard')
 
-    # Create new session
-    session = GameSession.objects.create(
-        user             = request.user,
-        current_level    = 1,
-        current_question = question,
-        score            = 0,
-    )
-
     return redirect('play')
 
 
@@ -183,16 +133,13 @@ def play_view(request):
         messages.warning(request, "No active game. Start a new one!")
         return redirect('dashboard')
 
-    question = session.current_question
+    question = get_current_question(session)
     if not question:
         messages.error(request, "Question not found. Please restart.")
         return redirect('dashboard')
 
     eliminated = session.eliminated_options.split(',') if session.eliminated_options else []
 
-    # Retrieve audience poll from Django session if available
-    audience_poll = request.session.pop('audience_poll', None)
-
     # Label map for template iteration
     option_labels = {'A': 'A', 'B': 'B', 'C': 'C', 'D': 'D'}
 
@@ -204,7 +151,8 @@ def play_view(request):
         'safe_havens':    SAFE_HAVENS,
         'current_prize':  PRIZE_LADDER.get(session.current_level, 0),
         'option_labels':  option_labels,
-        'audience_poll':  audience_poll,
+        'audience_poll':  game.audience_poll(session),
+        'seconds_left':   game.seconds_left(session),
     }
     return render(request, 'quiz/play.html', context)
 
@@ -222,58 +170,22 @@ def answer_view(request):
     if not session:
         return redirect('dashboard')
     
-    chosen = request.POST.get('answer', '').upper()
-    question = session.current_question
-
-    # Handle timer timeout — treat as wrong answer
-    if chosen == 'TIMEOUT':
-        safe_score       = get_safe_score(session.current_level)
-        session.status   = 'lost'
-        session.score    = safe_score
-        session.ended_at = timezone.now()
-        session.save()
-        return redirect('result')
-
-    if not question or chosen not in ['A', 'B', 'C', 'D']:
+    outcome = game.submit_answer(session, request.POST.get('answer', ''))
+
+    if outcome == game.INVALID:
         messages.error(request, "Invalid answer. Please try again.")
         return redirect('play')
-    
-    # ── CORRECT ANSWER ──
-    if chosen == question.correct_option:
-        current_level = session.current_level
-        prize         = PRIZE_LADDER.get(current_level, 0)
-
-        # Player wins the game at level 15
-        if current_level == 15:
-            session.status   = 'won'
-            session.score    = prize
-            session.ended_at = timezone.now()
-            session.save()
-            return redirect('result')
-
-        # Advance to next level
-        next_level = current_level + 1
-        next_q     = get_question_for_level(next_level)
-
-        if not next_q:
-            messages.error(request, f"No question found for level {next_level}. Contact admin.")
-            return redirect('play')
-
-        session.current_level     = next_level
-        session.score             = prize
-        session.current_question  = next_q
-        session.eliminated_options = ''   # Reset 50-50 for new question
-        session.save()
+
+    if outcome == game.MISSING:
+        messages.error(request, f"No question found for level {session.current_level + 1}. Contact admin.")
         return redirect('play')
 
-    # ── WRONG ANSWER ──
-    else:
-        safe_score       = get_safe_score(session.current_level)
-        session.status   = 'lost'
-        session.score    = safe_score
-        session.ended_at = timezone.now()
-        session.save()
-        return redirect('result')
+    # Correct, or a stale double-submit: show the current turn
+    if outcome in (game.CORRECT, game.STALE):
+        return redirect('play')
+
+    # Won, lost or timed out
+    return redirect('result')
 
 
 @login_required
@@ -284,10 +196,7 @@ def quit_game_view(request):
     """
     session = get_active_session(request.user)
     if session:
-        session.status   = 'quit'
-        session.score    = get_safe_score(session.current_level)
-        session.ended_at = timezone.now()
-        session.save()
+        game.quit_game(session)
     return redirect('result')
 
 
@@ -301,67 +210,57 @@ def lifeline_view(request, lifeline_type):
     Handle all three lifelines:
     - fifty_fifty  : eliminate 2 wrong options
     - skip         : replace current question
-    - audience_poll: return simulated poll percentages
+    - audience_poll: simulated poll, shown until the question changes
     """
     session = get_active_session(request.user)
     if not session or request.method != 'POST':
         return redirect('play')
 
-    question = session.current_question
-
-    # ── 50-50 ──
-    if lifeline_type == 'fifty_fifty' and session.lifeline_5050:
-        wrong_options = [
-            opt for opt in ['A', 'B', 'C', 'D']
-            if opt != question.correct_option
-        ]
-        eliminated = random.sample(wrong_options, 2)
-        session.lifeline_5050        = False
-        session.eliminated_options   = ','.join(eliminated)
-        session.save()
-
-    # ── SKIP ──
-    elif lifeline_type == 'skip' and session.lifeline_skip:
-        new_q = get_question_for_level(
-            session.current_level,
-            exclude_ids=[question.id]
-        )
-        if new_q:
-            session.current_question   = new_q
-            session.eliminated_options = ''
-        session.lifeline_skip = False
-        session.save()
-
-    # ── AUDIENCE POLL ──
-    elif lifeline_type == 'audience_poll' and session.lifeline_poll:
-        correct = question.correct_option
-        # Give correct answer a higher probability
-        correct_pct = random.randint(45, 75)
-        remaining   = 100 - correct_pct
-        others      = [o for o in ['A', 'B', 'C', 'D'] if o != correct]
-
-        # Split remaining % among wrong options
-        split1 = random.randint(0, remaining)
-        split2 = random.randint(0, remaining - split1)
-        split3 = remaining - split1 - split2
-
-        splits = [split1, split2, split3]
-        random.shuffle(splits)
-
-        poll = {}
-        for i, opt in enumerate(others):
-            poll[opt] = splits[i]
-        poll[correct] = correct_pct
-
-        session.lifeline_poll = False
-        session.save()
-
-        # Pass poll data back to play view via session
-        request.session['audience_poll'] = poll
-
+    # The effect (e.g. the poll) is kept on the game for the play view
+    game.use_lifeline(session, lifeline_type)
     return redirect('play')
 
 
+@require_POST
+@api.api_login_required
+def lifeline_partial_view(request, lifeline_type):
+    """
+    Use a lifeline and answer with only what it changed, for quiz.js to
+    apply in place. lifeline_view (redirect + full page) is the no-JS
+    fallback.
+    """
+    session = get_active_session(request.user)
+    if not session:
+        return api.no_active_game()
+    if lifeline_type not in game.LIFELINE_FIELDS:
+        return api.error('Unknown lifeline.', status=404)
+
+    effect = game.use_lifeline(session, lifeline_type)
+    if effect is None:
+        return api.error('Lifeline already used, or time is up.', status=409)
+    return lifeline_partial(request, session, get_current_question(session), lifeline_type, effect)
+
+
+def lifeline_partial(request, session, question, lifeline_type, effect):
+    """
+    The lifeline's delta as JSON when the client asks for it
+    (Accept: application/json), otherwise as HTML fragments of the play
+    page, each with the id of the element it replaces.
+    """
+    delta = game.lifeline_delta(lifeline_type, effect)
+    if not request.accepts('text/html'):
+        return JsonResponse(delta)
+
+    context = {
+        'delta':          delta,
+        'question':       question,
+        'eliminated':     delta.get('eliminated', []),
+        'audience_poll':  game.audience_poll(session),
+        'option_labels':  {'A': 'A', 'B': 'B', 'C': 'C', 'D': 'D'},
+    }
+    return render(request, 'quiz/partials/lifeline.html', context)
+
+
 # ============================================================
 # RESULT VIEW
 # ============================================================
@@ -373,9 +272,7 @@ def result_view(request):
     Displays final score and message.
     """
     # Get the most recent completed session
-    session = GameSession.objects.filter(
-        user=request.user
-    ).exclude(status='active').order_by('-ended_at').first()
+    session = get_last_finished_session(request.user)
 
     if not session:
         return redirect('dashboard')
@@ -383,6 +280,7 @@ def result_view(request):
     context = {
         'session':      session,
         'prize_ladder': PRIZE_LADDER,
+        'rank':         ranks.rank_for_user(request.user),
     }
     return render(request, 'quiz/result.html', context)
 
@@ -394,19 +292,89 @@ def result_view(request):
 def leaderboard_view(request):
     """
     Public leaderboard — top 10 scores across all users.
-    One entry per user (their personal best).
+    One entry per user (their personal best), read from the
+    materialized UserStats table.
     """
-    # Get best score per user
-    from django.db.models import Max
-    top_sessions = (
-        GameSession.objects
-        .exclude(status='active')
-        .values('user__username')
-        .annotate(best_score=Max('score'))
-        .order_by('-best_score')[:10]
-    )
+    top_sessions = leaderboard.top_players(10)
 
     context = {
         'top_sessions': top_sessions,
     }
-    return render(request, 'quiz/leaderboard.html', context)
\ No newline at end of file
+    return render(request, 'quiz/leaderboard.html', context)
+
+
+# ============================================================
+# TOURNAMENT VIEWS
+# ============================================================
+
+def tournaments_view(request):
+    """Scheduled, running and recent tournaments."""
+    context = {
+        'tournaments': Tournament.objects.order_by('-starts_at')[:20],
+    }
+    return render(request, 'quiz/tournaments.html', context)
+
+
+def tournament_view(request, pk):
+    """
+    A tournament: the entry button while it runs, then its standings.
+    Standings pages come precomputed and cached from quiz/tournaments.py.
+    """
+    tournament = get_object_or_404(Tournament, pk=pk)
+    context    = {'tournament': tournament}
+
+    if tournament.closed_at:
+        pages = tournaments.page_count(tournament)
+        try:
+            page = min(max(int(request.GET.get('page', 1)), 1), pages)
+        except ValueError:
+            page = 1
+        context.update({
+            'standings': tournaments.standings_page(tournament, page),
+            'page':      page,
+            'pages':     pages,
+            'mine':      tournaments.standing_of(tournament, request.user) if request.user.is_authenticated else None,
+        })
+    elif request.user.is_authenticated:
+        context['game'] = GameSession.objects.filter(tournament=tournament, user=request.user).first()
+    return render(request, 'quiz/tournament.html', context)
+
+
+@require_POST
+@login_required
+def enter_tournament_view(request, pk):
+    """Start (or resume) the player's one game in a tournament."""
+    tournament = get_object_or_404(Tournament, pk=pk)
+    session    = tournaments.enter(request.user, tournament)
+    if not session:
+        messages.warning(request, "This tournament isn't open for you to play.")
+        return redirect('tournament', pk=pk)
+    return redirect('play')
+
+
+# ============================================================
+# LIVE VIEW
+# ============================================================
+
+@login_required
+def live_view(request, room):
+    """
+    Fastest Finger First room. The page connects to /ws/fff/<room>/
+    (quiz/live.py), served by KBC/asgi.py.
+    """
+    if len(room) > 40:
+        raise Http404('Room names are at most 40 characters.')
+    return render(request, 'quiz/live.html', {'room': room, 'ws_path': f'/ws/fff/{room}/'})
+
+
+# ============================================================
+# METRICS VIEW
+# ============================================================
+
+def metrics_view(request):
+    """Per-view request metrics for Prometheus (staff or bearer token)."""
+    token   = getattr(settings, 'QUIZ_METRICS_TOKEN', None)
+    offered = request.headers.get('Authorization', '').removeprefix('Bearer ')
+    if not (request.user.is_staff or (token and hmac.compare_digest(offered, token))):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,44 @@
+# quiz/warmup.py
+
+"""
+Work moved from the first request to process start.
+
+A serverless cold start pays for importing Django, then for everything
+the first request touches: the URLconf and view modules, compiling
+templates, and building the question index. warm() does the second
+part up front, during the function's init phase (see api/index.py), so
+the first request is served like any other. Templates stay compiled in
+the cached template loader; the question index lives in question_pool.
+"""
+
+import logging
+
+from django.db       import DatabaseError
+from django.template import loader
+from django.urls     import get_resolver
+
+from . import question_pool
+
+
+# Pages on the game path, parents first
+TEMPLATES = (
+    'base.html', 'home.html', 'auth/login.html', 'auth/register.html',
+    'quiz/dashboard.html', 'quiz/play.html', 'quiz/result.html', 'quiz/leaderboard.html',
+    'quiz/partials/question.html', 'quiz/partials/options.html',
+    'quiz/partials/audience_poll.html', 'quiz/partials/lifeline.html',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def warm():
+    """Import the URLconf and views, compile templates, load the question index."""
+    # Reading url_patterns imports the URLconf and, through it, the views
+    _ = get_resolver().url_patterns
+    for name in TEMPLATES:
+        loader.get_template(name)
+    try:
+        question_pool.get_level_ids(1)
+    except DatabaseError:
+        # No tables yet (e.g. a build step): the first pick builds it instead
+        logger.warning('Question index not pre-warmed: database unavailable', exc_info=True)
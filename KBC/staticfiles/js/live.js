@@ -0,0 +1,130 @@
+// static/js/live.js
+// Handles: Fastest Finger First room over a WebSocket (quiz/live.py)
+
+document.addEventListener('DOMContentLoaded', function () {
+
+    const roomEl = document.getElementById('live-room');
+    if (!roomEl || !window.WebSocket) return;  // Not on the live page
+
+    const statusEl   = document.getElementById('live-status');
+    const questionEl = document.getElementById('live-question');
+    const playersEl  = document.getElementById('live-players');
+    const resultEl   = document.getElementById('live-result');
+    const fastestEl  = document.getElementById('live-fastest');
+    const optionBtns = roomEl.querySelectorAll('[data-option]');
+
+    let socket = null;
+    let round  = null;   // Number of the open question
+
+    /* ─────────────────────────────────────────
+       CONNECTION
+    ───────────────────────────────────────── */
+    function connect() {
+        const scheme = window.location.protocol === 'https:' ? 'wss://' : 'ws://';
+        socket = new WebSocket(scheme + window.location.host + roomEl.dataset.wsPath);
+
+        socket.addEventListener('message', function (e) {
+            const msg = JSON.parse(e.data);
+            if (handlers[msg.type]) handlers[msg.type](msg);
+        });
+
+        socket.addEventListener('close', function (e) {
+            lock();
+            if (e.code === 4403) {
+                statusEl.textContent = 'Please log in again to join the room.';
+                return;
+            }
+            statusEl.textContent = 'Disconnected — reconnecting…';
+            setTimeout(connect, 2000);
+        });
+    }
+
+    /* ─────────────────────────────────────────
+       SERVER MESSAGES
+    ───────────────────────────────────────── */
+    const handlers = {
+        welcome: function (msg) {
+            playersEl.textContent = msg.players;
+            statusEl.textContent  = 'Waiting for the next question…';
+        },
+
+        question: function (msg) {
+            round = msg.round;
+            playersEl.textContent  = msg.players;
+            questionEl.textContent = msg.question.text;
+            statusEl.textContent   = 'Fastest correct answer wins! (' + msg.seconds + 's)';
+            optionBtns.forEach(function (btn) {
+                btn.removeAttribute('style');
+                btn.disabled = false;
+                btn.querySelector('.live-option-text').textContent = msg.question.options[btn.dataset.option];
+            });
+        },
+
+        answered: function (msg) {
+            statusEl.textContent = 'Locked in after ' + msg.ms + ' ms — waiting for the others…';
+        },
+
+        result: function (msg) {
+            round = null;
+            lock();
+            optionBtns.forEach(function (btn) {
+                if (btn.dataset.option === msg.correct_option) {
+                    btn.style.borderColor = '#28a745';
+                    btn.style.color       = '#fff';
+                }
+            });
+            statusEl.textContent = msg.winner
+                ? msg.winner + ' wins in ' + msg.winner_ms + ' ms!'
+                : 'Nobody got it right this time.';
+
+            fastestEl.replaceChildren();
+            msg.fastest.forEach(function (entry) {
+                const li = document.createElement('li');
+                li.textContent = entry[0] + ' — ' + entry[1] + ' ms';
+                fastestEl.appendChild(li);
+            });
+            resultEl.classList.toggle('d-none', msg.fastest.length === 0);
+        },
+
+        hot_seat: function (msg) {
+            statusEl.textContent = 'You are in the hot seat! Starting your game…';
+            setTimeout(function () { window.location.href = msg.url; }, 1500);
+        },
+
+        hot_seat_busy: function (msg) {
+            statusEl.innerHTML = '';
+            statusEl.append('You won the round, but you already have a game in progress. ');
+            var link = document.createElement('a');
+            link.href = msg.url;
+            link.className = 'text-warning';
+            link.textContent = 'Finish it first';
+            statusEl.append(link);
+        },
+    };
+
+    /* ─────────────────────────────────────────
+       ANSWERING
+    ───────────────────────────────────────── */
+    function lock() {
+        optionBtns.forEach(function (btn) { btn.disabled = true; });
+    }
+
+    optionBtns.forEach(function (btn) {
+        btn.addEventListener('click', function () {
+            if (round === null || btn.disabled) return;
+            socket.send(JSON.stringify({ type: 'answer', round: round, option: btn.dataset.option }));
+            lock();
+            btn.style.borderColor = '#4a8fff';
+        });
+    });
+
+    /* ─────────────────────────────────────────
+       KEYBOARD SHORTCUTS (A/B/C/D keys)
+    ───────────────────────────────────────── */
+    document.addEventListener('keydown', function (e) {
+        if (!/^[a-d]$/i.test(e.key)) return;
+        roomEl.querySelector('[data-option="' + e.key.toUpperCase() + '"]').click();
+    });
+
+    connect();
+});
@@ -1,21 +1,27 @@
 // static/js/quiz.js
 // Handles: Countdown Timer + Answer Lock + Lifeline UI Feedback
+//          + single round-trip answers via the JSON game API
+//          + lifelines applied in place from their partial response
 
 document.addEventListener('DOMContentLoaded', function () {
 
     /* ─────────────────────────────────────────
        TIMER CONFIGURATION
     ───────────────────────────────────────── */
-    const TIMER_DURATION = 30;   // seconds per question
+    const TIMER_DURATION = 30;   // seconds per question (game.QUESTION_SECONDS)
     const timerEl        = document.getElementById('timer-count');
     const timerCircle    = document.getElementById('timer-circle');
     const answerForm     = document.getElementById('answer-form');
-    const optionBtns     = document.querySelectorAll('.option-btn:not(:disabled)');
+    const optionBtns     = document.querySelectorAll('#answer-form .option-btn');
 
     if (!timerEl || !answerForm) return;  // Not on play page
 
+    const answerApiUrl = answerForm.dataset.apiUrl;
+
     let timeLeft  = TIMER_DURATION;
     let timerLock = false;   // Prevent double-submit
+    let inFlight  = false;   // An answer request is pending
+    let countdown = null;
 
     /* ─────────────────────────────────────────
        TICK FUNCTION
@@ -66,13 +72,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
         // Auto-submit with timeout answer after 1.5s
         setTimeout(function () {
-            // Add hidden input to signal timeout
-            const hidden = document.createElement('input');
-            hidden.type  = 'hidden';
-            hidden.name  = 'answer';
-            hidden.value = 'TIMEOUT';
-            answerForm.appendChild(hidden);
-            answerForm.submit();
+            submitAnswer('TIMEOUT');
         }, 1500);
     }
 
@@ -112,7 +112,7 @@ document.addEventListener('DOMContentLoaded', function () {
     ───────────────────────────────────────── */
     optionBtns.forEach(function (btn) {
         btn.addEventListener('click', function () {
-            if (timerLock) return;
+            if (timerLock || btn.disabled) return;
             timerLock = true;
             clearInterval(countdown);
 
@@ -131,11 +131,163 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     });
 
+    /* ─────────────────────────────────────────
+       SUBMIT ANSWERS VIA THE JSON API
+       One request per turn: the response carries
+       the verdict and the next question.
+    ───────────────────────────────────────── */
+    answerForm.addEventListener('submit', function (e) {
+        const choice = e.submitter ? e.submitter.value : '';
+        if (!answerApiUrl || !window.fetch || !choice) return;  // Plain form post
+        e.preventDefault();
+        submitAnswer(choice);
+    });
+
+    function submitAnswer(choice) {
+        if (inFlight) return;
+        inFlight = true;
+
+        if (!answerApiUrl || !window.fetch) {
+            // Fallback: classic form post
+            const hidden = document.createElement('input');
+            hidden.type  = 'hidden';
+            hidden.name  = 'answer';
+            hidden.value = choice;
+            answerForm.appendChild(hidden);
+            answerForm.submit();
+            return;
+        }
+
+        const body = new FormData();
+        body.append('answer', choice);
+
+        fetch(answerApiUrl, {
+            method:      'POST',
+            body:        body,
+            credentials: 'same-origin',
+            headers:     { 'X-CSRFToken': csrfToken() },
+        })
+            .then(function (resp) {
+                if (!resp.ok) throw new Error('HTTP ' + resp.status);
+                return resp.json();
+            })
+            .then(function (data) {
+                if (data.result === 'correct') {
+                    renderTurn(data.state);
+                } else {
+                    window.location.href = data.result_url;
+                }
+            })
+            .catch(function () {
+                // The answer may already be recorded — show the server's view
+                window.location.reload();
+            });
+    }
+
+    function csrfToken() {
+        const input = answerForm.querySelector('input[name="csrfmiddlewaretoken"]');
+        return input ? input.value : '';
+    }
+
+    /* ─────────────────────────────────────────
+       RENDER THE NEXT TURN IN PLACE
+    ───────────────────────────────────────── */
+    function renderTurn(state) {
+        document.title = 'Level ' + state.level + ' – Quiz Master';
+        document.getElementById('level-number').textContent = state.level;
+        document.getElementById('current-prize').textContent = '₹' + state.prize;
+        renderQuestion(state.question, state.eliminated);
+
+        // Move the highlight on the prize ladder
+        document.querySelectorAll('.prize-ladder-row').forEach(function (row) {
+            const active = Number(row.dataset.level) === state.level;
+            const prize  = row.querySelectorAll('small')[1];
+            row.classList.toggle('active-level', active);
+            if (prize) {
+                prize.classList.toggle('text-white', active);
+                prize.classList.toggle('fw-bold', active);
+                prize.classList.toggle('text-warning', !active);
+            }
+            if (active) row.scrollIntoView({ behavior: 'smooth', block: 'center' });
+        });
+
+        // A poll belongs to the previous question
+        renderPoll(null);
+
+        startTimer(state.seconds_left);
+    }
+
+    function renderQuestion(question, eliminated) {
+        document.getElementById('question-text').textContent = question.text;
+        optionBtns.forEach(function (btn) {
+            const opt = btn.id.replace('btn-', '');
+            renderOption(btn, eliminated.indexOf(opt) !== -1, question.options[opt]);
+        });
+    }
+
+    function renderOption(btn, eliminated, text) {
+        const opt = btn.id.replace('btn-', '');
+
+        btn.removeAttribute('style');
+        btn.classList.toggle('eliminated', eliminated);
+        btn.disabled = eliminated;
+        btn.type     = eliminated ? 'button' : 'submit';
+        btn.name     = eliminated ? '' : 'answer';
+        btn.value    = eliminated ? '' : opt;
+
+        const badge = document.createElement('span');
+        badge.className   = 'option-badge me-2';
+        badge.textContent = opt;
+        btn.replaceChildren(badge, eliminated ? '—' : text);
+    }
+
+    function renderPoll(poll) {
+        const box = document.getElementById('audience-poll');
+        if (!box) return;
+        if (!poll) {
+            box.replaceChildren();
+            return;
+        }
+
+        const card  = document.createElement('div');
+        card.className = 'kbc-card rounded-4 p-4 mt-3';
+        card.innerHTML = '<h6 class="text-warning mb-3">' +
+            '<i class="bi bi-people-fill me-2"></i>Audience Poll Results</h6>';
+
+        Object.keys(poll).forEach(function (opt) {
+            const row = document.createElement('div');
+            row.className = 'mb-2';
+            row.innerHTML =
+                '<div class="d-flex justify-content-between mb-1">' +
+                    '<small class="text-light"></small><small class="text-warning"></small>' +
+                '</div>' +
+                '<div class="progress" style="height:10px;">' +
+                    '<div class="progress-bar bg-warning"></div>' +
+                '</div>';
+            const labels = row.querySelectorAll('small');
+            labels[0].textContent = opt;
+            labels[1].textContent = poll[opt] + '%';
+            row.querySelector('.progress-bar').style.width = poll[opt] + '%';
+            card.appendChild(row);
+        });
+        box.replaceChildren(card);
+    }
+
     /* ─────────────────────────────────────────
        START COUNTDOWN
     ───────────────────────────────────────── */
-    tick(); // Run immediately
-    const countdown = setInterval(tick, 1000);
+    // Seconds left as the server counts them: a resumed game carries on
+    // from when the question was served, not from a fresh countdown
+    function startTimer(seconds) {
+        clearInterval(countdown);
+        timeLeft  = Number.isInteger(seconds) ? seconds : TIMER_DURATION;
+        timerLock = false;
+        inFlight  = false;
+        tick(); // Run immediately
+        countdown = setInterval(tick, 1000);
+    }
+
+    startTimer(parseInt(answerForm.dataset.secondsLeft, 10));
 
 
     /* ─────────────────────────────────────────
@@ -158,10 +310,51 @@ document.addEventListener('DOMContentLoaded', function () {
 
             if (!confirm(confirmMessage)) {
                 e.preventDefault();
+                return;
             }
+
+            // Apply the lifeline in place; the plain post is the fallback
+            const partialUrl = form.dataset.partialUrl;
+            if (!partialUrl || !window.fetch) return;
+            e.preventDefault();
+            useLifeline(form, partialUrl);
         });
     });
 
+    function useLifeline(form, url) {
+        const button = form.querySelector('button');
+        if (timerLock || button.disabled) return;
+        button.disabled = true;
+        button.classList.add('lifeline-used');
+
+        fetch(url, {
+            method:      'POST',
+            credentials: 'same-origin',
+            headers:     { 'X-CSRFToken': csrfToken(), 'Accept': 'application/json' },
+        })
+            .then(function (resp) {
+                if (!resp.ok) throw new Error('HTTP ' + resp.status);
+                return resp.json();
+            })
+            .then(function (delta) {
+                if (delta.question) {
+                    // Skip: a new question, timed from now
+                    renderQuestion(delta.question, delta.eliminated);
+                    startTimer();
+                } else if (delta.eliminated) {
+                    optionBtns.forEach(function (btn) {
+                        const opt = btn.id.replace('btn-', '');
+                        if (delta.eliminated.indexOf(opt) !== -1) renderOption(btn, true);
+                    });
+                }
+                if ('poll' in delta) renderPoll(delta.poll);
+            })
+            .catch(function () {
+                // Show whatever the server recorded
+                window.location.reload();
+            });
+    }
+
 
     /* ─────────────────────────────────────────
        PRIZE LADDER SCROLL TO ACTIVE